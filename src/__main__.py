@@ -6,12 +6,14 @@ from pathlib import Path
 path = Path(__file__).parents[1].absolute()
 sys.path.append(f"{path}")
 
-from src.app import app  # noqa: E402
-
 
 def main():
     """
-    Main function to run the application.
+    Main function to run the application, or the given command without display.
+
+    Examples:
+        python src
+        python -m src simulate --size 4096x4096 --generations 1000 --seed 42
 
     Raises:
         SystemExit: If the program is exited.
@@ -24,7 +26,14 @@ def main():
     logger.setLevel(logging.INFO)
 
     try:
-        app.run()
+        if len(sys.argv) > 1:
+            from src.cli import cli
+
+            cli()
+        else:
+            from src.app import get_app
+
+            get_app().run()
     except KeyboardInterrupt as exception:
         logging.info(f"Exiting the program: '{exception}'")
 
@@ -1,14 +1,17 @@
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Optional, Tuple
 
 import pygame
 import typer
 
 from src.cli import cli
 from src.components.console import Console
+from src.components.overlay import StatsOverlay
 from src.grid import GridModel, GridView, GridController
 from src.core.keyboard import KeyboardInfo
 from src.core.mouse import MouseInfo
+from src.profiler import FrameProfiler
+from src.scheduler import Scheduler
 
 
 @dataclass
@@ -20,6 +23,8 @@ class Game:
         cli (typer.Typer): The CLI application to use in the console.
 
         console (Console): The console component of the game.
+        stats_overlay (StatsOverlay): The overlay of the timings of the frames.
+        profiler (FrameProfiler): The profiler of the phases of the frames.
         screen (pygame.Surface): The screen of the game.
         clock (pygame.time.Clock): The clock of the game.
 
@@ -38,6 +43,8 @@ class Game:
     cli: typer.Typer
 
     console: Console
+    stats_overlay: StatsOverlay
+    profiler: FrameProfiler
     screen: pygame.Surface
     clock: pygame.time.Clock
 
@@ -68,13 +75,18 @@ class Game:
 
         grid_model = GridModel(shape=(65, 37))
         grid_view = GridView(screen=screen)
-        grid_controller = GridController(grid_model, grid_view)
+        scheduler = Scheduler(limit_fps=limit_fps)
+        grid_controller = GridController(grid_model, grid_view, scheduler)
 
         console = Console(cli, 0, 0, 1280, 720, active=False, font_size=20)
+        profiler = FrameProfiler()
+        stats_overlay = StatsOverlay(profiler)
 
         return cls(
             cli=_cli,
             console=console,
+            stats_overlay=stats_overlay,
+            profiler=profiler,
             screen=screen,
             clock=clock,
             mouse_info=mouse_info,
@@ -99,22 +111,74 @@ class Game:
             Exception: If the user closes the window.
 
         """
+        shape = None
+        console_active = True
+        overlay_active = False
+        command_running = False
+        grid_frame: Optional[pygame.Surface] = None
+        profiler = self.profiler
+
         while True:
+            profiler.start_frame()
             events = self._get_events()
             self.mouse_info.update(events)
             self.keyboard_info.update(events)
+            profiler.lap("events")
 
-            self.screen.fill((225, 225, 225))
-
-            if not self.console.active:
+            # The grid is left to the command running in the worker, until it's done
+            if not self.console.active and not self.console.running:
                 self.grid_controller.handle_event(self.mouse_info, self.keyboard_info)
-
-            self.grid_controller.draw()
+                self.stats_overlay.handle_event(self.mouse_info, self.keyboard_info)
 
             self.console.handle_event(self.mouse_info, self.keyboard_info)
+            profiler.lap("update")
+
+            # Only the changed cells are drawn, unless the screen must be drawn again
+            full = (
+                self.console.active
+                or console_active
+                or command_running
+                or (overlay_active and not self.stats_overlay.active)
+                or shape != self.grid_model.shape
+                or any(event.type == pygame.WINDOWEXPOSED for event in events)
+            )
+            console_active = self.console.active
+            overlay_active = self.stats_overlay.active
+            command_running = self.console.worker is not None
+
+            # The model is changed by the command, the last frame of the grid is shown
+            if command_running and grid_frame is not None:
+                self.screen.blit(grid_frame, (0, 0))
+                rects = None
+            else:
+                shape = self.grid_model.shape
+                rects = self.grid_controller.draw(full=full)
+
+            # The command entered starts once the grid is drawn (kept for the next frames)
+            if self.console.pending is not None:
+                grid_frame = self.screen.copy()
+                self.console.run_pending()
+                command_running = True
+
+            profiler.lap("grid")
             self.console.draw(self.screen)
+            profiler.lap("console")
+
+            self.stats_overlay.limit_fps = self.limit_fps
+            self.stats_overlay.draw(self.screen)
 
-            pygame.display.update()
+            if rects is not None and self.stats_overlay.rect is not None:
+                rects.append(self.stats_overlay.rect)
+
+            profiler.lap("overlay")
+
+            if rects is None:
+                pygame.display.update()
+            elif rects:
+                pygame.display.update(rects)
+
+            profiler.lap("display")
+            profiler.end_frame(self.limit_fps)
             self.clock.tick(self.limit_fps)
 
     @staticmethod
@@ -139,10 +203,25 @@ class Game:
         return events
 
 
-# Todo: WARNING
-# Instantiation, outside a function, allows Typer to capture the application so that it can interact with it.
-# I haven't found any other way of doing this, while still allowing the CLI to be detached to create the Console.
-app = Game.from_config(cli)
+# The application is created on the first call of 'get_app' (opens the window), so importing
+# this module doesn't initialise pygame, the commands without display start fast.
+_app: Optional[Game] = None
+
+
+def get_app() -> Game:
+    """
+    Get the application, created with the minimal configuration on the first call.
+
+    Returns:
+        Game: The application.
+    """
+    global _app
+
+    if _app is None:
+        _app = Game.from_config(cli)
+
+    return _app
+
 
 if __name__ == "__main__":
-    app.run()
+    get_app().run()
@@ -0,0 +1,620 @@
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy
+
+from src import PROJECT_PATH
+from src.engines import ENGINES, ParallelEngine, get_engine
+from src.history import History
+from src.model import GridModel
+from src.patterns import place, read_rle
+from src.recording import Recording
+from src.rules import CONWAY, Rule
+
+# Canonical patterns of the benchmarks, in RLE (the random soup is generated)
+PATTERNS_RLE: Dict[str, str] = {
+    "r-pentomino": "x = 3, y = 3\nb2o$2o$bo!",
+    "gosper-gun": (
+        "x = 36, y = 9\n"
+        "24bo$22bobo$12b2o6b2o12b2o$11bo3bo4b2o12b2o$2o8bo5bo3b2o$2o8bo3bob2o4bo"
+        "bo$10bo5bo7bo$11bo3bo$12b2o!"
+    ),
+}
+PATTERNS = (*PATTERNS_RLE, "soup")
+
+SIZES = (64, 256, 1024, 4096, 8192)
+DENSITIES = (0.1, 0.3, 0.5)
+
+# Modules timed by the startup benchmark, from the model to the whole application
+STARTUP_MODULES = ("src.model", "src.engines", "src.cli", "src.grid", "src.app")
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Result of the benchmark of an engine on a grid.
+
+    Attributes:
+        engine (str): The name of the engine.
+        shape (Tuple[int, int]): The shape of the grid.
+        pattern (str): The pattern at the start ('soup' for a random soup).
+        density (Optional[float]): The density of the random soup (None for a pattern).
+        generations (int): The number of generations computed.
+        duration (float): The time spent computing the generations, in seconds.
+        cells_per_second (float): The number of cells updated per second.
+        peak_memory (int): The peak of memory allocated by a generation, in bytes.
+        state_bytes (int): The memory of the state of the engine, in bytes.
+    """
+
+    engine: str
+    shape: Tuple[int, int]
+    pattern: str
+    density: Optional[float]
+    generations: int
+    duration: float
+    cells_per_second: float
+    peak_memory: int
+    state_bytes: int
+
+    @property
+    def key(self) -> Tuple[str, Tuple[int, int], str, Optional[float]]:
+        """The case of the benchmark, to compare the results of two runs."""
+        return self.engine, tuple(self.shape), self.pattern, self.density
+
+
+@dataclass
+class CheckResult:
+    """
+    Result of a check of an engine (by default, the comparison with the reference engine).
+
+    Attributes:
+        engine (str): The name of the engine.
+        pattern (str): The pattern at the start ('soup' for a random soup).
+        generations (int): The number of generations compared.
+        mismatch (Optional[int]): The first generation wrong (different from the
+            reference by default), if any.
+        check (str): The name of the check (see 'CHECKS').
+    """
+
+    engine: str
+    pattern: str
+    generations: int
+    mismatch: Optional[int]
+    check: str = "step"
+
+    @property
+    def passed(self) -> bool:
+        """Whether the engine gave the same grids as the reference."""
+        return self.mismatch is None
+
+
+def make_grid(
+    pattern: str,
+    shape: Tuple[int, int],
+    density: float = 0.5,
+    seed: Optional[int] = None,
+) -> numpy.ndarray:
+    """
+    Create the grid at the start of a benchmark.
+
+    Args:
+        pattern (str): The name of the pattern, placed at the center, or 'soup'.
+        shape (Tuple[int, int]): The shape of the grid.
+        density (float): The density of alive cells of the random soup.
+        seed (Optional[int]): The seed of the random soup.
+
+    Raises:
+        ValueError: If the pattern is unknown.
+
+    Returns:
+        numpy.ndarray: The grid of 0 and 1 (uint8).
+    """
+    if pattern == "soup":
+        # Random integers take 4 times less memory than random floats on huge grids
+        generator = numpy.random.default_rng(seed)
+        cells = generator.integers(0, 2**16, size=shape, dtype=numpy.uint16)
+        return (cells < density * 2**16).astype(numpy.uint8)
+
+    if pattern not in PATTERNS_RLE:
+        raise ValueError(f"Unknown pattern: '{pattern}', available: {PATTERNS}")
+
+    cells = read_rle(io.StringIO(PATTERNS_RLE[pattern])).cells
+    return place(cells, shape)
+
+
+def benchmark_engine(
+    engine: str,
+    grid: numpy.ndarray,
+    generations: int = 10,
+    max_seconds: float = 30.0,
+    memory_generations: int = 2,
+) -> Tuple[int, float, int, int]:
+    """
+    Time the generations computed by 'GridModel.next_generation' with an engine.
+
+    Notes:
+        The peak of memory is traced apart on the first generations, tracing the
+        allocations slows down the engines.
+
+    Args:
+        engine (str): The name of the engine.
+        grid (numpy.ndarray): The grid at the start.
+        generations (int): The number of generations to compute.
+        max_seconds (float): The time after which no more generations are computed.
+        memory_generations (int): The number of generations to trace the memory.
+
+    Returns:
+        Tuple[int, float, int, int]: The number of generations computed, the time spent,
+            the peak of memory allocated and the memory of the state.
+    """
+    model = GridModel(shape=grid.shape, limit_history=0, engine=engine)
+
+    try:
+        model.grid = grid
+        tracemalloc.start()
+
+        for _ in range(memory_generations):
+            model.next_generation()
+
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        model.grid = grid
+        state_bytes = model.state.nbytes
+        computed = 0
+        start = time.perf_counter()
+
+        while computed < generations:
+            model.next_generation()
+            computed += 1
+
+            if time.perf_counter() - start > max_seconds:
+                logging.info(f"Benchmark of '{engine}' stopped after {computed}")
+                break
+
+        duration = time.perf_counter() - start
+
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+        model.engine.close()
+
+    return computed, duration, peak_memory, state_bytes
+
+
+def run_benchmark(
+    engines: Sequence[str],
+    sizes: Sequence[int] = SIZES,
+    patterns: Sequence[str] = PATTERNS,
+    densities: Sequence[float] = DENSITIES,
+    generations: int = 10,
+    max_seconds: float = 30.0,
+    seed: Optional[int] = 0,
+) -> Iterator[BenchmarkResult]:
+    """
+    Benchmark the engines on every square grid, pattern and density (soup only).
+
+    Args:
+        engines (Sequence[str]): The names of the engines.
+        sizes (Sequence[int]): The sizes of the square grids.
+        patterns (Sequence[str]): The patterns at the start ('soup' for a random soup).
+        densities (Sequence[float]): The densities of the random soups.
+        generations (int): The number of generations to compute in each case.
+        max_seconds (float): The time after which an engine stops a case.
+        seed (Optional[int]): The seed of the random soups.
+
+    Returns:
+        Iterator[BenchmarkResult]: The results, as soon as each case is done.
+    """
+    for size in sizes:
+        shape = (size, size)
+
+        for pattern in patterns:
+            for density in densities if pattern == "soup" else (None,):
+                grid = make_grid(pattern, shape, density=density or 0, seed=seed)
+
+                for engine in engines:
+                    logging.info(f"Benchmark of '{engine}': {pattern} {shape}")
+                    computed, duration, peak_memory, state_bytes = benchmark_engine(
+                        engine, grid, generations=generations, max_seconds=max_seconds
+                    )
+                    cells = computed * size * size
+
+                    yield BenchmarkResult(
+                        engine=engine,
+                        shape=shape,
+                        pattern=pattern,
+                        density=density,
+                        generations=computed,
+                        duration=duration,
+                        cells_per_second=cells / duration if duration else float("inf"),
+                        peak_memory=peak_memory,
+                        state_bytes=state_bytes,
+                    )
+
+
+def check_engine(
+    engine: str, grid: numpy.ndarray, generations: int, rule: Rule = CONWAY
+) -> Optional[int]:
+    """
+    Compare the generations of an engine with the reference engine (looping over cells).
+
+    Notes:
+        With an unbounded engine, the reference computes a grid enlarged by a margin
+        the cells can't cross in time, so the cells outside the grid are the same.
+
+    Args:
+        engine (str): The name of the engine.
+        grid (numpy.ndarray): The grid at the start.
+        generations (int): The number of generations to compare.
+        rule (Rule): The rule of the generations.
+
+    Raises:
+        ValueError: If the engine can't apply the rule.
+
+    Returns:
+        Optional[int]: The first generation different from the reference, None if none.
+    """
+    checked, reference = get_engine(engine), get_engine("reference")
+    checked.set_rule(rule)
+    reference.set_rule(rule)
+    margin = generations + 1 if checked.unbounded else 0
+    width, height = grid.shape
+
+    expected = numpy.pad(grid.astype(int), margin)
+    state = checked.encode(grid.copy())
+
+    try:
+        for generation in range(1, generations + 1):
+            expected = reference.step(expected)
+            state = checked.step(state)
+            window = expected[margin : margin + width, margin : margin + height]
+
+            if not numpy.array_equal(checked.decode(state) != 0, window != 0):
+                return generation
+
+    finally:
+        checked.close()
+
+    return None
+
+
+def check_advance(
+    engine: str, grid: numpy.ndarray, generations: int, rule: Rule = CONWAY
+) -> Optional[int]:
+    """
+    Check that advancing the model at once or in chunks gives the grids of its steps.
+
+    Notes:
+        The generations are computed one by one ('GridModel.next_generation'), then at
+        once ('GridModel.advance'), then in chunks of a few generations with a callback
+        (like the console command 'step' reporting its progress).
+
+    Args:
+        engine (str): The name of the engine.
+        grid (numpy.ndarray): The grid at the start.
+        generations (int): The number of generations to compare.
+        rule (Rule): The rule of the generations.
+
+    Raises:
+        ValueError: If the engine can't apply the rule.
+
+    Returns:
+        Optional[int]: The first generation different from the steps, None if none.
+    """
+    model = GridModel(shape=grid.shape, limit_history=0, engine=engine)
+    mismatches = []
+
+    def compare(done: int, total: int):
+        if not numpy.array_equal(model.grid, grids[done]):
+            mismatches.append(done)
+
+    try:
+        model.set_rule(rule)
+        model.grid = grid.copy()
+        grids = [model.grid.copy()]
+
+        for _ in range(generations):
+            model.next_generation()
+            grids.append(model.grid.copy())
+
+        model.grid = grid.copy()
+        model.advance(generations)
+        compare(generations, generations)
+
+        model.grid = grid.copy()
+        model.advance(generations, callback=compare, chunks=max(generations // 3, 1))
+
+    finally:
+        model.engine.close()
+
+    return min(mismatches, default=None)
+
+
+def check_history(
+    engine: str, grid: numpy.ndarray, generations: int, rule: Rule = CONWAY
+) -> Optional[int]:
+    """
+    Check that the states of an engine come back unchanged from the history (undo).
+
+    Notes:
+        Every state is added twice, like the steps of a stable grid: the delta between
+        them is empty, so it's binary even if the state isn't (bitpacked words).
+        The history is shrunk after the generations, so its oldest states are dropped
+        and the deltas after them become keyframes, then every state left is popped.
+
+    Args:
+        engine (str): The name of the engine.
+        grid (numpy.ndarray): The grid at the start.
+        generations (int): The number of generations added to the history.
+        rule (Rule): The rule of the generations.
+
+    Raises:
+        ValueError: If the engine can't apply the rule.
+
+    Returns:
+        Optional[int]: The first generation popped different from its grid, None if none.
+    """
+    checked = get_engine(engine)
+    checked.set_rule(rule)
+    history = History(keyframe_interval=4)
+    state = checked.encode(grid.copy())
+    grids = []
+
+    try:
+        for generation in range(generations):
+            grids.append(checked.decode(state).copy())
+            kept = checked.detach(state)
+            history.append((generation, kept))
+            history.append((generation, kept))
+            state = checked.step(state)
+
+        history.resize(history.size // 2)
+
+        while len(history) != 0:
+            generation, state = history.pop()
+
+            if not numpy.array_equal(checked.decode(state), grids[generation]):
+                return generation
+
+    finally:
+        checked.close()
+
+    return None
+
+
+def check_recording(
+    engine: str, grid: numpy.ndarray, generations: int, rule: Rule = CONWAY
+) -> Optional[int]:
+    """
+    Check that the generations recorded by the model come back from a seek after an undo.
+
+    Notes:
+        The model records the generations, goes back to the half of them (undo) and
+        runs again up to three quarters: the recording holds two runs through the
+        same generations, the one before the undo going further.
+
+    Args:
+        engine (str): The name of the engine.
+        grid (numpy.ndarray): The grid at the start.
+        generations (int): The number of generations recorded before the undo.
+        rule (Rule): The rule of the generations.
+
+    Raises:
+        ValueError: If the engine can't apply the rule.
+
+    Returns:
+        Optional[int]: The first generation sought different from its grid, None if none.
+    """
+    model = GridModel(shape=grid.shape, engine=engine)
+
+    try:
+        model.set_rule(rule)
+        model.grid = grid.copy()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "check.gol"
+            model.start_recording(path, keyframe_interval=8)
+            grids = [model.grid.copy()]
+
+            for _ in range(generations):
+                model.next_generation()
+                grids.append(model.grid.copy())
+
+            while model.generation > generations // 2 and len(model.history) != 0:
+                model.previous_generation()
+
+            while model.generation < generations * 3 // 4:
+                model.next_generation()
+
+            model.stop_recording()
+            recording = Recording(path)
+
+            try:
+                for generation, expected in enumerate(grids):
+                    _, sought = recording.seek(generation)
+
+                    if not numpy.array_equal(sought, expected != 0):
+                        return generation
+            finally:
+                recording.close()
+
+    finally:
+        model.stop_recording()
+        model.engine.close()
+
+    return None
+
+
+# Checks of the engines, by name: each one returns the first generation wrong, if any
+CHECKS: Dict[str, Callable[[str, numpy.ndarray, int, Rule], Optional[int]]] = {
+    "step": check_engine,
+    "advance": check_advance,
+    "history": check_history,
+    "recording": check_recording,
+}
+
+
+def check_engines(
+    engines: Sequence[str],
+    size: int = 48,
+    patterns: Sequence[str] = PATTERNS,
+    generations: int = 32,
+    density: float = 0.3,
+    seed: Optional[int] = 0,
+    rule: Rule = CONWAY,
+    checks: Sequence[str] = tuple(CHECKS),
+) -> Iterator[CheckResult]:
+    """
+    Run the checks of the engines (comparison with the reference engine...), on every pattern.
+
+    Args:
+        engines (Sequence[str]): The names of the engines.
+        size (int): The size of the square grid.
+        patterns (Sequence[str]): The patterns at the start ('soup' for a random soup).
+        generations (int): The number of generations to compare.
+        density (float): The density of the random soup.
+        seed (Optional[int]): The seed of the random soup.
+        rule (Rule): The rule of the generations.
+        checks (Sequence[str]): The names of the checks (see 'CHECKS').
+
+    Returns:
+        Iterator[CheckResult]: The results, as soon as each engine is checked.
+    """
+    for pattern in patterns:
+        grid = make_grid(pattern, (size, size), density=density, seed=seed)
+
+        for check in checks:
+            for engine in engines:
+                mismatch = CHECKS[check](engine, grid, generations, rule)
+                yield CheckResult(engine, pattern, generations, mismatch, check)
+
+
+def write_results(path: Path, results: List[BenchmarkResult]):
+    """
+    Write the results of a benchmark to a JSON file, with the machine used.
+
+    Args:
+        path (Path): The path of the JSON file.
+        results (List[BenchmarkResult]): The results of the benchmark.
+
+    """
+    data = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "results": [asdict(result) for result in results],
+    }
+
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def read_results(path: Path) -> List[BenchmarkResult]:
+    """
+    Read the results of a benchmark from a JSON file.
+
+    Args:
+        path (Path): The path of the JSON file.
+
+    Returns:
+        List[BenchmarkResult]: The results of the benchmark.
+    """
+    with open(path) as file:
+        data = json.load(file)
+
+    return [BenchmarkResult(**result) for result in data["results"]]
+
+
+def compare_results(
+    results: List[BenchmarkResult], baseline: List[BenchmarkResult]
+) -> Dict[Tuple, float]:
+    """
+    Compare the speed of the cases run in both benchmarks.
+
+    Args:
+        results (List[BenchmarkResult]): The results of the new benchmark.
+        baseline (List[BenchmarkResult]): The results of the old benchmark.
+
+    Returns:
+        Dict[Tuple, float]: The speedup of each case (above 1 is faster, below is slower).
+    """
+    old = {result.key: result.cells_per_second for result in baseline}
+
+    return {
+        result.key: result.cells_per_second / old[result.key]
+        for result in results
+        if old.get(result.key)
+    }
+
+
+def default_engines() -> List[str]:
+    """The engines benchmarked by default, all except the (very slow) reference."""
+    return [name for name in ENGINES if name != "reference"]
+
+
+def measure_import(module: str, repeat: int = 3) -> float:
+    """
+    Time the import of a module in a new interpreter (cold start, no module loaded).
+
+    Args:
+        module (str): The name of the module.
+        repeat (int): The number of interpreters started, the fastest is kept.
+
+    Returns:
+        float: The time of the import, in seconds.
+    """
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    environment = {**os.environ, "PYGAME_HIDE_SUPPORT_PROMPT": "1"}
+    durations = []
+
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_PATH,
+            env=environment,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        durations.append(float(result.stdout.split()[-1]))
+
+    return min(durations)
+
+
+def measure_workers(workers: int = 2) -> float:
+    """
+    Time the start of the worker processes of the 'parallel' engine (first generation).
+
+    Args:
+        workers (int): The number of worker processes.
+
+    Returns:
+        float: The time of the first generation, in seconds.
+    """
+    engine = ParallelEngine(workers=workers)
+    start = time.perf_counter()
+
+    try:
+        engine.step(numpy.zeros((64, 64), dtype=numpy.uint8))
+        return time.perf_counter() - start
+    finally:
+        engine.close()
@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+# Sizes of a cell in pixels, when zooming in
+ZOOM_LEVELS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64)
+
+# Largest number of cells (per side) drawn in one pixel, when zooming out
+MAX_BLOCK = 4096
+
+
+@dataclass
+class Camera:
+    """
+    Camera over the grid, the window of cells drawn on the screen.
+
+    Notes:
+        Zoomed in, a cell is a square of 'cell_size' pixels.
+        Zoomed out past one pixel per cell, a pixel is a square of 'block' cells
+        (their density is drawn), the position is then aligned on the blocks.
+
+    Attributes:
+        screen_size (Tuple[int, int]): The size of the screen in pixels.
+        x (int): The row of the cell at the left of the screen.
+        y (int): The column of the cell at the top of the screen.
+        cell_size (int): The size of a cell in pixels.
+        block (int): The number of cells (per side) drawn in one pixel.
+        rest (Tuple[int, int]): The pixels moved by, not yet enough to move by one cell.
+    """
+
+    screen_size: Tuple[int, int]
+    x: int = 0
+    y: int = 0
+    cell_size: int = 1
+    block: int = 1
+    rest: Tuple[int, int] = (0, 0)
+
+    def fit(self, shape: Tuple[int, int]):
+        """
+        Show the whole grid, with the largest cells that fit on the screen.
+
+        Args:
+            shape (Tuple[int, int]): The shape of the grid.
+
+        """
+        screen_width, screen_height = self.screen_size
+        cell_size = min(screen_width // shape[0], screen_height // shape[1])
+        block = 1
+
+        # Too many cells for the screen, draw blocks of cells
+        if cell_size == 0:
+            cell_size = 1
+
+            while block < MAX_BLOCK and (
+                -(-shape[0] // block) > screen_width
+                or -(-shape[1] // block) > screen_height
+            ):
+                block *= 2
+
+        self.x, self.y, self.rest = 0, 0, (0, 0)
+        self.cell_size, self.block = cell_size, block
+
+    def zoom(self, x: int, y: int, zoom_in: bool) -> bool:
+        """
+        Zoom in or out by one level, keeping the cell under the position at its place.
+
+        Args:
+            x (int): The x coordinate of the position on the screen.
+            y (int): The y coordinate of the position on the screen.
+            zoom_in (bool): Whether to zoom in, else zoom out.
+
+        Returns:
+            bool: Whether the zoom changed.
+        """
+        anchor_x, anchor_y = self.to_cell(x, y)
+
+        if zoom_in and self.block > 1:
+            cell_size, block = 1, self.block // 2
+        elif zoom_in:
+            larger = [level for level in ZOOM_LEVELS if level > self.cell_size]
+            cell_size, block = (larger[0] if larger else self.cell_size), 1
+        elif self.cell_size > 1:
+            smaller = [level for level in ZOOM_LEVELS if level < self.cell_size]
+            cell_size, block = smaller[-1], 1
+        else:
+            cell_size, block = 1, min(self.block * 2, MAX_BLOCK)
+
+        if (cell_size, block) == (self.cell_size, self.block):
+            return False
+
+        self.cell_size, self.block, self.rest = cell_size, block, (0, 0)
+        self.x = self._align(anchor_x - x * block // cell_size)
+        self.y = self._align(anchor_y - y * block // cell_size)
+
+        return True
+
+    def move(self, dx: int, dy: int) -> bool:
+        """
+        Move the camera as if the grid was dragged by the given number of pixels.
+
+        Args:
+            dx (int): The number of pixels to drag by, horizontally.
+            dy (int): The number of pixels to drag by, vertically.
+
+        Returns:
+            bool: Whether the window of cells changed.
+        """
+        # Pixels by step of the camera, one cell or one block
+        step = max(self.cell_size, 1)
+        rest_x, rest_y = self.rest[0] + dx, self.rest[1] + dy
+        cells_x, cells_y = int(rest_x / step), int(rest_y / step)
+        self.rest = (rest_x - cells_x * step, rest_y - cells_y * step)
+
+        self.x -= cells_x * self.block
+        self.y -= cells_y * self.block
+
+        return cells_x != 0 or cells_y != 0
+
+    def to_cell(self, x: int, y: int) -> Tuple[int, int]:
+        """
+        Get the cell index under a position of the screen.
+
+        Args:
+            x (int): The x coordinate on the screen.
+            y (int): The y coordinate on the screen.
+
+        Returns:
+            Tuple[int, int]: The row and column of the cell.
+        """
+        row = self.x + x * self.block // self.cell_size
+        column = self.y + y * self.block // self.cell_size
+        return row, column
+
+    def to_screen(self, row: int, column: int) -> Tuple[int, int]:
+        """
+        Get the position on the screen of the top left corner of a cell.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+
+        Returns:
+            Tuple[int, int]: The x and y coordinates on the screen.
+        """
+        x = (row - self.x) * self.cell_size // self.block
+        y = (column - self.y) * self.cell_size // self.block
+        return x, y
+
+    def window(self, shape: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """
+        Get the window of cells visible on the screen.
+
+        Args:
+            shape (Tuple[int, int]): The shape of the grid.
+
+        Returns:
+            Tuple[int, int, int, int]: The first and last (excluded) rows, then columns.
+        """
+        screen_width, screen_height = self.screen_size
+        width = -(-screen_width * self.block // self.cell_size)
+        height = -(-screen_height * self.block // self.cell_size)
+
+        start_row = min(max(self.x, 0), shape[0])
+        end_row = min(max(self.x + width, 0), shape[0])
+        start_column = min(max(self.y, 0), shape[1])
+        end_column = min(max(self.y + height, 0), shape[1])
+
+        return start_row, end_row, start_column, end_column
+
+    def _align(self, position: int) -> int:
+        """Align a position on the blocks, when zoomed out."""
+        return position // self.block * self.block
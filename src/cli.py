@@ -1,7 +1,13 @@
-import numpy
+from pathlib import Path
+from typing import Optional
+
 import typer
 from typer.testing import CliRunner
 
+from src.command import report_progress
+from src.engines import ENGINES, ParallelEngine
+from src.rules import DEFAULT_RULE
+
 # Todo: WARNING
 # Instantiation, outside a function, allows Typer to capture the application so that it can interact with it.
 # I haven't found any other way of doing this, while still allowing the CLI to be detached to create the Console.
@@ -15,10 +21,10 @@ cli = typer.Typer(
 
 
 def get_app():
-    """Shorter way to get the application without cyclic imports."""
-    from src.app import app
+    """Shorter way to get the application (created on the first call) without cyclic imports."""
+    from src.app import get_app as get_game
 
-    return app
+    return get_game()
 
 
 @cli.command(help="Reshape the grid to the specified dimensions. (delete all cells)")
@@ -34,7 +40,7 @@ def reshape(
         height (int): New height of the grid.
     """
     app = get_app()
-    app.grid_model.grid = numpy.zeros((width, height), dtype=int)
+    app.grid_model.reshape(width, height)
     typer.echo(f"Grid reshaped, new dimensions: {width}x{height}")
 
 
@@ -48,9 +54,39 @@ def limit_fps(fps: int = typer.Argument(60, help="Frames per second")):
     """
     app = get_app()
     app.limit_fps = fps
+    app.grid_controller.scheduler.limit_fps = fps
     typer.echo(f"Speed changed, new speed: {fps}")
 
 
+@cli.command(help="Change the speed of the simulation. (0 for the fastest)")
+def limit_gps(gps: float = typer.Argument(40, help="Generations per second")):
+    """
+    Change the speed of the simulation (generations per second), while Space is held.
+
+    Notes:
+        With 0, each frame computes as many generations as fit in its budget of time.
+
+    Args:
+        gps (float): New generations per second to set.
+    """
+    app = get_app()
+    app.grid_controller.scheduler.limit_gps = gps
+    typer.echo(f"Simulation speed changed, new speed: {gps or 'fastest'}")
+
+
+@cli.command(help="Change the memory limit of the history.")
+def limit_history(megabytes: float = typer.Argument(64, help="Limit in megabytes")):
+    """
+    Change the memory limit of the history (oldest generations are dropped).
+
+    Args:
+        megabytes (float): New limit of the compressed history, in megabytes.
+    """
+    app = get_app()
+    app.grid_model.limit_history = int(megabytes * 2**20)
+    typer.echo(f"History limit changed, new limit: {megabytes} MB")
+
+
 @cli.command(help="Clear the grid of all live cells.")
 def clear():
     """Clear the grid of all live cells."""
@@ -61,6 +97,673 @@ def clear():
     typer.echo(f"Grid cleared, deleted cells: {number_cells_live}")
 
 
+@cli.command(help="Advance the grid by the given number of generations.")
+def step(generations: int = typer.Argument(1, help="Number of generations")):
+    """
+    Advance the grid by the given number of generations (fast with the 'hashlife' engine),
+    the progress is reported to the console and the command can be cancelled.
+
+    Args:
+        generations (int): Number of generations to compute.
+    """
+    app = get_app()
+    app.grid_model.advance(generations, callback=report_progress)
+    typer.echo(f"Grid advanced, generation: {app.grid_model.generation}")
+
+
+@cli.command(help="Change the number of workers. (only with 'parallel' engine)")
+def workers(number: int = typer.Argument(4, help="Number of worker processes")):
+    """
+    Change the number of worker processes of the 'parallel' engine.
+
+    Args:
+        number (int): Number of worker processes.
+    """
+    app = get_app()
+
+    if not isinstance(app.grid_model.engine, ParallelEngine):
+        typer.echo(
+            "The number of workers can only be changed with the 'parallel' engine"
+        )
+        raise typer.Exit(1)
+
+    app.grid_model.engine.set_workers(number)
+    typer.echo(f"Workers changed, new number: {app.grid_model.engine.workers}")
+
+
+@cli.command(help="Move the grid over the universe. ('sparse' or 'hashlife' engine)")
+def pan(
+    rows: int = typer.Argument(0, help="Number of rows to move by"),
+    columns: int = typer.Argument(0, help="Number of columns to move by"),
+):
+    """
+    Move the grid over the unbounded universe of the 'sparse' or 'hashlife' engine.
+
+    Args:
+        rows (int): Number of rows to move by.
+        columns (int): Number of columns to move by.
+    """
+    app = get_app()
+
+    if not app.grid_model.engine.unbounded:
+        typer.echo(
+            "The grid can only be moved with an unbounded engine (sparse, hashlife)"
+        )
+        raise typer.Exit(1)
+
+    app.grid_model.pan(rows, columns)
+    typer.echo(f"Grid moved, new offset: {app.grid_model.engine.offset}")
+
+
+@cli.command(help="Show the cycle entered by the grid, change the longest period.")
+def cycle(
+    max_period: Optional[int] = typer.Argument(None, help="Longest period detected"),
+):
+    """
+    Show the cycle entered by the grid, if detected, and change the longest period detected.
+
+    Args:
+        max_period (Optional[int]): New longest period of cycle detected.
+    """
+    app = get_app()
+    model = app.grid_model
+
+    if max_period is not None:
+        model.cycle_detector.max_period = max_period
+        model.reset_cycle()
+        typer.echo(f"Longest period changed, new period: {max_period}")
+
+    if model.cycle is None:
+        typer.echo("No cycle detected")
+    else:
+        typer.echo(
+            f"Cycle of period {model.cycle.period} since generation {model.cycle.start}"
+        )
+
+
+@cli.command(
+    help="Load a pattern or a snapshot file. (.rle, .lif, .life, .cells, .gol)"
+)
+def load(
+    path: Path = typer.Argument(..., help="Path of the pattern or snapshot file"),
+    x: int = typer.Option(0, help="First row of the part to load"),
+    y: int = typer.Option(0, help="First column of the part to load"),
+    width: Optional[int] = typer.Option(None, help="Number of rows of the part"),
+    height: Optional[int] = typer.Option(None, help="Number of columns of the part"),
+):
+    """
+    Load a pattern file at the center of the grid, enlarged to fit the pattern if needed,
+    or a snapshot file replacing the grid (and its generation), with the rule of the file.
+
+    Notes:
+        Only the part of a snapshot asked is read from the file (huge grids). Whole rows
+        are loaded packed, the 'bitpacked' engine doesn't unpack them.
+
+    Args:
+        path (Path): Path of the file, the format is given by its extension.
+        x (int): First row of the part of the file to load.
+        y (int): First column of the part of the file to load.
+        width (Optional[int]): Number of rows of the part (up to the end by default).
+        height (Optional[int]): Number of columns of the part (up to the end by default).
+    """
+    from src.patterns import load_pattern, place
+    from src.snapshot import SNAPSHOT_EXTENSION, open_snapshot
+
+    app = get_app()
+    model = app.grid_model
+    end_x = None if width is None else x + width
+    end_y = None if height is None else y + height
+    words = None
+
+    try:
+        if path.suffix.lower() == SNAPSHOT_EXTENSION:
+            snapshot = open_snapshot(path)
+            rule, generation = snapshot.rule, snapshot.generation
+
+            if y <= 0 and (height is None or y + height >= snapshot.shape[1]):
+                words = snapshot.read_words(x, width)
+            else:
+                cells = snapshot.read(x, y, width, height)
+        else:
+            pattern = load_pattern(path)
+            rule, generation = pattern.rule, 0
+            cells = place(pattern.cells[x:end_x, y:end_y], model.shape)
+
+    except (OSError, ValueError) as error:
+        typer.echo(f"Can't load the file: {error}")
+        raise typer.Exit(1)
+
+    _apply_rule(model, rule)
+
+    if words is not None:
+        model.load_packed(words, snapshot.shape[1], generation=generation)
+    else:
+        model.load(cells, generation=generation)
+    typer.echo(
+        f"File loaded: generation {generation}, "
+        f"grid: {model.shape[0]}x{model.shape[1]}, rule: {model.rule}"
+    )
+
+
+@cli.command(
+    help="Save the grid to a pattern or a snapshot file. (.rle, .lif, .life, .cells, .gol)"
+)
+def save(path: Path = typer.Argument(..., help="Path of the pattern or snapshot file")):
+    """
+    Save the live cells of the grid to a pattern file, or the whole grid (and its
+    generation) to a snapshot file, with the rule of the grid.
+
+    Args:
+        path (Path): Path of the file, the format is given by its extension.
+    """
+    from src.patterns import save_pattern
+    from src.snapshot import SNAPSHOT_EXTENSION, save_snapshot
+
+    app = get_app()
+    model = app.grid_model
+
+    try:
+        if path.suffix.lower() == SNAPSHOT_EXTENSION:
+            save_snapshot(
+                path, model.grid, generation=model.generation, rule=str(model.rule)
+            )
+        else:
+            save_pattern(path, model.grid, rule=str(model.rule))
+
+    except (OSError, ValueError) as error:
+        typer.echo(f"Can't save the file: {error}")
+        raise typer.Exit(1)
+
+    typer.echo(f"Grid saved to: {path}")
+
+
+@cli.command(help="Record the generations to a file, or stop the recording.")
+def record(
+    path: Optional[Path] = typer.Argument(None, help="Path of the recording file"),
+    keyframe_interval: int = typer.Option(64, help="Generations between keyframes"),
+):
+    """
+    Record the generations to a file from the current one, or stop the recording
+    if no path is given.
+
+    Args:
+        path (Optional[Path]): Path of the recording file, None to stop the recording.
+        keyframe_interval (int): Number of generations between two full grids.
+    """
+    app = get_app()
+    model = app.grid_model
+
+    if path is None:
+        recorder = model.stop_recording()
+
+        if recorder is None:
+            typer.echo("No recording in progress")
+        else:
+            typer.echo(f"Recording stopped: {recorder.count} generations")
+
+        return
+
+    try:
+        model.start_recording(path, keyframe_interval=keyframe_interval)
+    except (OSError, ValueError) as error:
+        typer.echo(f"Can't record: {error}")
+        raise typer.Exit(1)
+
+    typer.echo(f"Recording to: {path}")
+
+
+@cli.command(help="Load a generation of a recording file.")
+def replay(
+    path: Path = typer.Argument(..., help="Path of the recording file"),
+    generation: Optional[int] = typer.Argument(None, help="Generation (last if none)"),
+):
+    """
+    Load a generation of a recording, from the nearest keyframe before it, with the rule
+    of the recording.
+
+    Args:
+        path (Path): Path of the recording file.
+        generation (Optional[int]): Generation to load, the last one recorded if None.
+    """
+    from src.recording import Recording
+
+    app = get_app()
+    model = app.grid_model
+
+    try:
+        recording = Recording(path)
+    except (OSError, ValueError) as error:
+        typer.echo(f"Can't load the recording: {error}")
+        raise typer.Exit(1)
+
+    try:
+        first, last = recording.first_generation, recording.last_generation
+
+        if first is None:
+            typer.echo("The recording is empty")
+            raise typer.Exit(1)
+
+        generation, grid = recording.seek(last if generation is None else generation)
+    except ValueError as error:
+        typer.echo(f"Can't load the generation: {error}")
+        raise typer.Exit(1)
+    finally:
+        recording.close()
+
+    _apply_rule(model, recording.rule)
+    model.load(grid, generation=generation)
+    typer.echo(
+        f"Generation {generation} loaded, recorded: {first} to {last}, "
+        f"rule: {model.rule}"
+    )
+
+
+@cli.command(help="Change the engine computing the generations.")
+def engine(name: str = typer.Argument("numpy", help="Name of the engine")):
+    """
+    Change the engine computing the generations.
+
+    Args:
+        name (str): Name of the engine to use.
+    """
+    if name not in ENGINES:
+        typer.echo(f"Unknown engine: '{name}', available: {', '.join(ENGINES)}")
+        raise typer.Exit(1)
+
+    app = get_app()
+
+    try:
+        app.grid_model.set_engine(name)
+    except ValueError as error:
+        typer.echo(f"Can't change the engine: {error}")
+        raise typer.Exit(1)
+
+    typer.echo(f"Engine changed, new engine: {name}")
+
+
+@cli.command(
+    help="Change the rule of the generations. (B3/S23, highlife, R5,C0,M1,...)"
+)
+def rule(
+    rulestring: Optional[str] = typer.Argument(None, help="Rule or name of a rule"),
+    neighborhood: Optional[Path] = typer.Option(
+        None, help="Pattern file of the cells counted around a cell (centered)"
+    ),
+):
+    """
+    Change the rule of the generations, or show it and the rules known by name.
+
+    Args:
+        rulestring (Optional[str]): Rule in the B/S or Larger than Life notation, or
+            name of a rule, None to show the current rule.
+        neighborhood (Optional[Path]): Pattern file of a custom neighborhood (odd
+            sides), the numbers of neighbors are those of the rule.
+    """
+    from src.patterns import load_pattern
+    from src.rules import RULES, custom_rule, parse_rule
+
+    app = get_app()
+    model = app.grid_model
+
+    if rulestring is None and neighborhood is None:
+        typer.echo(f"Rule: {model.rule}")
+
+        for name, text in RULES.items():
+            typer.echo(f"{name:>20} {text}")
+
+        return
+
+    try:
+        new_rule = model.rule if rulestring is None else parse_rule(rulestring)
+
+        if neighborhood is not None:
+            new_rule = custom_rule(new_rule, load_pattern(neighborhood).cells)
+
+        model.set_rule(new_rule)
+
+    except (OSError, ValueError) as error:
+        typer.echo(f"Can't change the rule: {error}")
+        raise typer.Exit(1)
+
+    typer.echo(f"Rule changed, new rule: {model.rule}")
+
+
+@cli.command(help="Run a simulation without display and report its performance.")
+def simulate(
+    size: str = typer.Option("1024x1024", help="Size of the grid (WIDTHxHEIGHT)"),
+    generations: int = typer.Option(1000, help="Number of generations"),
+    seed: Optional[int] = typer.Option(None, help="Seed of the random soup"),
+    density: float = typer.Option(0.5, help="Density of alive cells of the soup"),
+    engine: str = typer.Option("numpy", help="Name of the engine"),
+    stop_when_stable: bool = typer.Option(True, help="Stop when the grid is stable"),
+    fast_forward: bool = typer.Option(True, help="Jump to the end once in a cycle"),
+    max_period: int = typer.Option(64, help="Longest period of cycle detected"),
+    record: Optional[Path] = typer.Option(
+        None, help="Record the generations to a file"
+    ),
+    rule: str = typer.Option(DEFAULT_RULE, help="Rule of the generations"),
+):
+    """
+    Run a simulation of a random soup without display (doesn't use pygame).
+
+    Args:
+        size (str): Size of the grid, as 'WIDTHxHEIGHT'.
+        generations (int): Number of generations to compute.
+        seed (Optional[int]): Seed of the random soup.
+        density (float): Density of alive cells of the random soup.
+        engine (str): Name of the engine to use.
+        stop_when_stable (bool): Stop as soon as the grid no longer changes.
+        fast_forward (bool): Jump to the last generation once a cycle is detected.
+        max_period (int): Longest period of cycle detected.
+        record (Optional[Path]): Path of the file recording the generations, if any.
+        rule (str): Rule of the generations, in the B/S notation or by name.
+    """
+    from src.model import GridModel
+    from src.rules import parse_rule
+    from src.simulation import random_grid, simulate as run_simulation
+
+    if engine not in ENGINES:
+        typer.echo(f"Unknown engine: '{engine}', available: {', '.join(ENGINES)}")
+        raise typer.Exit(1)
+
+    try:
+        width, height = (int(value) for value in size.lower().split("x"))
+    except ValueError:
+        typer.echo(f"Invalid size: '{size}', expected WIDTHxHEIGHT")
+        raise typer.Exit(1)
+
+    # No history, compressing each generation would slow down the simulation
+    model = GridModel(
+        shape=(width, height), limit_history=0, engine=engine, max_period=max_period
+    )
+    model.grid = random_grid((width, height), density=density, seed=seed)
+
+    try:
+        model.set_rule(parse_rule(rule))
+    except ValueError as error:
+        typer.echo(f"Can't use the rule: {error}")
+        model.engine.close()
+        raise typer.Exit(1)
+
+    if record is not None:
+        try:
+            model.start_recording(record)
+        except (OSError, ValueError) as error:
+            typer.echo(f"Can't record: {error}")
+            model.engine.close()
+            raise typer.Exit(1)
+
+    report = run_simulation(
+        model, generations, stop_when_stable=stop_when_stable, fast_forward=fast_forward
+    )
+    model.stop_recording()
+    model.engine.close()
+
+    stable = report.stable_generation
+    typer.echo(f"Grid: {width}x{height}, engine: {report.engine}, rule: {model.rule}")
+    typer.echo(f"Generations: {report.generations} in {report.duration:.3f}s")
+
+    if report.skipped:
+        typer.echo(f"Generations skipped by the cycle: {report.skipped}")
+
+    typer.echo(f"Generations/sec: {report.generations_per_second:.2f}")
+    typer.echo(f"Cells/sec: {report.cells_per_second:.3e}")
+    typer.echo(f"Final population: {report.population}")
+    typer.echo(
+        f"Stable since generation: {'not reached' if stable is None else stable}"
+    )
+
+    if report.period is not None:
+        typer.echo(
+            f"Cycle of period {report.period} since generation {report.cycle_generation}"
+        )
+
+
+@cli.command(help="Show the timings of the frames, toggle the overlay or the CSV.")
+def stats(
+    overlay: bool = typer.Option(False, "--overlay", help="Show / Hide the overlay"),
+    csv: Optional[Path] = typer.Option(None, help="Stream the timings to a CSV file"),
+    stop: bool = typer.Option(False, "--stop", help="Stop timing the frames"),
+):
+    """
+    Show the statistics of the timings of the phases of the frames (starts the profiler
+    if stopped), toggle the overlay (key 'p') or stream the timings to a CSV file.
+
+    Args:
+        overlay (bool): Show / Hide the overlay of the statistics.
+        csv (Optional[Path]): Path of the CSV file the timings are streamed to.
+        stop (bool): Stop timing the frames, and streaming to the CSV file.
+    """
+    app = get_app()
+    profiler = app.profiler
+
+    if stop:
+        profiler.stop_csv()
+        profiler.enabled = False
+        profiler.clear()
+        typer.echo("Profiler stopped")
+        return
+
+    if overlay:
+        app.stats_overlay.toggle()
+
+    if csv is not None:
+        try:
+            profiler.start_csv(csv)
+        except OSError as error:
+            typer.echo(f"Can't write the CSV file: {error}")
+            raise typer.Exit(1)
+
+        typer.echo(f"Streaming the timings to: {csv}")
+
+    if not profiler.enabled:
+        profiler.enabled = True
+        typer.echo("Profiler started, timing the next frames")
+        return
+
+    for line in profiler.lines(app.limit_fps):
+        typer.echo(line)
+
+
+@cli.command(help="Benchmark the engines on grid sizes, patterns and densities.")
+def benchmark(
+    engines: Optional[str] = typer.Option(None, help="Engines (all but reference)"),
+    sizes: str = typer.Option("64,256,1024,4096,8192", help="Sizes of the grids"),
+    patterns: str = typer.Option("r-pentomino,gosper-gun,soup", help="Patterns"),
+    densities: str = typer.Option("0.1,0.3,0.5", help="Densities of the soups"),
+    generations: int = typer.Option(10, help="Number of generations of each case"),
+    max_seconds: float = typer.Option(30, help="Time limit of each case"),
+    output: Path = typer.Option("benchmark.json", help="Path of the JSON results"),
+    baseline: Optional[Path] = typer.Option(None, help="JSON results to compare with"),
+):
+    """
+    Benchmark the engines (cells per second and peak of memory) and write the results
+    to a JSON file, compared with the results of an older run if given.
+
+    Args:
+        engines (Optional[str]): Names of the engines, separated by commas.
+        sizes (str): Sizes of the square grids, separated by commas.
+        patterns (str): Patterns at the start ('soup' for a random soup).
+        densities (str): Densities of the random soups, separated by commas.
+        generations (int): Number of generations computed in each case.
+        max_seconds (float): Time after which an engine stops a case.
+        output (Path): Path of the JSON file of the results.
+        baseline (Optional[Path]): Path of the JSON results of an older run.
+    """
+    from src.benchmark import (
+        compare_results,
+        default_engines,
+        read_results,
+        run_benchmark,
+        write_results,
+    )
+
+    names = engines.split(",") if engines else default_engines()
+    unknown = [name for name in names if name not in ENGINES]
+
+    if unknown:
+        typer.echo(
+            f"Unknown engines: {', '.join(unknown)}, available: {', '.join(ENGINES)}"
+        )
+        raise typer.Exit(1)
+
+    try:
+        old = read_results(baseline) if baseline is not None else []
+        grid_sizes = [int(size) for size in sizes.split(",")]
+        pattern_names = patterns.split(",")
+        soup_densities = [float(density) for density in densities.split(",")]
+        cases = run_benchmark(
+            names,
+            sizes=grid_sizes,
+            patterns=pattern_names,
+            densities=soup_densities,
+            generations=generations,
+            max_seconds=max_seconds,
+        )
+
+        # A soup is run at every density, a pattern once
+        soups = pattern_names.count("soup")
+        per_size = len(pattern_names) - soups + soups * len(soup_densities)
+        total = len(grid_sizes) * per_size * len(names)
+        results = []
+        report_progress(0, total, "benchmark")
+
+        for result in cases:
+            results.append(result)
+            report_progress(len(results), total, "benchmark")
+            width, height = result.shape
+            density = "" if result.density is None else f" {result.density}"
+            typer.echo(
+                f"{result.engine:>11} {width}x{height} {result.pattern}{density}: "
+                f"{result.cells_per_second:.3e} cells/s, "
+                f"{result.peak_memory / 2**20:.1f} MB peak"
+            )
+
+        write_results(output, results)
+
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        typer.echo(f"Can't run the benchmark: {error}")
+        raise typer.Exit(1)
+
+    typer.echo(f"Results written to: {output}")
+
+    speedups = compare_results(results, old)
+
+    for (engine, shape, pattern, density), speedup in speedups.items():
+        density = "" if density is None else f" {density}"
+        typer.echo(
+            f"{engine:>11} {shape[0]}x{shape[1]} {pattern}{density}: x{speedup:.2f}"
+        )
+
+
+@cli.command(
+    help="Check the grids of the engines: reference, jumps, history, recording."
+)
+def check_engines(
+    engines: Optional[str] = typer.Option(None, help="Engines (all but reference)"),
+    size: int = typer.Option(48, help="Size of the grid"),
+    generations: int = typer.Option(32, help="Number of generations compared"),
+    seed: int = typer.Option(0, help="Seed of the random soup"),
+    rule: str = typer.Option(DEFAULT_RULE, help="Rule of the generations"),
+):
+    """
+    Compare the generations of the engines with the reference engine (looping over the
+    cells), check that the jumps of many generations (in chunks or not) give the same
+    grids as the steps, that the states come back unchanged from the history, and that
+    a recording seeks the right grids after an undo, on the canonical patterns and a
+    random soup.
+
+    Args:
+        engines (Optional[str]): Names of the engines, separated by commas.
+        size (int): Size of the square grid.
+        generations (int): Number of generations compared.
+        seed (int): Seed of the random soup.
+        rule (str): Rule of the generations, in the B/S notation or by name.
+    """
+    from src.benchmark import CHECKS, PATTERNS, check_engines as run_checks
+    from src.benchmark import default_engines
+    from src.engines import get_engine
+    from src.rules import parse_rule
+
+    names = engines.split(",") if engines else default_engines()
+    unknown = [name for name in names if name not in ENGINES]
+
+    if unknown:
+        typer.echo(
+            f"Unknown engines: {', '.join(unknown)}, available: {', '.join(ENGINES)}"
+        )
+        raise typer.Exit(1)
+
+    try:
+        checked_rule = parse_rule(rule)
+    except ValueError as error:
+        typer.echo(f"Can't use the rule: {error}")
+        raise typer.Exit(1)
+
+    # The engines that can't apply the rule are skipped (B0 on an unbounded universe)
+    for name in list(names):
+        try:
+            get_engine(name).set_rule(checked_rule)
+        except ValueError as error:
+            typer.echo(f"{name:>11} skipped: {error}")
+            names.remove(name)
+
+    failed = 0
+    total = len(names) * len(PATTERNS) * len(CHECKS)
+    report_progress(0, total, "check")
+
+    results = run_checks(
+        names, size=size, generations=generations, seed=seed, rule=checked_rule
+    )
+
+    for i, result in enumerate(results):
+        report_progress(i + 1, total, "check")
+
+        case = f"{result.engine:>11} {result.pattern} ({result.check})"
+
+        if result.passed:
+            typer.echo(f"{case}: identical")
+        else:
+            failed += 1
+            typer.echo(f"{case}: different at generation {result.mismatch}")
+
+    if failed:
+        raise typer.Exit(1)
+
+
+@cli.command(help="Measure the startup time of the modules and of the workers.")
+def startup(
+    repeat: int = typer.Option(3, help="Number of cold starts of each module"),
+    workers: int = typer.Option(2, help="Number of workers of the 'parallel' engine"),
+):
+    """
+    Measure the import time of the modules in new interpreters (cold start), and the
+    start of the worker processes of the 'parallel' engine.
+
+    Args:
+        repeat (int): Number of cold starts of each module, the fastest is kept.
+        workers (int): Number of worker processes started.
+    """
+    from src.benchmark import STARTUP_MODULES, measure_import, measure_workers
+
+    for module in STARTUP_MODULES:
+        duration = measure_import(module, repeat=repeat)
+        typer.echo(f"import {module:<12} {duration * 1000:>8.1f} ms")
+
+    duration = measure_workers(workers)
+    typer.echo(f"{workers} workers started  {duration * 1000:>8.1f} ms")
+
+
+def _apply_rule(model, text: str):
+    """Apply the rule of a file to the model, the current rule is kept if not supported."""
+    from src.rules import parse_rule
+
+    try:
+        model.set_rule(parse_rule(text))
+    except ValueError as error:
+        typer.echo(f"Rule '{text}' not supported, keeping {model.rule}: {error}")
+
+
 @cli.command(name="help", help="Display help message, list of commands.")
 def _help():
     """Makes the 'help' command more consistent in a console."""
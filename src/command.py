@@ -0,0 +1,151 @@
+import logging
+import threading
+from collections import deque
+from contextlib import redirect_stdout
+from typing import Deque, List, Optional, Sequence, Tuple
+
+import click
+import typer
+
+# The worker running a command in the current thread, to report its progress
+_local = threading.local()
+
+
+class CommandCancelled(Exception):
+    """Raised in a command when the user cancelled it, at its next progress report."""
+
+
+def report_progress(done: int, total: int, text: str = ""):
+    """
+    Report the progress of the command running in a worker (does nothing outside one).
+
+    Notes:
+        The long commands call it between their steps, it's also where a cancelled
+        command stops: the exception unwinds the command like any other error.
+
+    Args:
+        done (int): The number of steps done.
+        total (int): The number of steps of the command.
+        text (str): The step running, shown before the progress.
+
+    Raises:
+        CommandCancelled: If the user cancelled the command.
+
+    """
+    worker: Optional[CommandWorker] = getattr(_local, "worker", None)
+
+    if worker is None:
+        return
+
+    worker.progress = (done, total, text)
+
+    if worker.cancelled:
+        raise CommandCancelled()
+
+
+class CommandWorker(threading.Thread):
+    """
+    Thread running a command of the CLI, its output is streamed line by line.
+
+    Notes:
+        The standard output is redirected to the worker while the command runs, so
+        'typer.echo' writes the lines the console reads on each frame. Only one command
+        runs at a time, the redirection is shared by the threads.
+
+    Attributes:
+        cli (typer.Typer): The CLI application running the command.
+        args (List[str]): The arguments of the command.
+        progress (Optional[Tuple[int, int, str]]): The last progress reported, if any.
+        cancelled (bool): Whether the user cancelled the command.
+        exit_code (Optional[int]): The exit code of the command, None while it runs.
+    """
+
+    cli: typer.Typer
+    args: List[str]
+    progress: Optional[Tuple[int, int, str]]
+    cancelled: bool
+    exit_code: Optional[int]
+
+    def __init__(self, cli: typer.Typer, args: Sequence[str]):
+        super().__init__(name="console-command", daemon=True)
+        self.cli = cli
+        self.args = list(args)
+        self.progress = None
+        self.cancelled = False
+        self.exit_code = None
+
+        self._lines: Deque[str] = deque()
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the command is still running."""
+        return self.exit_code is None
+
+    def run(self):
+        """Run the command, its output and errors are written as lines."""
+        _local.worker = self
+        command = typer.main.get_command(self.cli)
+        exit_code = 1
+
+        try:
+            with redirect_stdout(self):
+                result = command.main(
+                    args=self.args, prog_name=command.name, standalone_mode=False
+                )
+
+            exit_code = result if isinstance(result, int) else 0
+
+        except CommandCancelled:
+            self.write("Command cancelled\n")
+
+        except click.ClickException as error:
+            error.show(file=self)
+            exit_code = error.exit_code
+
+        except click.exceptions.Abort:
+            self.write("Aborted\n")
+
+        except Exception as error:
+            logging.exception(f"Command failed: {self.args}")
+            self.write(f"Error: {error!r}\n")
+
+        finally:
+            _local.worker = None
+
+            # The last line may not end with a new line
+            with self._lock:
+                if self._buffer:
+                    self._lines.append(self._buffer)
+                    self._buffer = ""
+
+            self.exit_code = exit_code
+
+    def cancel(self):
+        """Ask the command to stop, at its next progress report."""
+        self.cancelled = True
+
+    def write(self, text: str) -> int:
+        """Write the output of the command, the complete lines are kept for the console."""
+        with self._lock:
+            *lines, self._buffer = (self._buffer + text).split("\n")
+            self._lines.extend(lines)
+
+        return len(text)
+
+    def flush(self):
+        """Nothing to flush, the lines are read by the console on each frame."""
+
+    def pop_lines(self) -> List[str]:
+        """
+        Get the lines written since the last call.
+
+        Returns:
+            List[str]: The lines of output, the oldest first.
+        """
+        with self._lock:
+            lines = list(self._lines)
+            self._lines.clear()
+
+        return lines
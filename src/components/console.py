@@ -1,15 +1,18 @@
-from typing import List
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Optional
 
 import pygame
 import typer
-from typer.testing import CliRunner
 
+from src.command import CommandWorker
 from src.components.base import Component
 from src.components.input_text import InputText, _draw_input_text
 from src.core.keyboard import KeyboardInfo
 from src.core.mouse import MouseInfo
 
-runner = CliRunner()
+# Frames of the spinner shown while a command runs without reporting its progress
+SPINNER = "|/-\\"
 
 
 class Console(Component):
@@ -21,18 +24,28 @@ class Console(Component):
         cli (typer.Typer): The CLI application to bind to.
         input_text (InputText): The input text component.
 
-        history (List[str]): The history of the console.
-        history_limit (int): The limit of the history.
+        history (Deque[str]): The history of the console, the oldest lines are dropped.
+        history_limit (int): The number of lines of the history displayed.
+        history_size (int): The number of lines of the history kept.
         history_font_color (pygame.Color): The color of the history font
+        scroll (int): The number of lines scrolled back from the last line.
+
+        pending (Optional[List[str]]): The arguments of the command to run next, if any.
+        worker (Optional[CommandWorker]): The worker running the command, if any.
     """
 
     active: bool
     cli: typer.Typer
     input_text: InputText
 
-    history: List[str]
+    history: Deque[str]
     history_limit: int
+    history_size: int
     history_font_color: pygame.Color
+    scroll: int
+
+    pending: Optional[List[str]]
+    worker: Optional[CommandWorker]
 
     def __init__(
         self,
@@ -47,6 +60,7 @@ class Console(Component):
         font_color: pygame.Color = pygame.Color(255, 255, 255),
         background_color: pygame.Color = pygame.Color(0, 0, 0, 200),
         history_limit: int = 30,
+        history_size: int = 1000,
         history_font_color: pygame.Color = pygame.Color(220, 220, 220),
     ):
         self.input_text = InputText(
@@ -63,10 +77,21 @@ class Console(Component):
 
         self.input_text.bind = self.bind
         self.cli = cli
-        self.history = []
+        self.history = deque(maxlen=history_size)
         self.active = active
         self.history_limit = history_limit
+        self.history_size = history_size
         self.history_font_color = history_font_color
+        self.scroll = 0
+
+        self.pending = None
+        self.worker = None
+        self._spinner = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether a command is running (or about to run) in the worker."""
+        return self.pending is not None or self.worker is not None
 
     def handle_event(self, mouse_info: MouseInfo, keyboard_info: KeyboardInfo):
         """Open / Close the console by activating / deactivating components"""
@@ -77,8 +102,61 @@ class Console(Component):
             self.input_text.active = active
             return
 
+        # Scroll the history with the wheel
+        if self.active and (mouse_info.wheel_up or mouse_info.wheel_down):
+            lines = 3 if mouse_info.wheel_up else -3
+            self.scroll_history(lines)
+
+        self._read_worker()
+
+        # Ctrl+C cancels the command running, instead of being typed
+        if keyboard_info.keyboard_click["\x03"]:
+            self.cancel()
+            return
+
         self.input_text.handle_event(mouse_info, keyboard_info)
 
+    def run_pending(self):
+        """Start the command entered in the console, in a worker (the frames go on)."""
+        if self.pending is None:
+            return
+
+        self.worker = CommandWorker(self.cli, self.pending)
+        self.pending = None
+        self.worker.start()
+
+    def cancel(self):
+        """Ask the command running to stop (at its next progress report)."""
+        if self.worker is not None and not self.worker.cancelled:
+            self.worker.cancel()
+            self.history.append("Cancelling the command...")
+            self.scroll = 0
+
+    def _read_worker(self):
+        """Add the lines written by the command to the history, forget it once done."""
+        if self.worker is None:
+            return
+
+        lines = self.worker.pop_lines()
+
+        if lines:
+            self.history.extend(lines)
+            self.scroll = 0
+
+        if not self.worker.running:
+            self.worker = None
+
+    def scroll_history(self, lines: int):
+        """
+        Scroll the history back (positive) or forward (negative), within the history.
+
+        Args:
+            lines (int): The number of lines to scroll by.
+
+        """
+        last_scroll = max(len(self.history) - (self.history_limit - 1), 0)
+        self.scroll = min(max(self.scroll + lines, 0), last_scroll)
+
     def draw(self, screen: pygame.Surface):
         """Draws text entry and old commands."""
         if self.active:
@@ -93,17 +171,44 @@ class Console(Component):
                 ),
             )
 
+            # The progress of the command running takes the line above the input
+            offset = 0
+
+            if self.worker is not None:
+                text = self.input_text.text_cache.font.render(
+                    self._progress_text(), True, self.history_font_color
+                )
+                padding_vertical = (
+                    screen.size[1]
+                    - self.input_text.font_size * 1.5
+                    - self.input_text.font_size
+                )
+                screen.blit(
+                    text,
+                    (
+                        self.input_text.textbox_rect.x + padding_horizontal,
+                        self.input_text.textbox_rect.y + padding_vertical,
+                    ),
+                )
+                offset = 1
+
             if len(self.history) > 0:
+                # Only the lines displayed are read, from the last line scrolled to
+                lines = islice(
+                    reversed(self.history),
+                    self.scroll,
+                    self.scroll + self.history_limit - 1 - offset,
+                )
+
                 # Imprimer au dessus de l'input jusqu'a la limite d'affichage
-                for i, line in enumerate(self.history[: -self.history_limit : -1]):
-                    font = pygame.font.Font(
-                        self.input_text.font_path, self.input_text.font_size
+                for i, line in enumerate(lines):
+                    text = self.input_text.text_cache.render(
+                        line, self.history_font_color
                     )
-                    text = font.render(line, True, self.history_font_color)
                     padding_vertical = (
                         screen.size[1]
                         - self.input_text.font_size * 1.5
-                        - (i + 1) * self.input_text.font_size
+                        - (i + 1 + offset) * self.input_text.font_size
                     )
                     screen.blit(
                         text,
@@ -113,10 +218,36 @@ class Console(Component):
                         ),
                     )
 
+    def _progress_text(self) -> str:
+        """Get the line of the command running: a spinner and its last progress."""
+        self._spinner = (self._spinner + 1) % (len(SPINNER) * 4)
+        spinner = SPINNER[self._spinner // 4]
+        progress = self.worker.progress
+
+        if self.worker.cancelled:
+            return f"{spinner} cancelling"
+
+        if progress is None:
+            return (
+                f"{spinner} running '{' '.join(self.worker.args)}' (Ctrl+C to cancel)"
+            )
+
+        done, total, text = progress
+        percent = done / total * 100 if total else 100.0
+        text = f"{text} " if text else ""
+        return f"{spinner} {text}{percent:.0f}% ({done}/{total})"
+
     def bind(self):
-        """Runs command and adds result to history."""
-        result = runner.invoke(self.cli, self.input_text.text.split())
-        self.history += result.stdout.split("\n")
-        # Todo : Faire une deuxième limite d'historique mémoire
-        # self.history = self.history[-self.history_limit:]
+        """Queue the command entered to run in a worker, its output goes to history."""
+        text = self.input_text.text
         self.input_text.text = ""
+        self.scroll = 0
+
+        if not self.running:
+            self.pending = text.split()
+
+        elif text.strip() == "cancel":
+            self.cancel()
+
+        else:
+            self.history.append("A command is running, enter 'cancel' to stop it")
@@ -1,7 +1,10 @@
+from typing import Optional, Tuple
+
 import pygame
 
 from src import STATIC_PATH
 from src.components.base import Component
+from src.components.text import TextCache, get_font
 from src.core.keyboard import KeyboardInfo
 from src.core.mouse import MouseInfo
 
@@ -20,6 +23,7 @@ class InputText(Component):
         font_path (Path): The path to the font.
 
         background_color (pygame.Color): The color of the background.
+        text_cache (TextCache): The cache of the rendered lines, with the font.
     """
 
     def __init__(
@@ -47,6 +51,33 @@ class InputText(Component):
         if not self.font_path.exists():
             raise FileNotFoundError(f"Font not found: '{self.font_path}'")
 
+        self.text_cache = TextCache(get_font(self.font_path, font_size))
+        self._backdrop: Optional[pygame.Surface] = None
+        self._backdrop_key: Optional[Tuple] = None
+
+    def get_backdrop(self) -> pygame.Surface:
+        """
+        Get the translucent background of the textbox, built again only if changed.
+
+        Returns:
+            pygame.Surface: The background, of the size of the textbox.
+        """
+        key = (self.textbox_rect.size, tuple(self.background_color))
+
+        if key != self._backdrop_key:
+            backdrop = pygame.Surface(self.textbox_rect.size)
+            backdrop.fill(self.background_color)
+
+            # Same pixel format as the screen, faster to blit (the conversion drops
+            # the alpha of the surface, it's set on the converted one)
+            if pygame.display.get_surface() is not None:
+                backdrop = backdrop.convert()
+
+            backdrop.set_alpha(self.background_color.a)
+            self._backdrop, self._backdrop_key = backdrop, key
+
+        return self._backdrop
+
     def handle_event(self, mouse_info: MouseInfo, keyboard_info: KeyboardInfo):
         """Delete last character, add character or bind the input text."""
         if self.active:
@@ -92,19 +123,7 @@ def _draw_input_text(
     Returns:
         pygame.Surface: The surface with the input text.
     """
-    # Create a surface for the textbox rectangle
-    textbox_surface = pygame.Surface(input_text.textbox_rect.size)
-
-    # Fill the surface with the background color
-    textbox_surface.fill(input_text.background_color)
-
-    # Make the surface transparent
-    textbox_surface.set_alpha(input_text.background_color.a)
-
-    # Draw the surface on the screen
-    screen.blit(textbox_surface, input_text.textbox_rect)
-
-    font = pygame.Font(input_text.font_path, input_text.font_size)
-    text = font.render(input_text.text, True, pygame.Color(input_text.font_color))
+    # Draw the translucent background (built once) on the screen
+    screen.blit(input_text.get_backdrop(), input_text.textbox_rect)
 
-    return text
+    return input_text.text_cache.render(input_text.text, input_text.font_color)
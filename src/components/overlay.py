@@ -0,0 +1,109 @@
+import time
+from typing import Optional
+
+import pygame
+
+from src import STATIC_PATH
+from src.components.base import Component
+from src.components.text import get_font
+from src.core.keyboard import KeyboardInfo
+from src.core.mouse import MouseInfo
+from src.profiler import FrameProfiler
+
+
+class StatsOverlay(Component):
+    """
+    Overlay showing the statistics of the frame profiler, over the grid.
+
+    Notes:
+        The text is rendered again only a few times per second, the surface is blitted
+        on an opaque background so it can be drawn over the last frame without
+        drawing the grid again.
+
+    Attributes:
+        profiler (FrameProfiler): The profiler of the frames.
+        active (bool): Whether the overlay is shown.
+        limit_fps (int): The limit of frames per second, to count the dropped frames.
+        refresh (float): The time between two renderings of the text, in seconds.
+        rect (Optional[pygame.Rect]): The area drawn on the last frame, if any.
+    """
+
+    profiler: FrameProfiler
+    active: bool
+    limit_fps: int
+    refresh: float
+    rect: Optional[pygame.Rect]
+
+    def __init__(
+        self,
+        profiler: FrameProfiler,
+        x: int = 10,
+        y: int = 10,
+        active: bool = False,
+        font_name: str = "Consolas.ttf",
+        font_size: int = 14,
+        font_color: pygame.Color = pygame.Color(255, 255, 255),
+        background_color: pygame.Color = pygame.Color(0, 0, 0),
+        refresh: float = 0.25,
+    ):
+        self.profiler = profiler
+        self.position = (x, y)
+        self.active = active
+        self.limit_fps = 60
+        self.refresh = refresh
+        self.rect = None
+
+        self.font = get_font(STATIC_PATH / font_name, font_size)
+        self.font_color = font_color
+        self.background_color = background_color
+
+        self._surface: Optional[pygame.Surface] = None
+        self._rendered = 0.0
+
+    def handle_event(self, mouse_info: MouseInfo, keyboard_info: KeyboardInfo):
+        """Show / Hide the overlay with the key 'p', showing it starts the profiler."""
+        if keyboard_info.keyboard_click["p"]:
+            self.toggle()
+
+    def toggle(self):
+        """Show / Hide the overlay, showing it starts the profiler."""
+        self.active = not self.active
+        self._surface = None
+
+        if self.active:
+            self.profiler.enabled = True
+
+    def draw(self, screen: pygame.Surface):
+        """Draw the statistics, rendered again if the last rendering is too old."""
+        if not self.active:
+            self.rect = None
+            return
+
+        if self._surface is None or time.perf_counter() - self._rendered > self.refresh:
+            self.bind()
+
+        self.rect = screen.blit(self._surface, self.position)
+
+    def bind(self):
+        """Render the lines of the statistics on the surface of the overlay."""
+        lines = self.profiler.lines(self.limit_fps)
+        texts = [self.font.render(line, True, self.font_color) for line in lines]
+
+        padding = 6
+        width = max(text.get_width() for text in texts) + 2 * padding
+        height = sum(text.get_height() for text in texts) + 2 * padding
+
+        # Keep the largest size, so the last text is always covered
+        if self._surface is not None:
+            width = max(width, self._surface.get_width())
+            height = max(height, self._surface.get_height())
+
+        self._surface = pygame.Surface((width, height))
+        self._surface.fill(self.background_color)
+        y = padding
+
+        for text in texts:
+            self._surface.blit(text, (padding, y))
+            y += text.get_height()
+
+        self._rendered = time.perf_counter()
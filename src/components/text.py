@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple
+
+import pygame
+
+
+@lru_cache(maxsize=16)
+def get_font(path: Path, size: int) -> pygame.font.Font:
+    """
+    Get the font of the given file and size, loaded once.
+
+    Args:
+        path (Path): The path of the font file.
+        size (int): The size of the font.
+
+    Returns:
+        pygame.font.Font: The font, shared by the components.
+    """
+    return pygame.font.Font(path, size)
+
+
+class TextCache:
+    """
+    Cache of the rendered lines of text, the least recently used are dropped.
+
+    Notes:
+        Rendering a line is far slower than blitting it, the lines drawn on every
+        frame (console history, input text) are rendered once.
+
+    Attributes:
+        font (pygame.font.Font): The font rendering the lines.
+        capacity (int): The number of rendered lines kept.
+    """
+
+    font: pygame.font.Font
+    capacity: int
+
+    def __init__(self, font: pygame.font.Font, capacity: int = 256):
+        self.font = font
+        self.capacity = capacity
+        self._surfaces: OrderedDict[Tuple[str, Tuple[int, ...]], pygame.Surface] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def render(self, text: str, color: pygame.Color) -> pygame.Surface:
+        """
+        Get the surface of a line of text, rendered if not in the cache.
+
+        Args:
+            text (str): The line of text.
+            color (pygame.Color): The color of the text.
+
+        Returns:
+            pygame.Surface: The rendered line (shared, must not be modified).
+        """
+        key = (text, tuple(color))
+        surface = self._surfaces.get(key)
+
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+
+        surface = self.font.render(text, True, color)
+        self._surfaces[key] = surface
+
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+
+        return surface
+
+    def clear(self):
+        """Drop all the rendered lines."""
+        self._surfaces.clear()
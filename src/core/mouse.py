@@ -13,13 +13,19 @@ class MouseInfo:
         x (int): The x position of the mouse.
         y (int): The y position of the mouse.
 
+        dx (int): The horizontal movement of the mouse since the last update.
+        dy (int): The vertical movement of the mouse since the last update.
+
         left_up (bool): Whether the left button was released.
+        middle_up (bool): Whether the middle button was released.
         right_up (bool): Whether the right button was released.
 
         left_click (bool): Whether the left button was clicked.
+        middle_click (bool): Whether the middle button was clicked.
         right_click (bool): Whether the right button was clicked.
 
         left_held (bool): Whether the left button is being held.
+        middle_held (bool): Whether the middle button is being held.
         right_held (bool): Whether the right button is being held.
 
         wheel_up (bool): Whether the wheel was scrolled up.
@@ -29,13 +35,19 @@ class MouseInfo:
     x: int = 0
     y: int = 0
 
+    dx: int = 0
+    dy: int = 0
+
     left_up: bool = False
+    middle_up: bool = False
     right_up: bool = False
 
     left_click: bool = False
+    middle_click: bool = False
     right_click: bool = False
 
     left_held: bool = False
+    middle_held: bool = False
     right_held: bool = False
 
     wheel_up: bool = False
@@ -58,6 +70,8 @@ class MouseInfo:
         for event in events:
             if event.type == pygame.MOUSEMOTION:
                 self.x, self.y = event.pos
+                self.dx += event.rel[0]
+                self.dy += event.rel[1]
 
             # First click, held always False, after always True until release
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -65,6 +79,10 @@ class MouseInfo:
                     self.left_click = not self.left_held
                     self.left_held = True
 
+                elif event.button == 2:
+                    self.middle_click = not self.middle_held
+                    self.middle_held = True
+
                 elif event.button == 3:
                     self.right_click = not self.right_held
                     self.right_held = True
@@ -80,16 +98,25 @@ class MouseInfo:
                     self.left_up = True
                     self.left_held = False
 
+                elif event.button == 2:
+                    self.middle_up = True
+                    self.middle_held = False
+
                 elif event.button == 3:
                     self.right_up = True
                     self.right_held = False
 
     def _reset(self):
         """Reset the values of the mouse information."""
+        self.dx = 0
+        self.dy = 0
+
         self.left_up = False
+        self.middle_up = False
         self.right_up = False
 
         self.left_click = False
+        self.middle_click = False
         self.right_click = False
 
         self.wheel_up = False
@@ -0,0 +1,177 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy
+
+SEED = numpy.uint64(0x9E3779B97F4A7C15)
+MULTIPLIER = numpy.uint64(0xBF58476D1CE4E5B9)
+
+
+@dataclass
+class Cycle:
+    """
+    Cycle of states entered by the grid.
+
+    Attributes:
+        start (int): The first generation of the cycle.
+        period (int): The number of generations of the cycle.
+        generation (int): The generation of the first recorded state.
+        states (List[numpy.ndarray]): The states of the cycle, from the recorded generation.
+    """
+
+    start: int
+    period: int
+    generation: int
+    states: List[numpy.ndarray]
+
+    def state_at(self, generation: int) -> numpy.ndarray:
+        """
+        Get the state of any generation after the start, by modular indexing.
+
+        Args:
+            generation (int): The generation to get.
+
+        Returns:
+            numpy.ndarray: A copy of the state of this generation.
+        """
+        return self.states[(generation - self.generation) % self.period].copy()
+
+
+class CycleDetector:
+    """
+    Detector of cycles from the hashes of the last generations.
+
+    Notes:
+        The hashes are 64 bits, the risk of a false detection is negligible.
+
+    Attributes:
+        max_period (int): The longest period detected (the number of hashes kept).
+    """
+
+    max_period: int
+
+    def __init__(self, max_period: int = 64):
+        self.max_period = max_period
+        self._generations: Dict[int, int] = {}
+        self._hashes: Deque[Tuple[int, int]] = deque()
+
+    def observe(self, generation: int, state_hash: int) -> Optional[int]:
+        """
+        Record the hash of a generation, detect if the state was already seen.
+
+        Args:
+            generation (int): The generation of the state.
+            state_hash (int): The hash of the state.
+
+        Returns:
+            Optional[int]: The period of the cycle, if the state was seen recently.
+        """
+        seen = self._generations.get(state_hash)
+        period = None if seen is None else generation - seen
+
+        self._generations[state_hash] = generation
+        self._hashes.append((generation, state_hash))
+
+        while self._hashes and self._hashes[0][0] <= generation - self.max_period:
+            old_generation, old_hash = self._hashes.popleft()
+
+            if self._generations.get(old_hash) == old_generation:
+                del self._generations[old_hash]
+
+        if period is not None and 0 < period <= self.max_period:
+            return period
+
+        return None
+
+    def clear(self):
+        """Forget all the hashes."""
+        self._generations.clear()
+        self._hashes.clear()
+
+
+def hash_state(state: numpy.ndarray) -> int:
+    """
+    Compute the hash of a state, the XOR of the hashes of its values at their position.
+
+    Args:
+        state (numpy.ndarray): The state to hash.
+
+    Returns:
+        int: The 64 bits hash.
+    """
+    indexes = numpy.arange(state.size, dtype=numpy.uint64)
+    return _reduce(_cell_hashes(indexes, state.reshape(-1)))
+
+
+def update_hash(
+    state_hash: int,
+    indexes: numpy.ndarray,
+    old_values: numpy.ndarray,
+    new_values: numpy.ndarray,
+) -> int:
+    """
+    Update the hash of a state (Zobrist-style), only from the values that changed.
+
+    Args:
+        state_hash (int): The hash of the old state.
+        indexes (numpy.ndarray): The flat indexes of the values that changed.
+        old_values (numpy.ndarray): The old values at these indexes.
+        new_values (numpy.ndarray): The new values at these indexes.
+
+    Returns:
+        int: The hash of the new state.
+    """
+    indexes = indexes.astype(numpy.uint64)
+    removed = _reduce(_cell_hashes(indexes, old_values))
+    added = _reduce(_cell_hashes(indexes, new_values))
+    return state_hash ^ removed ^ added
+
+
+def next_hash(
+    state_hash: Optional[int], state: numpy.ndarray, new_state: numpy.ndarray
+) -> Tuple[int, bool]:
+    """
+    Get the hash of the next state, updated from the changed values if the hash is known.
+
+    Args:
+        state_hash (Optional[int]): The hash of the state, None if unknown.
+        state (numpy.ndarray): The state.
+        new_state (numpy.ndarray): The next state.
+
+    Returns:
+        Tuple[int, bool]: The hash of the next state, and whether no value changed.
+    """
+    if state.shape != new_state.shape:
+        return hash_state(new_state), False
+
+    changed = numpy.flatnonzero(state != new_state)
+    stable = changed.size == 0
+
+    if state_hash is None:
+        return hash_state(new_state), stable
+
+    old_values = state.reshape(-1)[changed]
+    new_values = new_state.reshape(-1)[changed]
+    return update_hash(state_hash, changed, old_values, new_values), stable
+
+
+def _cell_hashes(indexes: numpy.ndarray, values: numpy.ndarray) -> numpy.ndarray:
+    """Hash of each value at its position."""
+    keys = _mix(indexes + SEED)
+    return _mix(keys ^ (values.astype(numpy.uint64) * MULTIPLIER))
+
+
+def _mix(values: numpy.ndarray) -> numpy.ndarray:
+    """Mix the bits of 64 bits integers (finalizer of SplitMix64)."""
+    values = (values ^ (values >> numpy.uint64(30))) * MULTIPLIER
+    values = (values ^ (values >> numpy.uint64(27))) * numpy.uint64(0x94D049BB133111EB)
+    return values ^ (values >> numpy.uint64(31))
+
+
+def _reduce(hashes: numpy.ndarray) -> int:
+    """XOR of all the hashes."""
+    if hashes.size == 0:
+        return 0
+
+    return int(numpy.bitwise_xor.reduce(hashes))
@@ -0,0 +1,42 @@
+from typing import Dict, Type
+
+from src.engines.base import Engine
+from src.engines.bitpacked import BitPackedEngine
+from src.engines.convolution import ConvolutionEngine
+from src.engines.hashlife import HashLifeEngine
+from src.engines.parallel import ParallelEngine
+from src.engines.reference import ReferenceEngine
+from src.engines.sparse import SparseEngine
+from src.engines.tiled import TiledEngine
+from src.engines.vectorized import VectorizedEngine
+
+# Engines available, selectable by name (console command 'engine')
+ENGINES: Dict[str, Type[Engine]] = {
+    ReferenceEngine.name: ReferenceEngine,
+    VectorizedEngine.name: VectorizedEngine,
+    BitPackedEngine.name: BitPackedEngine,
+    HashLifeEngine.name: HashLifeEngine,
+    ParallelEngine.name: ParallelEngine,
+    SparseEngine.name: SparseEngine,
+    TiledEngine.name: TiledEngine,
+    ConvolutionEngine.name: ConvolutionEngine,
+}
+
+
+def get_engine(name: str) -> Engine:
+    """
+    Create the engine registered with the given name.
+
+    Args:
+        name (str): The name of the engine.
+
+    Raises:
+        ValueError: If no engine is registered with this name.
+
+    Returns:
+        Engine: A new instance of the engine.
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine: '{name}', available: {', '.join(ENGINES)}")
+
+    return ENGINES[name]()
@@ -0,0 +1,120 @@
+import copy
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+import numpy
+
+from src.rules import CONWAY, Rule
+
+
+class Engine(ABC):
+    """
+    Interface for all the engines computing the generations of a grid.
+
+    Notes:
+        The model stores the grid in the representation of its engine (the state),
+        by default the state is the grid itself, an array of 0 and 1.
+
+    Attributes:
+        name (str): The name used to select the engine.
+        unbounded (bool): Whether the grid is a movable window over an unbounded universe.
+        any_neighborhood (bool): Whether the engine applies the rules of any neighborhood,
+            not only the Life-like ones (8 neighbors).
+        offset (Tuple[int, int]): The coordinates in the universe of the first cell of the grid.
+        rule (Rule): The rule computing the next state of the cells (Game of Life by default).
+    """
+
+    name: str
+    unbounded: bool = False
+    any_neighborhood: bool = False
+    offset: Tuple[int, int] = (0, 0)
+    rule: Rule = CONWAY
+
+    @abstractmethod
+    def step(self, state: numpy.ndarray) -> numpy.ndarray:
+        """Compute the next generation of the state, without modifying it."""
+        raise NotImplementedError("Method 'step' must be implemented.")
+
+    def advance(self, state: numpy.ndarray, generations: int) -> numpy.ndarray:
+        """Compute the state the given number of generations later, one by one by default."""
+        for _ in range(generations):
+            state = self.step(state)
+
+        return state
+
+    def set_rule(self, rule: Rule):
+        """
+        Change the rule of the next generations.
+
+        Args:
+            rule (Rule): The new rule.
+
+        Raises:
+            ValueError: If the rule gives birth to cells without neighbors (B0) on an
+                unbounded universe, all of it would be alive, or if the engine only
+                applies the Life-like rules.
+
+        """
+        if not self.any_neighborhood and not rule.life_like:
+            raise ValueError(
+                f"The rule '{rule}' (larger neighborhood) needs the 'convolution' engine"
+            )
+
+        if self.unbounded and 0 in rule.birth:
+            raise ValueError(f"The rule '{rule}' (B0) needs a bounded engine")
+
+        self.rule = rule
+        self.invalidate()
+
+    def encode(self, grid: numpy.ndarray) -> numpy.ndarray:
+        """Convert a grid of 0 and 1 to the state used by the engine."""
+        return grid
+
+    def decode(self, state: numpy.ndarray) -> numpy.ndarray:
+        """Convert the state used by the engine to a grid of 0 and 1."""
+        return state
+
+    def encode_packed(self, words: numpy.ndarray, height: int) -> numpy.ndarray:
+        """Convert rows packed in uint64 words (64 cells per word) to the state used by the engine."""
+        from src.engines.bitpacked import unpack
+
+        return self.encode(unpack(words, height))
+
+    def detach(self, state: numpy.ndarray) -> numpy.ndarray:
+        """Get a state still valid after the next generations (the engine can reuse its memory)."""
+        return state
+
+    def copy(self) -> "Engine":
+        """Get a new engine with the same configuration, sharing no cache (for another thread)."""
+        engine = copy.copy(self)
+        engine.invalidate()
+        return engine
+
+    def close(self):
+        """Release the resources of the engine (processes, shared memory)."""
+
+    def invalidate(self):
+        """Forget what the engine knows about the state, it was replaced."""
+
+    def mark_changed(self, row: int, column: int):
+        """Be notified that a cell was edited outside the engine."""
+
+    def changed_cells(
+        self, old_state: numpy.ndarray, new_state: numpy.ndarray
+    ) -> Optional[numpy.ndarray]:
+        """Get the mask of the cells of the grid that differ between two states (None if unknown)."""
+        if old_state.shape != new_state.shape:
+            return None
+
+        return old_state != new_state
+
+    def get_cell(self, state: numpy.ndarray, row: int, column: int) -> int:
+        """Get the value of a cell directly in the state."""
+        return state[row][column].item()
+
+    def set_cell(
+        self, state: numpy.ndarray, row: int, column: int, value: int
+    ) -> numpy.ndarray:
+        """Set the value of a cell directly in the state, return the state."""
+        state[row][column] = value
+        return state
@@ -0,0 +1,305 @@
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy
+
+from src.engines.base import Engine
+from src.rules import Rule
+
+ONE = numpy.uint64(1)
+LAST_BIT = numpy.uint64(63)
+
+# Next state of the cells of a pair of counts (2k, 2k + 1), from the bit of weight 1 of the
+# count and the state, by the next states of (even, dead), (odd, dead), (even, alive), (odd, alive)
+SELECTS: Dict[
+    Tuple[int, int, int, int],
+    Optional[Callable[[numpy.ndarray, numpy.ndarray], numpy.ndarray]],
+] = {
+    (1, 1, 1, 1): None,
+    (0, 1, 0, 1): lambda bit0, state: bit0,
+    (1, 0, 1, 0): lambda bit0, state: ~bit0,
+    (0, 0, 1, 1): lambda bit0, state: state,
+    (1, 1, 0, 0): lambda bit0, state: ~state,
+    (0, 0, 0, 1): lambda bit0, state: bit0 & state,
+    (0, 1, 0, 0): lambda bit0, state: bit0 & ~state,
+    (0, 0, 1, 0): lambda bit0, state: ~bit0 & state,
+    (1, 0, 0, 0): lambda bit0, state: ~(bit0 | state),
+    (0, 1, 1, 1): lambda bit0, state: bit0 | state,
+    (1, 1, 0, 1): lambda bit0, state: bit0 | ~state,
+    (1, 0, 1, 1): lambda bit0, state: ~bit0 | state,
+    (1, 1, 1, 0): lambda bit0, state: ~(bit0 & state),
+    (0, 1, 1, 0): lambda bit0, state: bit0 ^ state,
+    (1, 0, 0, 1): lambda bit0, state: ~(bit0 ^ state),
+}
+
+
+class BitPackedEngine(Engine):
+    """
+    Engine storing 64 cells per uint64 word and computing them with bitwise operations.
+
+    Notes:
+        Each row of the grid is packed in words, the column 'c' is the bit 'c % 64' of the word 'c // 64'.
+        The neighbors are counted with full adders on whole words (SWAR), so one operation
+        computes 64 cells at once, and the state takes 64 times less memory than the grid.
+        The rule is applied to the bits of the counts, see 'rule_terms'.
+
+    Attributes:
+        shape (Tuple[int, int]): The shape of the unpacked grid, set by 'encode'.
+    """
+
+    name = "bitpacked"
+
+    shape: Tuple[int, int]
+
+    def __init__(self):
+        self.shape = (0, 0)
+
+    def encode(self, grid: numpy.ndarray) -> numpy.ndarray:
+        """
+        Pack the grid, 64 cells per word.
+
+        Args:
+            grid (numpy.ndarray): The grid of 0 and 1.
+
+        Returns:
+            numpy.ndarray: The packed state, one row of words per row of the grid.
+        """
+        self.shape = grid.shape
+        return pack(grid)
+
+    def encode_packed(self, words: numpy.ndarray, height: int) -> numpy.ndarray:
+        """
+        Use rows already packed (snapshot file), only copied.
+
+        Args:
+            words (numpy.ndarray): The packed rows, 64 cells per word (little endian
+                bit order).
+            height (int): The number of columns of the grid.
+
+        Returns:
+            numpy.ndarray: The packed state.
+        """
+        self.shape = (len(words), height)
+        state = numpy.array(words, dtype=numpy.uint64)
+
+        # The bits after the last column would be born as cells
+        if height % 64 or height == 0:
+            state[:, -1] &= numpy.uint64((1 << (height % 64)) - 1)
+
+        return state
+
+    def decode(self, state: numpy.ndarray) -> numpy.ndarray:
+        """
+        Unpack the state to a grid of 0 and 1.
+
+        Args:
+            state (numpy.ndarray): The packed state.
+
+        Returns:
+            numpy.ndarray: The grid of 0 and 1 (uint8).
+        """
+        return unpack(state, self.shape[1])
+
+    def changed_cells(
+        self, old_state: numpy.ndarray, new_state: numpy.ndarray
+    ) -> numpy.ndarray:
+        """Get the mask of the cells that differ, from the bits that differ."""
+        return unpack(old_state ^ new_state, self.shape[1]).astype(bool)
+
+    def get_cell(self, state: numpy.ndarray, row: int, column: int) -> int:
+        """Get the value of a cell by reading its bit."""
+        word, bit = divmod(column, 64)
+        return int(state[row, word] >> numpy.uint64(bit) & ONE)
+
+    def set_cell(self, state: numpy.ndarray, row: int, column: int, value: int):
+        """Set the value of a cell by writing its bit."""
+        word, bit = divmod(column, 64)
+        mask = ONE << numpy.uint64(bit)
+
+        if value:
+            state[row, word] |= mask
+        else:
+            state[row, word] &= ~mask
+
+        return state
+
+    def step(self, state: numpy.ndarray) -> numpy.ndarray:
+        """
+        Compute the next generation of the packed state.
+
+        Args:
+            state (numpy.ndarray): The current packed state.
+
+        Returns:
+            numpy.ndarray: The new packed state.
+        """
+        bit0, bit1, bit2, bit3 = count_neighbors(state)
+        new_state = None
+
+        for pairs, select in rule_terms(self.rule):
+            counts = _pair_mask(pairs[0], bit1, bit2, bit3)
+
+            for pair in pairs[1:]:
+                counts = counts | _pair_mask(pair, bit1, bit2, bit3)
+
+            term = counts if select is None else counts & SELECTS[select](bit0, state)
+            new_state = term if new_state is None else new_state | term
+
+        if new_state is None:
+            new_state = numpy.zeros_like(state)
+
+        new_state[:, -1] &= _last_word_mask(self.shape[1])
+
+        return new_state
+
+
+@lru_cache(maxsize=16)
+def rule_terms(rule: Rule) -> Tuple[Tuple[Tuple[int, ...], Optional[tuple]], ...]:
+    """
+    Compile a rule to the bitwise operations on the bits of the counts of neighbors.
+
+    Notes:
+        The counts are grouped by pairs (2k, 2k + 1), which share the bits of weight 2,
+        4 and 8: in a pair, the next state only depends on the bit of weight 1 and the
+        state, one of the 16 functions of two bits ('SELECTS'). The pairs with the same
+        function are merged, the Game of Life is 'bit1 & ~bit2 & (bit0 | state)'.
+
+    Args:
+        rule (Rule): The rule to compile.
+
+    Returns:
+        Tuple[Tuple[Tuple[int, ...], Optional[tuple]], ...]: The pairs of each function
+            of the bit of weight 1 and the state (None if always alive).
+    """
+    table = rule.table.tolist()
+    terms: Dict[Tuple[int, int, int, int], list] = {}
+
+    for pair in range(5):
+        even, odd = 2 * pair, 2 * pair + 1
+
+        # The count 9 doesn't exist, the pair of 8 only depends on the state
+        if odd > 8:
+            odd = even
+
+        select = (table[even], table[odd], table[9 + even], table[9 + odd])
+
+        if any(select):
+            terms.setdefault(select, []).append(pair)
+
+    return tuple(
+        (tuple(pairs), None if SELECTS[select] is None else select)
+        for select, pairs in terms.items()
+    )
+
+
+def pack(grid: numpy.ndarray) -> numpy.ndarray:
+    """
+    Pack each row of the grid in uint64 words (little endian bit order).
+
+    Args:
+        grid (numpy.ndarray): The grid of 0 and 1.
+
+    Returns:
+        numpy.ndarray: The packed grid of shape (rows, ceil(columns / 64)).
+    """
+    width, height = grid.shape
+    nbr_words = max(1, -(-height // 64))
+
+    packed = numpy.zeros((width, nbr_words * 8), dtype=numpy.uint8)
+    packed[:, : -(-height // 8)] = numpy.packbits(grid != 0, axis=1, bitorder="little")
+
+    return packed.view("<u8").astype(numpy.uint64, copy=False)
+
+
+def unpack(packed: numpy.ndarray, height: int) -> numpy.ndarray:
+    """
+    Unpack the rows of words to a grid of 0 and 1.
+
+    Args:
+        packed (numpy.ndarray): The packed grid.
+        height (int): The number of columns of the grid.
+
+    Returns:
+        numpy.ndarray: The grid of 0 and 1 (uint8).
+    """
+    data = numpy.ascontiguousarray(packed, dtype="<u8").view(numpy.uint8)
+    return numpy.unpackbits(data, axis=1, count=height, bitorder="little")
+
+
+def count_neighbors(state: numpy.ndarray):
+    """
+    Count the alive neighbors of every cell of a packed state with full adders.
+
+    Notes:
+        The count (0 to 8) is returned as 4 bit planes, the cells outside the grid are dead.
+
+    Args:
+        state (numpy.ndarray): The packed state.
+
+    Returns:
+        Tuple[numpy.ndarray, ...]: The bits of weight 1, 2, 4 and 8 of the counts.
+    """
+    width, nbr_words = state.shape
+    padded = numpy.zeros((width + 2, nbr_words + 2), dtype=numpy.uint64)
+    padded[1:-1, 1:-1] = state
+
+    above, middle, below = padded[:-2], padded[1:-1], padded[2:]
+    neighbors = [above[:, 1:-1], below[:, 1:-1]]
+
+    for rows in (above, middle, below):
+        words = rows[:, 1:-1]
+
+        # Cells of the previous column and the next column, carrying the bit between words
+        neighbors.append((words << ONE) | (rows[:, :-2] >> LAST_BIT))
+        neighbors.append((words >> ONE) | (rows[:, 2:] << LAST_BIT))
+
+    n0, n1, n2, n3, n4, n5, n6, n7 = neighbors
+
+    sum_a, carry_a = _full_adder(n0, n1, n2)
+    sum_b, carry_b = _full_adder(n3, n4, n5)
+    sum_c, carry_c = n6 ^ n7, n6 & n7
+    bit0, carry_d = _full_adder(sum_a, sum_b, sum_c)
+
+    sum_e, carry_e = _full_adder(carry_a, carry_b, carry_c)
+    bit1, carry_f = sum_e ^ carry_d, sum_e & carry_d
+
+    bit2, bit3 = carry_e ^ carry_f, carry_e & carry_f
+
+    return bit0, bit1, bit2, bit3
+
+
+def _pair_mask(
+    pair: int, bit1: numpy.ndarray, bit2: numpy.ndarray, bit3: numpy.ndarray
+) -> numpy.ndarray:
+    """
+    Get the cells whose count of neighbors is in the pair (2 * pair, 2 * pair + 1).
+
+    Notes:
+        The counts go up to 8, the bit of weight 8 is only set alone.
+
+    """
+    if pair == 0:
+        return ~(bit1 | bit2 | bit3)
+
+    if pair == 1:
+        return bit1 & ~bit2
+
+    if pair == 2:
+        return bit2 & ~bit1
+
+    if pair == 3:
+        return bit1 & bit2
+
+    return bit3
+
+
+def _full_adder(a: numpy.ndarray, b: numpy.ndarray, c: numpy.ndarray):
+    """Add three bit planes, return the sum bits and the carry bits."""
+    partial = a ^ b
+    return partial ^ c, (a & b) | (c & partial)
+
+
+def _last_word_mask(height: int) -> numpy.uint64:
+    """Mask of the bits of the last word that are inside the grid."""
+    remainder = height % 64
+    return numpy.uint64((1 << remainder) - 1 if remainder else (1 << 64) - 1)
@@ -0,0 +1,192 @@
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy
+
+from src.engines.base import Engine
+from src.rules import Rule
+
+
+class ConvolutionEngine(Engine):
+    """
+    Engine counting the neighbors of any neighborhood by a convolution of the grid.
+
+    Notes:
+        The neighbors are counted with the kernel of the rule (its neighborhood), so it
+        applies the Larger than Life rules and the custom neighborhoods as well as the
+        Life-like rules. The small kernels are summed directly from shifted slices of
+        the grid, the large ones are multiplied in the frequency domain (FFT): the cost
+        no longer grows with the number of cells of the neighborhood.
+        The grid is padded with dead cells larger than the radius, so the edges behave
+        exactly like the reference engine. The spectrum of the kernel is computed once
+        per grid shape.
+
+    Attributes:
+        limit_direct (int): The number of cells of the neighborhood above which the
+            neighbors are counted by FFT.
+        max_spectra (int): The number of spectra kept, one per grid shape.
+    """
+
+    name = "convolution"
+    any_neighborhood = True
+
+    limit_direct: int
+    max_spectra: int
+
+    def __init__(self, limit_direct: int = 100, max_spectra: int = 4):
+        self.limit_direct = limit_direct
+        self.max_spectra = max_spectra
+        self._spectra: OrderedDict[
+            Tuple[int, int], Tuple[Tuple[int, int], numpy.ndarray]
+        ] = OrderedDict()
+
+    def copy(self) -> "ConvolutionEngine":
+        """Get a new engine with the same limits and rule, and no spectrum."""
+        engine = ConvolutionEngine(self.limit_direct, self.max_spectra)
+        engine.set_rule(self.rule)
+        return engine
+
+    def set_rule(self, rule: Rule):
+        """
+        Change the rule of the next generations, the spectra of the old kernel are cleared.
+
+        Args:
+            rule (Rule): The new rule, B0 is allowed (the grid is bounded).
+
+        """
+        super().set_rule(rule)
+        self._spectra.clear()
+
+    def step(self, grid: numpy.ndarray) -> numpy.ndarray:
+        """
+        Compute the next generation of the grid.
+
+        Args:
+            grid (numpy.ndarray): The current grid state.
+
+        Returns:
+            numpy.ndarray: The new grid state.
+        """
+        if self.rule.size <= self.limit_direct:
+            alive_neighbors = self.count_direct(grid)
+        else:
+            alive_neighbors = self.count_fft(grid)
+
+        # Index of the table: state * (size + 1) + alive neighbors
+        alive_neighbors += numpy.multiply(
+            grid != 0, self.rule.size + 1, dtype=alive_neighbors.dtype
+        )
+        return self.rule.table.take(alive_neighbors).astype(grid.dtype, copy=False)
+
+    def count_direct(self, grid: numpy.ndarray) -> numpy.ndarray:
+        """
+        Count the alive neighbors by summing a shifted slice of the grid per cell of the kernel.
+
+        Args:
+            grid (numpy.ndarray): The grid to count the neighbors from.
+
+        Returns:
+            numpy.ndarray: The number of alive neighbors of each cell (int32).
+        """
+        radius = self.rule.radius
+        width, height = grid.shape
+        padded = numpy.pad(grid != 0, radius).view(numpy.uint8)
+        alive_neighbors = numpy.zeros(grid.shape, dtype=numpy.int32)
+
+        for i, j in zip(*numpy.nonzero(self.rule.kernel)):
+            alive_neighbors += padded[i : i + width, j : j + height]
+
+        return alive_neighbors
+
+    def count_fft(self, grid: numpy.ndarray) -> numpy.ndarray:
+        """
+        Count the alive neighbors by multiplying the spectra of the grid and of the kernel.
+
+        Args:
+            grid (numpy.ndarray): The grid to count the neighbors from.
+
+        Returns:
+            numpy.ndarray: The number of alive neighbors of each cell (int32).
+        """
+        radius = self.rule.radius
+        width, height = grid.shape
+        shape, spectrum = self._spectrum(grid.shape)
+
+        cells = numpy.fft.rfft2(grid != 0, s=shape)
+        cells *= spectrum
+        counts = numpy.fft.irfft2(cells, s=shape)
+
+        # The counts are integers, up to the rounding errors of the transforms
+        counts = counts[radius : radius + width, radius : radius + height]
+        return numpy.rint(counts).astype(numpy.int32)
+
+    def _spectrum(
+        self, grid_shape: Tuple[int, int]
+    ) -> Tuple[Tuple[int, int], numpy.ndarray]:
+        """
+        Get the size of the transforms and the spectrum of the kernel for a grid shape.
+
+        Notes:
+            The transforms are circular: the grid is padded with at least the radius of
+            dead cells so the neighbors never wrap around, up to sizes fast to transform.
+            The kernel is flipped, the product of the spectra is then a correlation,
+            the count of the cell (x, y) is at (x + radius, y + radius).
+
+        Args:
+            grid_shape (Tuple[int, int]): The shape of the grid.
+
+        Returns:
+            Tuple[Tuple[int, int], numpy.ndarray]: The shape of the transforms and the
+                spectrum of the kernel.
+        """
+        if grid_shape in self._spectra:
+            self._spectra.move_to_end(grid_shape)
+            return self._spectra[grid_shape]
+
+        radius = self.rule.radius
+        shape = (
+            _fast_size(grid_shape[0] + radius),
+            _fast_size(grid_shape[1] + radius),
+        )
+        spectrum = numpy.fft.rfft2(self.rule.kernel[::-1, ::-1], s=shape)
+
+        self._spectra[grid_shape] = (shape, spectrum)
+
+        if len(self._spectra) > self.max_spectra:
+            self._spectra.popitem(last=False)
+
+        return shape, spectrum
+
+
+def _fast_size(size: int) -> int:
+    """
+    Get the smallest size at least the given one, with only 2, 3 and 5 as prime factors.
+
+    Notes:
+        The FFT is far faster on these sizes than on sizes with large prime factors.
+
+    Args:
+        size (int): The minimal size.
+
+    Returns:
+        int: The size of the transform.
+    """
+    best = 1 << max(size - 1, 0).bit_length()
+    power5 = 1
+
+    while power5 < best:
+        power35 = power5
+
+        while power35 < best:
+            # Smallest power of 2 bringing the product at least to the size
+            candidate = power35
+
+            while candidate < size:
+                candidate *= 2
+
+            best = min(best, candidate)
+            power35 *= 3
+
+        power5 *= 5
+
+    return best
@@ -0,0 +1,453 @@
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy
+
+from src.engines.sparse import BIAS, SparseEngine, from_keys, to_keys
+from src.rules import Rule
+
+# Level of the nodes converted to cells at once (16x16 cells), their cells are cached
+BLOCK_LEVEL = 4
+
+
+class Node:
+    """
+    Node of the quadtree, a square of 2^level cells.
+
+    Notes:
+        The nodes are canonicalised by the engine (only one node for each content),
+        so they are compared and hashed by identity.
+
+    Attributes:
+        level (int): The level of the node, the node holds 2^level x 2^level cells.
+        population (int): The number of alive cells in the node.
+        a (Node): The top left child (first rows, first columns).
+        b (Node): The top right child (first rows, last columns).
+        c (Node): The bottom left child (last rows, first columns).
+        d (Node): The bottom right child (last rows, last columns).
+    """
+
+    __slots__ = ("level", "population", "a", "b", "c", "d")
+
+    def __init__(self, level: int, population: int, a=None, b=None, c=None, d=None):
+        self.level = level
+        self.population = population
+        self.a, self.b, self.c, self.d = a, b, c, d
+
+    @property
+    def size(self) -> int:
+        """The number of cells on each side of the node."""
+        return 1 << self.level
+
+
+DEAD = Node(0, 0)
+ALIVE = Node(0, 1)
+
+
+class HashLifeEngine(SparseEngine):
+    """
+    Engine using the HashLife algorithm to jump many generations at once.
+
+    Notes:
+        The alive cells are converted to a quadtree of canonicalised nodes, the
+        successors of the nodes are memoised, so periodic and structured patterns
+        advance 2^k generations in roughly logarithmic time.
+        Like the 'sparse' engine, the state is the keys of the alive cells of an
+        unbounded universe and the grid is a window over it: a jump gives the same
+        cells as the generations computed one by one, whatever its size.
+        The quadtree of the last state returned is kept, the next generations start
+        from it instead of building it again.
+        The successors depend on the rule, they are forgotten when it changes.
+
+    Attributes:
+        max_nodes (int): The limit of canonical nodes, memoised results and cells of
+            blocks kept in cache (least recently used evicted first).
+    """
+
+    name = "hashlife"
+
+    max_nodes: int
+
+    def __init__(self, max_nodes: int = 500_000):
+        super().__init__()
+        self.max_nodes = max_nodes
+        self._nodes: Dict[Tuple[Node, Node, Node, Node], Node] = {}
+        self._old_nodes: Dict[Tuple[Node, Node, Node, Node], Node] = {}
+        self._results: OrderedDict[Tuple[Node, int], Node] = OrderedDict()
+        self._empty: Dict[int, Node] = {0: DEAD}
+        self._table = self.rule.table.tolist()
+        self._blocks: OrderedDict[Node, numpy.ndarray] = OrderedDict()
+        self._last: Optional[Tuple[numpy.ndarray, Node, Tuple[int, int]]] = None
+
+    def copy(self) -> "HashLifeEngine":
+        """Get a new engine with the same limit of nodes, rule and window, and empty caches."""
+        engine = HashLifeEngine(max_nodes=self.max_nodes)
+        engine.set_rule(self.rule)
+        engine.shape, engine.offset = self.shape, self.offset
+        return engine
+
+    def set_rule(self, rule: Rule):
+        """
+        Change the rule of the next generations, the memoised successors are cleared.
+
+        Args:
+            rule (Rule): The new rule.
+
+        Raises:
+            ValueError: If the rule gives birth to cells without neighbors (B0), the
+                empty nodes of the plane would not stay empty.
+
+        """
+        super().set_rule(rule)
+        self._table = rule.table.tolist()
+        self._results.clear()
+
+    def invalidate(self):
+        """Forget the quadtree of the last state, the state was replaced."""
+        self._last = None
+
+    def mark_changed(self, row: int, column: int):
+        """A cell was edited, the quadtree of the last state is no longer valid."""
+        self._last = None
+
+    def step(self, state: numpy.ndarray) -> numpy.ndarray:
+        """Compute the next generation of the universe."""
+        return self.advance(state, 1)
+
+    def advance(self, state: numpy.ndarray, generations: int) -> numpy.ndarray:
+        """
+        Advance the universe by the given number of generations.
+
+        Args:
+            state (numpy.ndarray): The sorted keys of the alive cells.
+            generations (int): The number of generations to compute.
+
+        Returns:
+            numpy.ndarray: The sorted keys of the new alive cells.
+        """
+        if self._last is not None and self._last[0] is state:
+            _, node, origin = self._last
+        else:
+            node, origin = self.from_state(state)
+
+        node, origin = self.advance_node(node, origin, generations)
+        new_state = self.to_state(node, origin)
+        self._last = (new_state, node, origin)
+
+        return new_state
+
+    def advance_node(self, node: Node, origin: Tuple[int, int], generations: int):
+        """
+        Advance a quadtree by the given number of generations.
+
+        Args:
+            node (Node): The root of the quadtree.
+            origin (Tuple[int, int]): The coordinates of the first cell of the root.
+            generations (int): The number of generations to compute.
+
+        Returns:
+            Tuple[Node, Tuple[int, int]]: The new root and its origin.
+        """
+        # Jump by the powers of two of the number of generations, the biggest first
+        for j in reversed(range(generations.bit_length())):
+            if not generations >> j & 1:
+                continue
+
+            # The pattern must stay in the center half of the node during the jump
+            while node.level < j + 3 or self._inner_population(node) != node.population:
+                node, origin = self._centre(node, origin)
+
+            quarter = node.size // 4
+            node = self._successor(node, j)
+            origin = (origin[0] + quarter, origin[1] + quarter)
+
+        return node, origin
+
+    def from_state(self, state: numpy.ndarray) -> Tuple[Node, Tuple[int, int]]:
+        """
+        Convert the keys of the alive cells to a quadtree, its origin is the first cell.
+
+        Args:
+            state (numpy.ndarray): The sorted keys of the alive cells.
+
+        Returns:
+            Tuple[Node, Tuple[int, int]]: The root of the quadtree and its origin.
+        """
+        if state.size == 0:
+            return self._empty_node(2), (0, 0)
+
+        rows, columns = from_keys(state)
+        origin = (int(rows.min()), int(columns.min()))
+        rows -= origin[0]
+        columns -= origin[1]
+
+        extent = int(max(rows.max(), columns.max())) + 1
+        level = max(2, (extent - 1).bit_length())
+        return self._build(rows, columns, level), origin
+
+    def to_state(self, node: Node, origin: Tuple[int, int]) -> numpy.ndarray:
+        """
+        Convert a quadtree to the keys of its alive cells.
+
+        Args:
+            node (Node): The root of the quadtree.
+            origin (Tuple[int, int]): The coordinates of the first cell of the root.
+
+        Returns:
+            numpy.ndarray: The sorted keys of the alive cells.
+        """
+        blocks: List[Tuple[int, int, numpy.ndarray]] = []
+        self._collect_cells(node, origin[0], origin[1], blocks)
+
+        if not blocks:
+            return numpy.zeros(0, dtype=numpy.uint64)
+
+        rows = numpy.concatenate([row + cells[0] for row, _, cells in blocks])
+        columns = numpy.concatenate([column + cells[1] for _, column, cells in blocks])
+
+        # The keys hold 32 bits per coordinate, the cells farther away are lost
+        inside = (-BIAS <= rows) & (rows < BIAS) & (-BIAS <= columns) & (columns < BIAS)
+
+        if not inside.all():
+            logging.warning(f"HashLife: {(~inside).sum()} cells left the universe")
+            rows, columns = rows[inside], columns[inside]
+
+        return numpy.sort(to_keys(rows, columns))
+
+    def _build(self, rows: numpy.ndarray, columns: numpy.ndarray, level: int) -> Node:
+        """Build the node of the given level from the coordinates of its alive cells."""
+        if rows.size == 0:
+            return self._empty_node(level)
+
+        if level == 0:
+            return ALIVE
+
+        half = 1 << (level - 1)
+        bottom, right = rows >= half, columns >= half
+        children = []
+        quadrants = (
+            (~bottom & ~right, 0, 0),
+            (~bottom & right, 0, half),
+            (bottom & ~right, half, 0),
+            (bottom & right, half, half),
+        )
+
+        for inside, row, column in quadrants:
+            children.append(
+                self._build(rows[inside] - row, columns[inside] - column, level - 1)
+            )
+
+        return self._join(*children)
+
+    def _collect_cells(
+        self,
+        node: Node,
+        row: int,
+        column: int,
+        blocks: List[Tuple[int, int, numpy.ndarray]],
+    ):
+        """Add the coordinates of the alive cells of the node, by blocks of cells."""
+        if node.population == 0:
+            return
+
+        if node.level <= BLOCK_LEVEL:
+            blocks.append((row, column, self._block_cells(node)))
+            return
+
+        half = node.size // 2
+        self._collect_cells(node.a, row, column, blocks)
+        self._collect_cells(node.b, row, column + half, blocks)
+        self._collect_cells(node.c, row + half, column, blocks)
+        self._collect_cells(node.d, row + half, column + half, blocks)
+
+    def _block_cells(self, node: Node) -> numpy.ndarray:
+        """Get the coordinates of the alive cells of a small node, from its first cell."""
+        cells = self._blocks.get(node)
+
+        if cells is None:
+            grid = numpy.zeros((node.size, node.size), dtype=bool)
+            self._paint(grid, node, 0, 0)
+            cells = numpy.array(numpy.nonzero(grid), dtype=numpy.int64)
+            self._blocks[node] = cells
+
+            if len(self._blocks) > self.max_nodes:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(node)
+
+        return cells
+
+    def _paint(self, grid: numpy.ndarray, node: Node, row: int, column: int):
+        """Write the alive cells of the node in the grid."""
+        if node.population == 0:
+            return
+
+        if node.level == 0:
+            grid[row, column] = 1
+            return
+
+        half = node.size // 2
+        self._paint(grid, node.a, row, column)
+        self._paint(grid, node.b, row, column + half)
+        self._paint(grid, node.c, row + half, column)
+        self._paint(grid, node.d, row + half, column + half)
+
+    def _join(self, a: Node, b: Node, c: Node, d: Node) -> Node:
+        """Get the canonical node made of the four given children."""
+        key = (a, b, c, d)
+        node = self._nodes.get(key)
+
+        if node is None:
+            # A node used again since the last eviction is kept
+            node = self._old_nodes.pop(key, None)
+
+            if node is None:
+                population = a.population + b.population + c.population + d.population
+                node = Node(a.level + 1, population, a, b, c, d)
+
+            self._collect()
+            self._nodes[key] = node
+
+        return node
+
+    def _empty_node(self, level: int) -> Node:
+        """Get the node of the given level without alive cells."""
+        if level not in self._empty:
+            child = self._empty_node(level - 1)
+            self._empty[level] = self._join(child, child, child, child)
+
+        return self._empty[level]
+
+    def _centre(self, node: Node, origin: Tuple[int, int]):
+        """Surround the node with empty cells, the new node is one level higher."""
+        empty = self._empty_node(node.level - 1)
+        quarter = node.size // 2
+        centred = self._join(
+            self._join(empty, empty, empty, node.a),
+            self._join(empty, empty, node.b, empty),
+            self._join(empty, node.c, empty, empty),
+            self._join(node.d, empty, empty, empty),
+        )
+        return centred, (origin[0] - quarter, origin[1] - quarter)
+
+    @staticmethod
+    def _inner_population(node: Node) -> int:
+        """Population of the central quarter (in width) of the node."""
+        return (
+            node.a.d.d.population
+            + node.b.c.c.population
+            + node.c.b.b.population
+            + node.d.a.a.population
+        )
+
+    def _successor(self, node: Node, j: int) -> Node:
+        """
+        Get the center half of the node, 2^j generations in the future.
+
+        Args:
+            node (Node): The node to advance, at least of level 2.
+            j (int): The power of two of generations, limited to 'node.level - 2'.
+
+        Returns:
+            Node: The center node, one level lower.
+        """
+        if node.population == 0:
+            return node.a
+
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self._results.get(key)
+
+        if result is not None:
+            self._results.move_to_end(key)
+            return result
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            a, b, c, d = node.a, node.b, node.c, node.d
+            successor = self._successor
+            join = self._join
+
+            c1 = successor(a, j)
+            c2 = successor(join(a.b, b.a, a.d, b.c), j)
+            c3 = successor(b, j)
+            c4 = successor(join(a.c, a.d, c.a, c.b), j)
+            c5 = successor(join(a.d, b.c, c.b, d.a), j)
+            c6 = successor(join(b.c, b.d, d.a, d.b), j)
+            c7 = successor(c, j)
+            c8 = successor(join(c.b, d.a, c.d, d.c), j)
+            c9 = successor(d, j)
+
+            if j < node.level - 2:
+                # Half the generations are enough, only take the centers of the successors
+                result = join(
+                    join(c1.d, c2.c, c4.b, c5.a),
+                    join(c2.d, c3.c, c5.b, c6.a),
+                    join(c4.d, c5.c, c7.b, c8.a),
+                    join(c5.d, c6.c, c8.b, c9.a),
+                )
+            else:
+                result = join(
+                    successor(join(c1, c2, c4, c5), j),
+                    successor(join(c2, c3, c5, c6), j),
+                    successor(join(c4, c5, c7, c8), j),
+                    successor(join(c5, c6, c8, c9), j),
+                )
+
+        self._results[key] = result
+
+        if len(self._results) > self.max_nodes:
+            self._results.popitem(last=False)
+
+        return result
+
+    def _life_4x4(self, node: Node) -> Node:
+        """Compute the next generation of the 2x2 center of a 4x4 node."""
+        a, b, c, d = node.a, node.b, node.c, node.d
+        cells = [
+            [a.a, a.b, b.a, b.b],
+            [a.c, a.d, b.c, b.d],
+            [c.a, c.b, d.a, d.b],
+            [c.c, c.d, d.c, d.d],
+        ]
+        cells = [[cell.population for cell in row] for row in cells]
+        table = self._table
+
+        def next_cell(row: int, column: int) -> Node:
+            alive_neighbors = sum(
+                cells[row + i][column + j]
+                for i in range(-1, 2)
+                for j in range(-1, 2)
+                if (i, j) != (0, 0)
+            )
+
+            if table[cells[row][column] * 9 + alive_neighbors]:
+                return ALIVE
+
+            return DEAD
+
+        return self._join(
+            next_cell(1, 1), next_cell(1, 2), next_cell(2, 1), next_cell(2, 2)
+        )
+
+    def _collect(self):
+        """
+        Evict the least recently used canonical nodes when they exceed the limit.
+
+        Notes:
+            The nodes are kept in two generations of half the limit: the nodes used
+            go to the recent one, when it's full it becomes the old one and the nodes
+            of the previous old one, not used since, are evicted at once. A lookup
+            stays a plain dictionary access.
+            The nodes evicted stay valid (compared by identity), they are only no
+            longer shared with the new ones; their memoised results are kept, the
+            results are evicted by their own least recently used order.
+        """
+        if len(self._nodes) < max(self.max_nodes // 2, 1):
+            return
+
+        logging.info(f"HashLife cache full: evicting {len(self._old_nodes)} nodes")
+        self._old_nodes = self._nodes
+        self._nodes = {}
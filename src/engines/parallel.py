@@ -0,0 +1,296 @@
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy
+
+from src.engines.base import Engine
+from src.rules import Rule
+from src.engines.vectorized import apply_rule, count_neighbors
+
+# The pool and the shared memory are imported when the workers start (fast imports)
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
+
+# Buffers of the worker process, attached by name on first use by '_attached_buffer'
+_attached: "OrderedDict[str, Tuple[SharedMemory, numpy.ndarray]]" = OrderedDict()
+
+# Number of buffers kept attached in a worker process (an engine and its copies)
+MAX_ATTACHED = 8
+
+# Shared memory still used by a state when released, closed once no longer used
+_orphans: List["SharedMemory"] = []
+
+
+class SharedPool:
+    """
+    Pool of worker processes, shared by an engine and its copies.
+
+    Notes:
+        The processes are only started at the first generation. The lock lets only one
+        generation use them at a time: a cancelled simulation worker can still be
+        computing one while the pool is restarted.
+
+    Attributes:
+        workers (int): The number of worker processes.
+        lock (threading.Lock): Held while the pool is used or replaced.
+    """
+
+    workers: int
+    lock: threading.Lock
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.pool: Optional["ProcessPoolExecutor"] = None
+        self._finalizer = None
+
+    def start(self):
+        """Start the pool, if not started (locked)."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        if self.pool is not None:
+            return
+
+        logging.info(f"Starting {self.workers} workers")
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._finalizer = weakref.finalize(self, _shutdown, self.pool)
+
+    def close(self):
+        """Stop the worker processes (locked)."""
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+
+        self.pool = None
+
+
+class SharedGrid:
+    """
+    Pair of shared memory buffers holding the current and the next state of an engine.
+
+    Notes:
+        The states computed stay in the buffers: the next generation is written in the
+        buffer not holding the current one, the two swap at each generation.
+
+    Attributes:
+        names (Tuple[str, str]): The names of the shared memory buffers.
+        buffers (List[numpy.ndarray]): The states in the buffers.
+    """
+
+    names: Tuple[str, str]
+    buffers: List[numpy.ndarray]
+
+    def __init__(self, shape: Tuple[int, int], dtype: numpy.dtype):
+        from multiprocessing.shared_memory import SharedMemory
+
+        size = max(1, int(numpy.prod(shape)) * numpy.dtype(dtype).itemsize)
+        memories = [SharedMemory(create=True, size=size) for _ in range(2)]
+
+        self.names = tuple(memory.name for memory in memories)
+        self.buffers = [
+            numpy.ndarray(shape, dtype=dtype, buffer=memory.buf) for memory in memories
+        ]
+        self._finalizer = weakref.finalize(self, _release, memories)
+
+    def matches(self, state: numpy.ndarray) -> bool:
+        """Check if the buffers have the shape and the type of the state."""
+        if not self.buffers:
+            return False
+
+        buffer = self.buffers[0]
+        return buffer.shape == state.shape and buffer.dtype == state.dtype
+
+    def index(self, state: numpy.ndarray) -> Optional[int]:
+        """Get the index of the buffer that is the state, None if it isn't one."""
+        for i, buffer in enumerate(self.buffers):
+            if state is buffer:
+                return i
+
+        return None
+
+    def holds(self, state: numpy.ndarray) -> bool:
+        """Check if the state uses the memory of a buffer."""
+        return any(numpy.may_share_memory(state, buffer) for buffer in self.buffers)
+
+    def close(self):
+        """Release the shared memory (once no state uses it)."""
+        self.buffers = []
+        self._finalizer()
+
+
+class ParallelEngine(Engine):
+    """
+    Engine splitting the grid in bands of rows computed by a pool of processes.
+
+    Notes:
+        The current and next states are shared memory buffers attached by name by each
+        worker, so only the names and the bounds of the bands (and the rule) are sent each
+        generation (no pickling of the grid).
+        Each worker reads the rows just above and below its band (the halo) in the shared
+        current state, and writes its band in the shared next state.
+        The states computed are the buffers themselves (no copy), a state is overwritten
+        two generations later: 'decode' and 'detach' copy it. A state not computed by
+        the engine is copied in the buffers once.
+        The copies of the engine (simulation worker) use the same processes with their
+        own buffers, restarting the simulation doesn't start new processes. Only the
+        engine copied from stops them when closed.
+
+    Attributes:
+        workers (int): The number of worker processes.
+    """
+
+    name = "parallel"
+
+    def __init__(self, workers: Optional[int] = None):
+        self._shared = SharedPool(workers or os.cpu_count() or 1)
+        self._owner = True
+        self._grid: Optional[SharedGrid] = None
+
+    @property
+    def workers(self) -> int:
+        """The number of worker processes."""
+        return self._shared.workers
+
+    def set_workers(self, workers: int):
+        """
+        Change the number of worker processes, the pool is restarted at the next generation.
+
+        Args:
+            workers (int): The number of worker processes.
+
+        """
+        with self._shared.lock:
+            self._shared.workers = max(1, workers)
+            self._shared.close()
+
+    def copy(self) -> "ParallelEngine":
+        """Get a new engine with the same rule, sharing the processes (not the buffers)."""
+        engine = super().copy()
+        engine._owner = False
+        engine._grid = None
+        return engine
+
+    def decode(self, state: numpy.ndarray) -> numpy.ndarray:
+        """Get the grid of 0 and 1, copied out of the buffers if computed by the engine."""
+        return self.detach(state)
+
+    def detach(self, state: numpy.ndarray) -> numpy.ndarray:
+        """Get the state copied out of the buffers, if computed by the engine."""
+        if self._grid is not None and self._grid.holds(state):
+            return state.copy()
+
+        return state
+
+    def step(self, state: numpy.ndarray) -> numpy.ndarray:
+        """
+        Compute the next generation of the grid, each band in a worker process.
+
+        Args:
+            state (numpy.ndarray): The current grid state.
+
+        Returns:
+            numpy.ndarray: The new grid state, in the shared buffer not holding the
+                current one.
+        """
+        grid = self._grid
+
+        if grid is None or not grid.matches(state):
+            if grid is not None:
+                grid.close()
+
+            grid = self._grid = SharedGrid(state.shape, state.dtype)
+
+        index = grid.index(state)
+
+        # A state not computed by the engine (edited, loaded) is copied in the buffers
+        if index is None:
+            index = 0
+            grid.buffers[index][...] = state
+
+        width = state.shape[0]
+        bounds = numpy.linspace(0, width, min(self.workers, width) + 1, dtype=int)
+        bands = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+        # Wait for all the bands (and raise the errors of the workers)
+        starts, ends = zip(*bands)
+        names = [(grid.names[index], grid.names[1 - index])] * len(bands)
+        shapes = [(state.shape, state.dtype.str)] * len(bands)
+        rules = [self.rule] * len(bands)
+
+        with self._shared.lock:
+            self._shared.start()
+            list(self._shared.pool.map(_step_band, names, shapes, starts, ends, rules))
+
+        return grid.buffers[1 - index]
+
+    def close(self):
+        """Release the buffers, and stop the worker processes (not for a copy)."""
+        if self._grid is not None:
+            self._grid.close()
+            self._grid = None
+
+        if not self._owner:
+            return
+
+        with self._shared.lock:
+            self._shared.close()
+
+
+def _shutdown(pool: "ProcessPoolExecutor"):
+    """Stop the pool."""
+    pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _release(memories: List["SharedMemory"]):
+    """Free the shared memory, closed later if a state still uses it (and its orphans)."""
+    orphans = list(_orphans)
+    _orphans.clear()
+
+    for memory in orphans + memories:
+        try:
+            memory.close()
+        except BufferError:
+            _orphans.append(memory)
+
+    # The name is removed at once, the memory lives while a state maps it
+    for memory in memories:
+        memory.unlink()
+
+
+def _attached_buffer(name: str, shape: Tuple[int, int], dtype: str) -> numpy.ndarray:
+    """Get a shared buffer in the worker process, attached on first use."""
+    from multiprocessing.shared_memory import SharedMemory
+
+    if name not in _attached:
+        memory = SharedMemory(name=name)
+        _attached[name] = (memory, numpy.ndarray(shape, dtype=dtype, buffer=memory.buf))
+
+        # The buffers of the grids released are no longer used
+        while len(_attached) > MAX_ATTACHED:
+            _, (memory, buffer) = _attached.popitem(last=False)
+            del buffer
+            memory.close()
+
+    _attached.move_to_end(name)
+    return _attached[name][1]
+
+
+def _step_band(
+    names: Tuple[str, str],
+    shape: Tuple[Tuple[int, int], str],
+    start: int,
+    end: int,
+    rule: Rule,
+):
+    """Compute the next generation of the rows from 'start' to 'end' in the worker process."""
+    current, following = (_attached_buffer(name, *shape) for name in names)
+    top, bottom = max(start - 1, 0), min(end + 1, current.shape[0])
+
+    block = current[top:bottom]
+    block = apply_rule(rule, block, count_neighbors(block))
+    following[start:end] = block[start - top : end - top]
@@ -0,0 +1,79 @@
+import itertools
+from typing import List, Tuple
+
+import numpy
+
+from src.engines.base import Engine
+
+
+class ReferenceEngine(Engine):
+    """
+    Engine looping over every cell of the grid.
+
+    Notes:
+        Very slow on big grids, it is kept as the reference to check the results of the other engines.
+        The rule is read from its sets of numbers of neighbors, not from its table,
+        and the neighbors from the cells of its neighborhood.
+    """
+
+    name = "reference"
+    any_neighborhood = True
+
+    def step(self, grid: numpy.ndarray) -> numpy.ndarray:
+        """
+        Compute the next generation of the grid.
+
+        Args:
+            grid (numpy.ndarray): The current grid state.
+
+        Returns:
+            numpy.ndarray: The new grid state.
+        """
+        new_grid = numpy.zeros_like(grid)
+        width, height = grid.shape
+        radius = self.rule.radius
+        offsets = [
+            (i - radius, j - radius) for i, j in zip(*numpy.nonzero(self.rule.kernel))
+        ]
+
+        for row, column in itertools.product(range(width), range(height)):
+            neighbors = _get_neighbors(grid, row, column, offsets)
+            alive_neighbors = sum(neighbors)
+            cell = grid[row][column]
+
+            if cell == 1:
+                if alive_neighbors in self.rule.survival:
+                    new_grid[row][column] = 1
+            else:
+                if alive_neighbors in self.rule.birth:
+                    new_grid[row][column] = 1
+
+        return new_grid
+
+
+def _get_neighbors(
+    grid: numpy.ndarray, row: int, column: int, offsets: List[Tuple[int, int]]
+):
+    """
+    Get the neighbors of the cell at the given row and column.
+
+    Args:
+        grid (numpy.ndarray): The grid to get the neighbors from.
+        row (int): The row of the cell.
+        column (int): The column of the cell.
+        offsets (List[Tuple[int, int]]): The positions of the neighbors from the cell.
+
+    Returns:
+        List[int]: The list of neighbors.
+    """
+    width, height = grid.shape
+    neighbors = []
+
+    for i, j in offsets:
+        new_row = row + i
+        new_column = column + j
+
+        if 0 <= new_row < width and 0 <= new_column < height:
+            neighbors.append(grid[new_row][new_column])
+
+    return neighbors
@@ -0,0 +1,153 @@
+from typing import Tuple
+
+import numpy
+
+from src.engines.base import Engine
+from src.engines.vectorized import NEIGHBOR_OFFSETS
+
+# Coordinates are stored with a bias in the 32 high bits (row) and 32 low bits (column) of the keys
+BIAS = 1 << 31
+NEIGHBOR_KEYS = numpy.array(
+    [(i << 32) + j for i, j in NEIGHBOR_OFFSETS], dtype=numpy.int64
+).view(numpy.uint64)
+
+
+class SparseEngine(Engine):
+    """
+    Engine storing only the coordinates of the alive cells, on an unbounded universe.
+
+    Notes:
+        The state is the sorted array of the keys of the alive cells, so the memory and the
+        cost of a generation scale with the number of alive cells, not with the area.
+        The grid is the window of the universe starting at 'offset'.
+        Only the cells next to an alive cell can be born, the rules with B0 are refused.
+
+    Attributes:
+        shape (Tuple[int, int]): The shape of the window, set by 'encode'.
+        offset (Tuple[int, int]): The coordinates in the universe of the first cell of the window.
+    """
+
+    name = "sparse"
+    unbounded = True
+
+    shape: Tuple[int, int]
+    offset: Tuple[int, int]
+
+    def __init__(self):
+        self.shape = (0, 0)
+        self.offset = (0, 0)
+
+    def encode(self, grid: numpy.ndarray) -> numpy.ndarray:
+        """
+        Convert the window to the keys of its alive cells, the universe holds only these cells.
+
+        Args:
+            grid (numpy.ndarray): The window of 0 and 1.
+
+        Returns:
+            numpy.ndarray: The sorted keys of the alive cells.
+        """
+        self.shape = grid.shape
+        rows, columns = numpy.nonzero(grid)
+        return numpy.sort(to_keys(rows + self.offset[0], columns + self.offset[1]))
+
+    def decode(self, state: numpy.ndarray) -> numpy.ndarray:
+        """
+        Get the window of the universe starting at the offset.
+
+        Args:
+            state (numpy.ndarray): The sorted keys of the alive cells.
+
+        Returns:
+            numpy.ndarray: The window of 0 and 1 (uint8).
+        """
+        grid = numpy.zeros(self.shape, dtype=numpy.uint8)
+        rows, columns = from_keys(state)
+        rows -= self.offset[0]
+        columns -= self.offset[1]
+
+        inside = (0 <= rows) & (rows < self.shape[0])
+        inside &= (0 <= columns) & (columns < self.shape[1])
+        grid[rows[inside], columns[inside]] = 1
+
+        return grid
+
+    def changed_cells(
+        self, old_state: numpy.ndarray, new_state: numpy.ndarray
+    ) -> numpy.ndarray:
+        """Get the mask of the cells of the window that differ."""
+        return self.decode(old_state) != self.decode(new_state)
+
+    def get_cell(self, state: numpy.ndarray, row: int, column: int) -> int:
+        """Get the value of a cell of the window."""
+        key = self._key(row, column)
+        return int(_contains(state, key)[0])
+
+    def set_cell(self, state: numpy.ndarray, row: int, column: int, value: int):
+        """Set the value of a cell of the window, inserting or removing its key."""
+        key = self._key(row, column)
+        index = numpy.searchsorted(state, key)[0]
+        alive = bool(_contains(state, key)[0])
+
+        if value and not alive:
+            return numpy.insert(state, index, key)
+
+        if not value and alive:
+            return numpy.delete(state, index)
+
+        return state
+
+    def step(self, state: numpy.ndarray) -> numpy.ndarray:
+        """
+        Compute the next generation of the universe.
+
+        Args:
+            state (numpy.ndarray): The sorted keys of the alive cells.
+
+        Returns:
+            numpy.ndarray: The sorted keys of the new alive cells.
+        """
+        neighbors = (state[:, None] + NEIGHBOR_KEYS[None, :]).ravel()
+        candidates, alive_neighbors = numpy.unique(neighbors, return_counts=True)
+        alive = _contains(state, candidates)
+
+        # Index of the table of the rule: state * 9 + alive neighbors
+        index = alive_neighbors.astype(numpy.uint8)
+        index += alive.view(numpy.uint8) * numpy.uint8(9)
+        new_state = candidates[self.rule.table.take(index).view(bool)]
+
+        # The alive cells without alive neighbors are not candidates
+        if 0 in self.rule.survival:
+            isolated = state[~_contains(candidates, state)]
+            new_state = numpy.union1d(new_state, isolated)
+
+        return new_state
+
+    def _key(self, row: int, column: int) -> numpy.ndarray:
+        """Key of a cell of the window."""
+        return to_keys(
+            numpy.array([row + self.offset[0]]), numpy.array([column + self.offset[1]])
+        )
+
+
+def to_keys(rows: numpy.ndarray, columns: numpy.ndarray) -> numpy.ndarray:
+    """Convert the coordinates of cells of the universe to their keys."""
+    rows = (rows.astype(numpy.int64) + BIAS).astype(numpy.uint64)
+    columns = (columns.astype(numpy.int64) + BIAS).astype(numpy.uint64)
+    return rows << numpy.uint64(32) | columns
+
+
+def from_keys(keys: numpy.ndarray):
+    """Convert the keys of cells to their coordinates in the universe."""
+    rows = (keys >> numpy.uint64(32)).astype(numpy.int64) - BIAS
+    columns = (keys & numpy.uint64(0xFFFFFFFF)).astype(numpy.int64) - BIAS
+    return rows, columns
+
+
+def _contains(keys: numpy.ndarray, values: numpy.ndarray) -> numpy.ndarray:
+    """Check which values are in the sorted keys."""
+    if keys.size == 0:
+        return numpy.zeros(values.shape, dtype=bool)
+
+    index = numpy.searchsorted(keys, values).clip(max=keys.size - 1)
+    return keys[index] == values
@@ -0,0 +1,123 @@
+from typing import Optional
+
+import numpy
+
+from src.engines.base import Engine
+from src.engines.vectorized import apply_rule, count_neighbors
+
+
+class TiledEngine(Engine):
+    """
+    Engine splitting the grid in tiles and computing only the tiles that can change.
+
+    Notes:
+        A tile can only change if itself or one of its neighbor tiles changed during the last
+        generation (or was edited), the other tiles are stable and are copied as they are.
+
+    Attributes:
+        tile_size (int): The number of cells on each side of a tile.
+        limit_dirty (float): The part of tiles to compute above which the whole grid is computed.
+        active (Optional[numpy.ndarray]): The tiles changed since the last generation (None if all).
+    """
+
+    name = "tiled"
+
+    tile_size: int
+    limit_dirty: float
+    active: Optional[numpy.ndarray]
+
+    def __init__(self, tile_size: int = 64, limit_dirty: float = 0.5):
+        self.tile_size = tile_size
+        self.limit_dirty = limit_dirty
+        self.active = None
+
+    def encode(self, grid: numpy.ndarray) -> numpy.ndarray:
+        """The grid is replaced, all the tiles must be computed."""
+        self.invalidate()
+        return grid
+
+    def invalidate(self):
+        """Mark all the tiles as changed."""
+        self.active = None
+
+    def mark_changed(self, row: int, column: int):
+        """Mark the tile of the cell as changed."""
+        if self.active is not None:
+            self.active[row // self.tile_size, column // self.tile_size] = True
+
+    def step(self, state: numpy.ndarray) -> numpy.ndarray:
+        """
+        Compute the next generation of the tiles next to a changed tile.
+
+        Args:
+            state (numpy.ndarray): The current grid state.
+
+        Returns:
+            numpy.ndarray: The new grid state.
+        """
+        width, height = state.shape
+        size = self.tile_size
+        shape = (-(-width // size), -(-height // size))
+
+        if self.active is None or self.active.shape != shape:
+            self.active = numpy.ones(shape, dtype=bool)
+
+        dirty = _dilate(self.active)
+
+        # Most of the grid can change, computing it at once is faster than tile by tile
+        if dirty.mean() > self.limit_dirty:
+            new_state = self._step(state)
+            self.active = _changed_tiles(state != new_state, size)
+            return new_state
+
+        new_state = state.copy()
+        changed = numpy.zeros(shape, dtype=bool)
+
+        for tile_row, tile_column in numpy.argwhere(dirty):
+            row, column = tile_row * size, tile_column * size
+            end_row, end_column = min(row + size, width), min(column + size, height)
+
+            # Compute the tile with a halo of one cell, then drop the halo
+            top, left = max(row - 1, 0), max(column - 1, 0)
+            block = state[
+                top : min(end_row + 1, width), left : min(end_column + 1, height)
+            ]
+            tile = self._step(block)[
+                row - top : end_row - top, column - left : end_column - left
+            ]
+
+            if not numpy.array_equal(tile, state[row:end_row, column:end_column]):
+                new_state[row:end_row, column:end_column] = tile
+                changed[tile_row, tile_column] = True
+
+        self.active = changed
+        return new_state
+
+    def _step(self, grid: numpy.ndarray) -> numpy.ndarray:
+        """Compute the next generation of the whole grid or of a tile, with its halo."""
+        return apply_rule(self.rule, grid, count_neighbors(grid))
+
+
+def _dilate(tiles: numpy.ndarray) -> numpy.ndarray:
+    """Add the 8 neighbors of each marked tile."""
+    width, height = tiles.shape
+    padded = numpy.pad(tiles, 1)
+    dilated = numpy.zeros_like(tiles)
+
+    for i in range(3):
+        for j in range(3):
+            dilated |= padded[i : i + width, j : j + height]
+
+    return dilated
+
+
+def _changed_tiles(changed_cells: numpy.ndarray, size: int) -> numpy.ndarray:
+    """Reduce the mask of changed cells to the mask of changed tiles."""
+    width, height = changed_cells.shape
+    padded = numpy.zeros(
+        (-(-width // size) * size, -(-height // size) * size), dtype=bool
+    )
+    padded[:width, :height] = changed_cells
+
+    tiles = padded.reshape(padded.shape[0] // size, size, padded.shape[1] // size, size)
+    return tiles.any(axis=(1, 3))
@@ -0,0 +1,83 @@
+import numpy
+
+from src.engines.base import Engine
+from src.rules import Rule
+
+# Offsets of the 8 neighbors (Moore neighborhood) around a cell
+NEIGHBOR_OFFSETS = [
+    (i, j) for i in range(-1, 2) for j in range(-1, 2) if (i, j) != (0, 0)
+]
+
+
+class VectorizedEngine(Engine):
+    """
+    Engine computing the whole grid at once with NumPy.
+
+    Notes:
+        The neighbors are counted by summing the 8 shifted slices of the grid padded with dead cells,
+        so the edges of the grid behave exactly like the reference engine.
+        The next state of every cell is looked up in the table of the rule at once.
+    """
+
+    name = "numpy"
+
+    def step(self, grid: numpy.ndarray) -> numpy.ndarray:
+        """
+        Compute the next generation of the grid.
+
+        Args:
+            grid (numpy.ndarray): The current grid state.
+
+        Returns:
+            numpy.ndarray: The new grid state.
+        """
+        return apply_rule(self.rule, grid, count_neighbors(grid))
+
+
+def apply_rule(
+    rule: Rule, grid: numpy.ndarray, alive_neighbors: numpy.ndarray
+) -> numpy.ndarray:
+    """
+    Look up the next state of every cell in the table of the rule.
+
+    Notes:
+        The table is read from its bits, shifted by the index of each cell.
+
+    Args:
+        rule (Rule): The rule of the generations.
+        grid (numpy.ndarray): The current grid state.
+        alive_neighbors (numpy.ndarray): The number of alive neighbors of each cell
+            (uint8, modified).
+
+    Returns:
+        numpy.ndarray: The new grid state.
+    """
+    # Index of the table: state * 9 + alive neighbors
+    alive_neighbors += numpy.multiply(grid != 0, numpy.uint8(9), dtype=numpy.uint8)
+
+    cells = numpy.right_shift(rule.bits, alive_neighbors)
+    cells &= numpy.uint32(1)
+
+    return cells.astype(grid.dtype, copy=False)
+
+
+def count_neighbors(grid: numpy.ndarray) -> numpy.ndarray:
+    """
+    Count the alive neighbors of every cell, the cells outside the grid are dead.
+
+    Args:
+        grid (numpy.ndarray): The grid to count the neighbors from.
+
+    Returns:
+        numpy.ndarray: The number of alive neighbors of each cell (uint8).
+    """
+    width, height = grid.shape
+    padded = numpy.zeros((width + 2, height + 2), dtype=numpy.uint8)
+    padded[1:-1, 1:-1] = grid
+
+    alive_neighbors = numpy.zeros(grid.shape, dtype=numpy.uint8)
+
+    for i, j in NEIGHBOR_OFFSETS:
+        alive_neighbors += padded[1 + i : 1 + i + width, 1 + j : 1 + j + height]
+
+    return alive_neighbors
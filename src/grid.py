@@ -1,167 +1,28 @@
-import itertools
 import logging
-from collections import deque
-from typing import Tuple, Optional, Set, Deque
+from typing import Dict, List, Optional, Tuple
 
 import numpy
 import pygame
 
+from src.camera import Camera
 from src.core.keyboard import KeyboardInfo
 from src.core.mouse import MouseInfo
+from src.model import GridModel
+from src.scheduler import Scheduler
+from src.worker import SimulationWorker
 
+# Color of the screen around the grid
+SCREEN_COLOR = (225, 225, 225)
 
-class GridModel:
-    """
-    Grid model class that holds the grid state and the game logic.
-
-    Attributes:
-        grid (numpy.ndarray): The grid of the game.
-        memory_changes (Set[Tuple[int, int]]): The memory of the changes made.
-        memory_color (Optional[int]): The memory of the color to use.
-        history (Deque[numpy.ndarray]): The history of the grid states.
-        limit_history (int): The limit of the history.
-
-    """
-
-    grid: numpy.ndarray
-    memory_changes: Set[Tuple[int, int]]
-    memory_color: Optional[int] = None
-
-    history: Deque[numpy.ndarray]
-    limit_history: int
-
-    def __init__(self, shape: Tuple[int, int] = (16, 16), limit_history: int = 500):
-        self.grid = numpy.zeros(shape, dtype=int)
-        self.memory_changes = set()
-        self.memory_color = None
-
-        self.history = deque(maxlen=limit_history)
-        self.limit_history = limit_history
-
-    def toggle_cell(self, row: int, column: int):
-        """
-        Toggle the cell state at the given row and column.
-
-        Notes:
-            if memory_color is None, the color is set to the opposite of the current cell value.
-
-        Args:
-            row (int): The row of the cell.
-            column (int): The column of the cell.
-
-        """
-        if self.memory_color is None:
-            value = self.grid[row][column].item()
-            self.memory_color = abs(value - 1)
-
-        self.grid[row][column] = self.memory_color
-        self.memory_changes.add((row, column))
-
-    def reset_memory(self):
-        """Reset the memory of the changes made."""
-        logging.info(f"Resetting memory: {len(self.memory_changes)} changes made")
-        self.memory_changes.clear()
-        self.memory_color = None
-
-    def is_valid_index(self, row: int, column: int):
-        """
-        Check if the row and column are valid indexes.
-
-        Args:
-            row (int): The row index.
-            column (int): The column index.
-
-        Returns:
-            bool: True if the indexes are valid, False otherwise
-        """
-        width, height = self.grid.shape
-        conditions = (
-            0 <= row < width,
-            0 <= column < height,
-        )
-
-        return all(conditions)
-
-    def next_generation(self):
-        """
-        Generate the next generation of the grid.
-
-        Returns:
-            numpy.ndarray: The new grid state.
-        """
-        print(f"History: {len(self.history)}")
-        self.history.append(self.grid)
-
-        new_grid = numpy.zeros_like(self.grid)
-        width, height = self.grid.shape
-
-        for row, column in itertools.product(range(width), range(height)):
-            neighbors = self._get_neighbors(row, column)
-            alive_neighbors = sum(neighbors)
-            cell = self.grid[row][column]
-
-            if cell == 1:
-                if alive_neighbors < 2 or alive_neighbors > 3:
-                    new_grid[row][column] = 0
-                else:
-                    new_grid[row][column] = 1
-            else:
-                if alive_neighbors == 3:
-                    new_grid[row][column] = 1
-
-        if numpy.array_equal(self.grid, new_grid):
-            logging.info("No changes were made, the grid is stable")
-            self.history.pop()
-
-        self.grid = new_grid.copy()
-
-    def _get_neighbors(self, row: int, column: int):
-        """
-        Get the neighbors of the cell at the given row and column.
+# Colors of the cells: background, middle lines, alive (indexes of the lookup)
+CELL_COLORS = [(255, 255, 255), (225, 225, 230), (0, 0, 0)]
+ALIVE = 2
 
-        Args:
-            row (int): The row of the cell.
-            column (int): The column of the cell.
-
-        Returns:
-            List[int]: The list of neighbors.
-        """
-        width, height = self.grid.shape
-        neighbors = []
-
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                if i == 0 and j == 0:
-                    continue
-
-                new_row = row + i
-                new_column = column + j
-
-                if 0 <= new_row < width and 0 <= new_column < height:
-                    neighbors.append(self.grid[new_row][new_column])
-
-        return neighbors
+# Above this number of changed cells, the whole grid is drawn instead of each cell
+LIMIT_DIRTY_CELLS = 2048
 
-    def clear_grid(self):
-        """Clear the grid of all live cells."""
-        logging.info("Clearing the grid")
-        self.grid = numpy.zeros_like(self.grid)
-        self.memory_changes.clear()
-        self.memory_color = None
-
-    def reshape(self, width: int, height: int):
-        """
-        Reshape the grid to the given width and height.
-
-        Args:
-            width (int): The new width.
-            height (int): The new height.
-
-        """
-        logging.info(f"Reshaping the grid to: {width} x {height}")
-        self.grid = numpy.zeros((width, height), dtype=int)
-        self.memory_changes.clear()
-        self.memory_color = None
+# Below this size of cell (in pixels), the grid lines are not drawn
+LIMIT_LINES_CELL_SIZE = 4
 
 
 class GridView:
@@ -175,6 +36,7 @@ class GridView:
         screen_y (int): The y coordinate of the screen.
         screen_height (int): The height of the screen.
         screen_width (int): The width of
+        camera (Camera): The camera over the grid, the window of cells drawn.
     """
 
     title: str
@@ -183,10 +45,18 @@ class GridView:
     screen_y: int
     screen_height: int
     screen_width: int
+    camera: Camera
 
     def __init__(self, screen: pygame.Surface):
         self.title = "Game of Life"
         self.screen = screen
+        self._cells_surface: Optional[pygame.Surface] = None
+        self._palette: Optional[numpy.ndarray] = None
+        self._background: Optional[pygame.Surface] = None
+        self._background_key: Optional[tuple] = None
+        self._densities: Dict[int, numpy.ndarray] = {}
+        self._shape: Optional[Tuple[int, int]] = None
+        self.camera = Camera(screen_size=screen.get_size())
         self.screen_x, self.screen_y, self.screen_height, self.screen_width = (
             screen.get_rect()
         )
@@ -194,136 +64,258 @@ class GridView:
             f"Screen size: {self.screen_width} x {self.screen_height} at {self.screen_x}, {self.screen_y}"
         )
 
-    def grid_width(self, grid: numpy.ndarray):
+    def update_camera(self, shape: Tuple[int, int]):
         """
-        Get the width of the grid.
+        Fit the camera on the whole grid, if its shape or the size of the screen changed.
 
         Args:
-            grid (numpy.ndarray): The grid to get the width from.
+            shape (Tuple[int, int]): The shape of the grid.
 
-        Returns:
-            int: The width of the grid.
         """
-        grid_width = grid.shape[0] * self.cell_size(grid=grid)
-        min_width = min(grid_width, self.screen.width)
+        screen_size = self.screen.get_size()
 
-        return min_width
+        if self._shape != shape or self.camera.screen_size != screen_size:
+            self.camera.screen_size = screen_size
+            self.camera.fit(shape)
+            self._shape = shape
 
-    def grid_height(self, grid: numpy.ndarray):
+    def draw(self, grid: numpy.ndarray, changed: bool = True):
         """
-        Get the height of the grid.
+        Draw the window of the grid visible by the camera on the screen.
 
         Args:
-            grid (numpy.ndarray): The grid to get the height from.
+            grid (numpy.ndarray): The grid to draw.
+            changed (bool): Whether the grid changed since the last draw
+                (else the densities of the blocks of cells are taken from the cache).
 
-        Returns:
-            int: The height of the grid.
         """
-        grid_height = grid.shape[1] * self.cell_size(grid=grid)
-        min_height = min(grid_height, self.screen.height)
+        self.update_camera(grid.shape)
+        self.screen.fill(SCREEN_COLOR)
+
+        if changed:
+            self._densities.clear()
 
-        return min_height
+        start_row, end_row, start_column, end_column = self.camera.window(grid.shape)
 
-    def cell_size(self, grid: numpy.ndarray):
+        if start_row < end_row and start_column < end_column:
+            if self.camera.block > 1:
+                self._draw_density(grid)
+            else:
+                background, position = self._get_background(grid.shape)
+                self.screen.blit(background, position)
+                self._draw_cells(grid)
+
+        self._draw_title()
+
+    def draw_changes(
+        self, grid: numpy.ndarray, indexes: numpy.ndarray
+    ) -> List[pygame.Rect]:
         """
-        Get the size of the cell.
+        Draw only the changed cells of the grid on the screen.
+
+        Notes:
+            If too many cells changed, or the cells are drawn by blocks, the whole window
+            is drawn (faster than cell by cell). The dead cells are restored from the
+            background, the live cells are filled.
 
         Args:
-            grid (numpy.ndarray): The grid to get the cell size from.
+            grid (numpy.ndarray): The grid to draw.
+            indexes (numpy.ndarray): The indexes (row, column) of the cells changed since
+                the last draw.
 
         Returns:
-            int: The size of the cell in pixels.
+            List[pygame.Rect]: The areas of the screen drawn, to update the display.
         """
-        return min(
-            self.screen.width // grid.shape[0], self.screen.height // grid.shape[1]
-        )
+        self._draw_title()
+
+        if len(indexes) == 0:
+            return []
 
-    def draw(self, grid: numpy.ndarray):
+        if len(indexes) > LIMIT_DIRTY_CELLS or self.camera.block > 1:
+            self.draw(grid)
+            return [self.screen.get_rect()]
+
+        # Only the cells in the window of the camera are visible
+        start_row, end_row, start_column, end_column = self.camera.window(grid.shape)
+        rows, columns = indexes[:, 0], indexes[:, 1]
+        visible = (start_row <= rows) & (rows < end_row)
+        visible &= (start_column <= columns) & (columns < end_column)
+        indexes = indexes[visible]
+
+        if len(indexes) == 0:
+            return []
+
+        background, position = self._get_background(grid.shape)
+        area = background.get_rect(topleft=position)
+        cell_size = self.camera.cell_size
+        alive = grid[indexes[:, 0], indexes[:, 1]] == 1
+        rects = []
+
+        for (row, column), is_alive in zip(indexes.tolist(), alive.tolist()):
+            x, y = self.camera.to_screen(row, column)
+            rect = pygame.Rect(x, y, cell_size, cell_size).clip(area)
+
+            if is_alive:
+                self.screen.fill(CELL_COLORS[ALIVE], rect)
+            else:
+                source = rect.move(-position[0], -position[1])
+                self.screen.blit(background, rect, area=source)
+
+            rects.append(rect)
+
+        return rects
+
+    def _get_background(
+        self, shape: Tuple[int, int]
+    ) -> Tuple[pygame.Surface, Tuple[int, int]]:
         """
-        Draw the grid on the screen.
+        Get the background of the window of the grid (dead cells, middle lines and grid lines).
+
+        Notes:
+            The background only depends on the shape of the grid, the window of the camera
+            and the size of the screen, it is drawn once and cached until one of them changes.
 
         Args:
-            grid (numpy.ndarray): The grid to draw.
+            shape (Tuple[int, int]): The shape of the grid.
 
+        Returns:
+            Tuple[pygame.Surface, Tuple[int, int]]: The background and its position on the screen.
         """
-        cell_size = self.cell_size(grid)
-        grid_width = self.grid_width(grid=grid)
-        grid_height = self.grid_height(grid=grid)
-
-        self.screen.fill(
-            "white", (self.screen_x, self.screen_y, grid_width, grid_height)
+        window = self.camera.window(shape)
+        cell_size = self.camera.cell_size
+        position = self.camera.to_screen(window[0], window[2])
+        key = (shape, window, cell_size, self.screen.get_size())
+
+        if self._background is not None and self._background_key == key:
+            return self._background, position
+
+        logging.debug(f"Drawing the background of the grid: {window} ({cell_size} px)")
+        start_row, end_row, start_column, end_column = window
+        size = (
+            (end_row - start_row) * cell_size,
+            (end_column - start_column) * cell_size,
         )
+        background = pygame.Surface(size)
 
-        self._draw_cells(grid, cell_size)
-        self._draw_grid(cell_size, grid_width, grid_height)
-        self._draw_title()
+        # Grey lines to indicate the middle (vertically, horizontally)
+        middle = pygame.Surface((end_row - start_row, end_column - start_column))
+        palette = numpy.array([middle.map_rgb(color) for color in CELL_COLORS])
+        pygame.surfarray.blit_array(middle, palette[_middle_mask(shape, window)])
+        background.blit(pygame.transform.scale(middle, size), (0, 0))
+
+        # The lines would hide the cells if they are too small
+        if cell_size >= LIMIT_LINES_CELL_SIZE:
+            last_lines = (end_row == shape[0], end_column == shape[1])
+            self._draw_grid(background, cell_size, last_lines)
+
+        self._background = background
+        self._background_key = key
 
-    def _draw_grid(self, cell_size: int, grid_width: int, grid_height: int):
+        return background, position
+
+    @staticmethod
+    def _draw_grid(
+        surface: pygame.Surface, cell_size: int, last_lines: Tuple[bool, bool]
+    ):
         """
-        Draw the grid lines on the screen.
+        Draw the grid lines on a surface.
 
         Notes:
             Order of drawing is important, draw the vertical lines first then the horizontal lines.
 
         Args:
+            surface (pygame.Surface): The surface to draw on, of the size of the grid.
             cell_size (int): The size of the cell.
-            grid_width (int): The width of the grid.
-            grid_height (int): The height of the grid.
+            last_lines (Tuple[bool, bool]): Whether to draw the last vertical and horizontal
+                lines (the surface ends with the last cells of the grid).
 
         """
+        grid_width, grid_height = surface.get_size()
+
         # Draw vertical lines
         for i in range(0, grid_width, cell_size):
-            pygame.draw.line(self.screen, "black", (i, 0), (i, grid_height))
+            pygame.draw.line(surface, "black", (i, 0), (i, grid_height))
 
         # Draw the last vertical line
-        pygame.draw.line(
-            self.screen, "black", (grid_width - 1, 0), (grid_width - 1, grid_height)
-        )
+        if last_lines[0]:
+            pygame.draw.line(
+                surface, "black", (grid_width - 1, 0), (grid_width - 1, grid_height)
+            )
 
         # Draw horizontal lines
         for i in range(0, grid_height, cell_size):
-            pygame.draw.line(self.screen, "black", (0, i), (grid_width, i))
+            pygame.draw.line(surface, "black", (0, i), (grid_width, i))
 
         # Draw the last horizontal line
-        pygame.draw.line(
-            self.screen, "black", (0, grid_height - 1), (grid_width, grid_height - 1)
-        )
+        if last_lines[1]:
+            pygame.draw.line(
+                surface, "black", (0, grid_height - 1), (grid_width, grid_height - 1)
+            )
 
-    def _draw_cells(self, grid: numpy.ndarray, cell_size: int):
+    def _draw_cells(self, grid: numpy.ndarray):
         """
-        Draw the cells on the screen.
+        Draw the live cells of the window on the screen, over the background.
+
+        Notes:
+            The window is written in a surface of one pixel per cell with a color lookup,
+            then scaled to the size of the cells and drawn in one blit, the dead cells
+            are transparent (color key) to keep the background.
 
         Args:
             grid (numpy.ndarray): The grid to draw.
-            cell_size (int): The size of the cell.
 
         """
-        nbr_rows, nbr_columns = grid.shape
-        generator = itertools.product(range(nbr_rows), range(nbr_columns))
+        start_row, end_row, start_column, end_column = self.camera.window(grid.shape)
+        window = grid[start_row:end_row, start_column:end_column]
+        nbr_rows, nbr_columns = window.shape
+        cell_size = self.camera.cell_size
+
+        if self._cells_surface is None or self._cells_surface.size != window.shape:
+            self._cells_surface = pygame.Surface(window.shape)
+            self._palette = numpy.array(
+                [self._cells_surface.map_rgb(color) for color in CELL_COLORS],
+                dtype=numpy.uint32,
+            )
+
+        colors = numpy.where(window == 1, ALIVE, 0)
+
+        pygame.surfarray.blit_array(self._cells_surface, self._palette[colors])
+        size = (nbr_rows * cell_size, nbr_columns * cell_size)
+        cells = pygame.transform.scale(self._cells_surface, size)
+        cells.set_colorkey(CELL_COLORS[0])
+        self.screen.blit(cells, self.camera.to_screen(start_row, start_column))
+
+    def _draw_density(self, grid: numpy.ndarray):
+        """
+        Draw the window of the grid zoomed out, one pixel per block of cells.
+
+        Notes:
+            The darker the pixel, the more live cells in the block, the densities of the
+            blocks are cached for each zoom level until the grid changes.
 
-        middle_row = [nbr_rows // 2]
-        middle_column = [nbr_columns // 2]
+        Args:
+            grid (numpy.ndarray): The grid to draw.
 
-        if nbr_rows % 2 == 0:
-            middle_row += [nbr_rows // 2 - 1]
+        """
+        block = self.camera.block
 
-        if nbr_columns % 2 == 0:
-            middle_column += [nbr_columns // 2 - 1]
+        if block not in self._densities:
+            self._densities[block] = _block_density(grid, block)
 
-        # Draw grey lines to indicate the middle (vertically, horizontally)
-        for row, column in generator:
-            if (row in middle_row) or (column in middle_column):
-                x = row * cell_size
-                y = column * cell_size
-                pygame.draw.rect(
-                    self.screen, (225, 225, 230), (x, y, cell_size, cell_size)
-                )
+        start_row, end_row, start_column, end_column = self.camera.window(grid.shape)
+        density = self._densities[block][
+            start_row // block : -(-end_row // block),
+            start_column // block : -(-end_column // block),
+        ]
 
-            # Draw the live cells
-            if grid[row][column] == 1:
-                x = row * cell_size
-                y = column * cell_size
-                pygame.draw.rect(self.screen, "black", (x, y, cell_size, cell_size))
+        # Any live cell is visible, white for the empty blocks
+        level = numpy.where(density > 0, 64 + density * 191, 0).astype(numpy.uint8)
+        colors = numpy.repeat((255 - level)[:, :, None], 3, axis=2)
+
+        surface = pygame.Surface(density.shape)
+        pygame.surfarray.blit_array(surface, colors)
+        position = (start_row // block * block, start_column // block * block)
+        self.screen.blit(surface, self.camera.to_screen(*position))
 
     def _draw_title(self):
         # Note, on garde cette façon de faire pour garder la possibilité d'afficher sur l'écran
@@ -346,23 +338,49 @@ class GridController:
     Attributes:
         model (GridModel): The model of the game.
         view (GridView): The view of the game.
+        scheduler (Scheduler): The scheduler of the generations, while Space is held.
+        worker (Optional[SimulationWorker]): The worker computing the generations ahead,
+            while Space is held.
 
     """
 
     model: GridModel
     view: GridView
+    scheduler: Scheduler
+    worker: Optional[SimulationWorker]
 
     def __init__(
         self,
         model: GridModel,
         view: GridView,
+        scheduler: Optional[Scheduler] = None,
     ):
         self.model = model
         self.view = view
+        self.scheduler = scheduler or Scheduler()
+        self.worker = None
+        self._worker_state: Optional[numpy.ndarray] = None
+        self._camera_moved = False
+
+    def draw(self, full: bool = True) -> Optional[List[pygame.Rect]]:
+        """
+        Draw the grid on the screen.
+
+        Args:
+            full (bool): Draw the whole grid, else only the cells changed since the last draw.
+
+        Returns:
+            Optional[List[pygame.Rect]]: The areas of the screen drawn, None if all the screen.
+        """
+        changed_indexes = self.model.consume_changes()
+
+        if full or changed_indexes is None or self._camera_moved:
+            changed = changed_indexes is None or len(changed_indexes) > 0
+            self.view.draw(self.model.grid, changed=changed)
+            self._camera_moved = False
+            return None
 
-    def draw(self):
-        """Draw the grid on the screen."""
-        self.view.draw(self.model.grid)
+        return self.view.draw_changes(self.model.grid, changed_indexes)
 
     def handle_event(self, mouse_info: MouseInfo, keyboard_info: KeyboardInfo):
         """
@@ -373,9 +391,14 @@ class GridController:
             keyboard_info (KeyboardInfo): The keyboard information.
 
         """
+        self._move_camera(mouse_info)
         row, column = self._get_cell_index(mouse_info.x, mouse_info.y)
         valid_index = self.model.is_valid_index(row, column)
 
+        # The generations computed ahead are wrong once the grid is edited
+        if (mouse_info.left_held or mouse_info.right_click) and valid_index:
+            self._stop_worker()
+
         # Toggle the cell
         if mouse_info.left_click and valid_index:
             logging.info(
@@ -397,16 +420,77 @@ class GridController:
             self.model.reset_memory()
 
         # Generate the next generation
-        if keyboard_info.keyboard_click[" "] or keyboard_info.keyboard_hard_held[" "]:
+        if keyboard_info.keyboard_click[" "]:
             self.model.next_generation()
 
+        # Generate the next generations at the rate of the scheduler
+        elif keyboard_info.keyboard_hard_held[" "]:
+            self._start_worker()
+            self.scheduler.run(self._push_generation)
+
+        else:
+            self.scheduler.reset()
+            self._stop_worker()
+
         # Go back to the last generation
         if keyboard_info.keyboard_click["r"] or keyboard_info.keyboard_hard_held["r"]:
-            if len(self.model.history) != 0:
-                self.model.grid = self.model.history.pop()
+            self.model.previous_generation()
 
         self._update_info(row, column)
 
+    def _start_worker(self):
+        """Start the worker from the current state, if not started or the state changed."""
+        if self.worker is not None and self.model.state is self._worker_state:
+            return
+
+        self._stop_worker()
+        self.worker = SimulationWorker(
+            self.model.engine.copy(), self.model.state, self.model.state_hash
+        )
+        self._worker_state = self.model.state
+
+    def _stop_worker(self):
+        """Cancel the worker and drop the generations computed ahead."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+            self._worker_state = None
+
+    def _push_generation(self) -> bool:
+        """
+        Go to the next generation computed by the worker, if ready.
+
+        Returns:
+            bool: Whether the next generation was ready.
+        """
+        generation = self.worker.pop()
+
+        if generation is None:
+            return False
+
+        state, state_hash, stable = generation
+        self.model.push_generation(state, state_hash, stable)
+        self._worker_state = state
+        return True
+
+    def _move_camera(self, mouse_info: MouseInfo):
+        """
+        Zoom with the wheel and move the camera by holding the middle button.
+
+        Args:
+            mouse_info (MouseInfo): The mouse information.
+
+        """
+        camera = self.view.camera
+        self.view.update_camera(self.model.shape)
+
+        if mouse_info.wheel_up or mouse_info.wheel_down:
+            zoom_in = mouse_info.wheel_up
+            self._camera_moved |= camera.zoom(mouse_info.x, mouse_info.y, zoom_in)
+
+        if mouse_info.middle_held:
+            self._camera_moved |= camera.move(mouse_info.dx, mouse_info.dy)
+
     def _get_cell_index(self, x: int, y: int):
         """
         Get the cell index from the x and y coordinates
@@ -418,10 +502,7 @@ class GridController:
         Returns:
             Tuple[int, int]: The row and column of the cell.
         """
-        cell_size = self.view.cell_size(self.model.grid)
-        row = x // cell_size
-        column = y // cell_size
-        return row, column
+        return self.view.camera.to_cell(x, y)
 
     def _update_info(self, row: int, column: int):
         """
@@ -435,6 +516,67 @@ class GridController:
             str: The title of the view.
         """
         length_history = len(self.model.history)
+        size_history = self.model.history.size / 2**20
+        limit_history = self.model.limit_history / 2**20
+        x, y = self.model.engine.offset
         self.view.title = f"Game of Life  ("
-        self.view.title += f"x={row}, y={column} - "
-        self.view.title += f"history: {length_history}/{self.model.limit_history})"
+        self.view.title += f"x={x + row}, y={y + column} - "
+        self.view.title += f"generation: {self.model.generation} - "
+        self.view.title += f"history: {length_history} "
+        self.view.title += f"({size_history:.1f}/{limit_history:.1f} MB))"
+
+
+def _middle_mask(
+    shape: Tuple[int, int], window: Optional[Tuple[int, int, int, int]] = None
+) -> numpy.ndarray:
+    """
+    Get the mask of the cells on the middle rows and columns.
+
+    Args:
+        shape (Tuple[int, int]): The shape of the grid.
+        window (Optional[Tuple[int, int, int, int]]): The first and last (excluded) rows,
+            then columns, of the window to get the mask of (all the grid by default).
+
+    Returns:
+        numpy.ndarray: The mask of the cells in the middle (0 or 1).
+    """
+    nbr_rows, nbr_columns = shape
+    start_row, end_row, start_column, end_column = window or (
+        0,
+        nbr_rows,
+        0,
+        nbr_columns,
+    )
+    middle_row = [nbr_rows // 2]
+    middle_column = [nbr_columns // 2]
+
+    if nbr_rows % 2 == 0:
+        middle_row += [nbr_rows // 2 - 1]
+
+    if nbr_columns % 2 == 0:
+        middle_column += [nbr_columns // 2 - 1]
+
+    rows = numpy.isin(numpy.arange(start_row, end_row), middle_row)
+    columns = numpy.isin(numpy.arange(start_column, end_column), middle_column)
+
+    return (rows[:, None] | columns[None, :]).astype(numpy.uint8)
+
+
+def _block_density(grid: numpy.ndarray, block: int) -> numpy.ndarray:
+    """
+    Get the density of live cells of each block of cells of the grid.
+
+    Args:
+        grid (numpy.ndarray): The grid of 0 and 1.
+        block (int): The number of cells (per side) of a block.
+
+    Returns:
+        numpy.ndarray: The density of each block (between 0 and 1).
+    """
+    rows = numpy.arange(0, grid.shape[0], block)
+    columns = numpy.arange(0, grid.shape[1], block)
+
+    counts = numpy.add.reduceat(grid, rows, axis=0, dtype=numpy.uint32)
+    counts = numpy.add.reduceat(counts, columns, axis=1, dtype=numpy.uint32)
+
+    return counts.astype(numpy.float32) / block**2
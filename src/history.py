@@ -0,0 +1,260 @@
+import hashlib
+import logging
+import zlib
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+import numpy
+
+
+@dataclass
+class Entry:
+    """
+    Entry of the history, the state is stored as a compressed blob.
+
+    Attributes:
+        generation (int): The generation of the state.
+        shape (Tuple[int, ...]): The shape of the state.
+        dtype (numpy.dtype): The type of the state.
+        keyframe (bool): Whether the blob is the full state, else the XOR with the previous state.
+        digest (bytes): The key of the blob (digest of the uncompressed data).
+        bits (bool): Whether the data only holds 0 and 1, packed 8 per byte before compression.
+    """
+
+    generation: int
+    shape: Tuple[int, ...]
+    dtype: numpy.dtype
+    keyframe: bool
+    digest: bytes
+    bits: bool
+
+
+class History:
+    """
+    History of the states, stored as compressed deltas to fit in a budget of bytes.
+
+    Notes:
+        Each state is stored as the XOR with the previous state (mostly zeros, so it compresses
+        well), with a full state (keyframe) at regular intervals. Identical blobs are stored once,
+        so the deltas of an oscillator or repeated states cost nothing.
+        The last state is kept uncompressed, so going back one generation only decompresses
+        one delta. When the budget is exceeded, the oldest states are dropped.
+
+    Attributes:
+        limit_bytes (int): The limit of bytes of the compressed blobs.
+        keyframe_interval (int): The number of states between two keyframes.
+        size (int): The number of bytes of the compressed blobs.
+    """
+
+    limit_bytes: int
+    keyframe_interval: int
+    size: int
+
+    def __init__(self, limit_bytes: int = 64 * 2**20, keyframe_interval: int = 64):
+        self.limit_bytes = limit_bytes
+        self.keyframe_interval = keyframe_interval
+        self.size = 0
+
+        self._entries: Deque[Entry] = deque()
+        self._blobs: Dict[bytes, bytes] = {}
+        self._references: Counter = Counter()
+        self._last: Optional[numpy.ndarray] = None
+        self._since_keyframe = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Tuple[int, numpy.ndarray]]:
+        """Iterate over the generations and their states, from the oldest."""
+        state = None
+
+        for entry in list(self._entries):
+            state = self._decode(entry, state)
+            yield entry.generation, state
+
+    def append(self, item: Tuple[int, numpy.ndarray]):
+        """
+        Add a state at the end of the history.
+
+        Args:
+            item (Tuple[int, numpy.ndarray]): The generation and its state.
+
+        """
+        if self.limit_bytes <= 0:
+            return
+
+        generation, state = item
+        last = self._last
+        compatible = last is not None and last.shape == state.shape
+        compatible = compatible and last.dtype == state.dtype
+
+        if compatible and self._since_keyframe < self.keyframe_interval:
+            data = numpy.bitwise_xor(state, last)
+            self._since_keyframe += 1
+        else:
+            data = state
+            self._since_keyframe = 0
+
+        bits = _is_binary(data)
+        digest = self._store(data, bits)
+        keyframe = self._since_keyframe == 0
+        entry = Entry(generation, state.shape, state.dtype, keyframe, digest, bits)
+        self._entries.append(entry)
+        self._last = state
+
+        self._evict()
+
+    def pop(self) -> Tuple[int, numpy.ndarray]:
+        """
+        Remove the last state of the history.
+
+        Raises:
+            IndexError: If the history is empty.
+
+        Returns:
+            Tuple[int, numpy.ndarray]: The generation and its state.
+        """
+        if not self._entries:
+            raise IndexError("pop from an empty history")
+
+        entry = self._entries.pop()
+        state = self._last
+
+        if not self._entries:
+            self._last = None
+        elif entry.keyframe:
+            self._last = self._rebuild_last()
+        else:
+            self._last = numpy.bitwise_xor(state, self._load(entry))
+
+        self._release(entry.digest)
+        self._since_keyframe = self._count_since_keyframe()
+
+        return entry.generation, state
+
+    def resize(self, limit_bytes: int):
+        """
+        Change the limit of bytes, dropping the oldest states if needed.
+
+        Args:
+            limit_bytes (int): The new limit of bytes of the compressed blobs.
+
+        """
+        self.limit_bytes = limit_bytes
+
+        if limit_bytes <= 0:
+            self.clear()
+
+        self._evict()
+
+    def clear(self):
+        """Remove all the states."""
+        self._entries.clear()
+        self._blobs.clear()
+        self._references.clear()
+        self._last = None
+        self._since_keyframe = 0
+        self.size = 0
+
+    def _store(self, data: numpy.ndarray, bits: bool) -> bytes:
+        """Compress and store the data, if not already stored, return its digest."""
+        if bits:
+            data = numpy.packbits(data.ravel().astype(bool, copy=False))
+
+        raw = numpy.ascontiguousarray(data).tobytes()
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+
+        if digest not in self._blobs:
+            blob = zlib.compress(raw, 1)
+            self._blobs[digest] = blob
+            self.size += len(blob)
+
+        self._references[digest] += 1
+        return digest
+
+    def _release(self, digest: bytes):
+        """Forget a reference to a blob, delete it if no longer used."""
+        self._references[digest] -= 1
+
+        if self._references[digest] <= 0:
+            del self._references[digest]
+            self.size -= len(self._blobs.pop(digest))
+
+    def _load(self, entry: Entry) -> numpy.ndarray:
+        """Decompress the blob of the entry (full state or delta)."""
+        raw = bytearray(zlib.decompress(self._blobs[entry.digest]))
+
+        if entry.bits:
+            data = numpy.frombuffer(raw, dtype=numpy.uint8)
+            count = int(numpy.prod(entry.shape))
+            data = numpy.unpackbits(data, count=count).astype(entry.dtype)
+            return data.reshape(entry.shape)
+
+        return numpy.frombuffer(raw, dtype=entry.dtype).reshape(entry.shape)
+
+    def _decode(self, entry: Entry, previous: Optional[numpy.ndarray]) -> numpy.ndarray:
+        """Get the state of the entry, from the state of the previous entry."""
+        if entry.keyframe:
+            return self._load(entry)
+
+        return numpy.bitwise_xor(previous, self._load(entry))
+
+    def _rebuild_last(self) -> numpy.ndarray:
+        """Decode the last state from the last keyframe."""
+        index = len(self._entries) - 1
+
+        while not self._entries[index].keyframe:
+            index -= 1
+
+        state = None
+
+        for i in range(index, len(self._entries)):
+            state = self._decode(self._entries[i], state)
+
+        return state
+
+    def _count_since_keyframe(self) -> int:
+        """Number of deltas after the last keyframe."""
+        count = 0
+
+        for entry in reversed(self._entries):
+            if entry.keyframe:
+                break
+
+            count += 1
+
+        return count
+
+    def _evict(self):
+        """Drop the oldest states until the blobs fit in the budget."""
+        while self.size > self.limit_bytes and self._entries:
+            oldest = self._entries.popleft()
+
+            if self._entries and not self._entries[0].keyframe:
+                # The next state becomes the keyframe, packed only if the state is binary
+                # (the delta can be binary when the state isn't, bitpacked words)
+                following = self._entries[0]
+                delta = following.digest
+                state = self._decode(following, self._load(oldest))
+                bits = _is_binary(state)
+                following.digest = self._store(state, bits)
+                following.bits = bits
+                following.keyframe = True
+                self._release(delta)
+
+            self._release(oldest.digest)
+
+            if not self._entries:
+                self._last = None
+
+        self._since_keyframe = self._count_since_keyframe()
+        logging.debug(f"History: {len(self)} states, {self.size} bytes")
+
+
+def _is_binary(data: numpy.ndarray) -> bool:
+    """Check if the data only holds 0 and 1 (a grid of cells, or the XOR of two grids)."""
+    if data.dtype.kind not in "iub" or data.size == 0:
+        return False
+
+    return bool(data.min() >= 0 and data.max() <= 1)
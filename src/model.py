@@ -0,0 +1,615 @@
+import logging
+from pathlib import Path
+from typing import Callable, Tuple, Optional, Set
+
+import numpy
+
+from src.cycle import Cycle, CycleDetector, next_hash
+from src.engines import Engine, get_engine
+from src.history import History
+from src.recording import Recorder
+from src.rules import Rule
+
+
+class GridModel:
+    """
+    Grid model class that holds the grid state and the game logic.
+
+    Notes:
+        The grid is stored in the representation of the engine (the state),
+        'grid' unpacks it on demand for the view and the console.
+
+    Attributes:
+        grid (numpy.ndarray): The grid of the game.
+        shape (Tuple[int, int]): The shape of the grid.
+        state (numpy.ndarray): The grid in the representation of the engine.
+        memory_changes (Set[Tuple[int, int]]): The memory of the changes made.
+        memory_color (Optional[int]): The memory of the color to use.
+        generation (int): The number of generations computed since the grid was cleared.
+        stable (bool): Whether the last generation computed made no changes.
+        history (History): The history of the generations and their states (compressed).
+        limit_history (int): The limit of bytes of the history.
+        engine (Engine): The engine computing the next generations.
+        rule (Rule): The rule of the generations, applied by the engine.
+        state_hash (Optional[int]): The hash of the state, updated from the changed cells.
+        cycle_detector (CycleDetector): The detector of cycles from the hashes of the generations.
+        cycle (Optional[Cycle]): The cycle entered by the grid, if detected.
+        changed_cells (Optional[numpy.ndarray]): The mask of the cells changed since the
+            last call to 'consume_changes' (None if the whole grid must be drawn).
+        changed_box (Optional[Tuple[int, int, int, int]]): The bounding box of the changed
+            cells (start row, end row, start column, end column), None if none changed.
+        recorder (Optional[Recorder]): The recorder of the generations to a file, if any.
+
+    """
+
+    shape: Tuple[int, int]
+    state: numpy.ndarray
+    memory_changes: Set[Tuple[int, int]]
+    memory_color: Optional[int] = None
+
+    generation: int
+    stable: bool
+    history: History
+
+    engine: Engine
+
+    state_hash: Optional[int]
+    cycle_detector: CycleDetector
+    cycle: Optional[Cycle]
+
+    changed_cells: Optional[numpy.ndarray]
+    changed_box: Optional[Tuple[int, int, int, int]]
+    recorder: Optional[Recorder]
+
+    def __init__(
+        self,
+        shape: Tuple[int, int] = (16, 16),
+        limit_history: int = 64 * 2**20,
+        engine: str = "numpy",
+        max_period: int = 64,
+    ):
+        self.cycle_detector = CycleDetector(max_period=max_period)
+        self.changed_cells = None
+        self.changed_box = None
+        self.recorder = None
+        self._changes_buffer: Optional[numpy.ndarray] = None
+        self.engine = get_engine(engine)
+        self.grid = numpy.zeros(shape, dtype=int)
+
+        self.memory_changes = set()
+        self.memory_color = None
+
+        self.generation = 0
+        self.stable = False
+        self.history = History(limit_bytes=limit_history)
+
+    @property
+    def limit_history(self) -> int:
+        """The limit of bytes of the history."""
+        return self.history.limit_bytes
+
+    @limit_history.setter
+    def limit_history(self, limit_bytes: int):
+        self.history.resize(limit_bytes)
+
+    @property
+    def grid(self) -> numpy.ndarray:
+        """The grid of 0 and 1, decoded from the state of the engine."""
+        return self.engine.decode(self.state)
+
+    @grid.setter
+    def grid(self, grid: numpy.ndarray):
+        self.shape = grid.shape
+        self.state = self.engine.encode(grid)
+        self.changed_cells = None
+        self.reset_cycle()
+
+    def set_engine(self, name: str):
+        """
+        Change the engine, converting the state and the history to its representation.
+
+        Args:
+            name (str): The name of the engine.
+
+        Raises:
+            ValueError: If the engine can't apply the rule of the grid.
+
+        """
+        logging.info(f"Changing the engine to: {name}")
+        engine = get_engine(name)
+        engine.set_rule(self.rule)
+        history = History(limit_bytes=self.limit_history)
+
+        for generation, state in self.history:
+            history.append((generation, engine.encode(self.engine.decode(state))))
+
+        grid = self.grid
+        self.engine.close()
+        self.engine = engine
+        self.grid = grid
+        self.history = history
+
+    @property
+    def rule(self) -> Rule:
+        """The rule of the generations, applied by the engine."""
+        return self.engine.rule
+
+    def set_rule(self, rule: Rule):
+        """
+        Change the rule of the next generations, the cycle detected is forgotten.
+
+        Args:
+            rule (Rule): The new rule.
+
+        Raises:
+            ValueError: If the engine can't apply the rule (B0 on an unbounded engine).
+
+        """
+        logging.info(f"Changing the rule to: {rule}")
+        self.engine.set_rule(rule)
+
+        # A new state, so the generations computed ahead with the old rule are dropped
+        self.state = self.state.copy()
+        self.changed_cells = None
+        self.reset_cycle()
+
+    def toggle_cell(self, row: int, column: int):
+        """
+        Toggle the cell state at the given row and column.
+
+        Notes:
+            if memory_color is None, the color is set to the opposite of the current cell value.
+
+        Args:
+            row (int): The row of the cell.
+            column (int): The column of the cell.
+
+        """
+        if self.memory_color is None:
+            value = self.engine.get_cell(self.state, row, column)
+            self.memory_color = abs(value - 1)
+
+        self.state = self.engine.set_cell(self.state, row, column, self.memory_color)
+        self.memory_changes.add((row, column))
+        self.engine.mark_changed(row, column)
+
+        if self.changed_cells is not None:
+            self.changed_cells[row, column] = True
+            self._extend_changed_box(row, row + 1, column, column + 1)
+        self.reset_cycle()
+
+    def consume_changes(self) -> Optional[numpy.ndarray]:
+        """
+        Get the cells changed since the last call, and start tracking the changes again.
+
+        Notes:
+            The changes are only tracked after a first call, the headless simulations
+            don't pay for them. The same mask is kept between the calls: only the
+            bounding box of the changes is scanned and cleared, a frame without
+            changes costs nothing.
+
+        Returns:
+            Optional[numpy.ndarray]: The indexes (row, column) of the changed cells,
+                None if unknown (the state was replaced, the whole grid must be drawn).
+        """
+        changed_cells = self.changed_cells
+        box = self.changed_box
+        self.changed_box = None
+
+        if changed_cells is None:
+            self.changed_cells = self._clear_changes_buffer()
+            return None
+
+        if box is None:
+            return numpy.empty((0, 2), dtype=numpy.intp)
+
+        start_row, end_row, start_column, end_column = box
+        window = changed_cells[start_row:end_row, start_column:end_column]
+        indexes = numpy.argwhere(window)
+        indexes += (start_row, start_column)
+        window[:] = False
+
+        return indexes
+
+    def _clear_changes_buffer(self) -> numpy.ndarray:
+        """Get the mask of the changes cleared, reused while the shape doesn't change."""
+        buffer = self._changes_buffer
+
+        if buffer is None or buffer.shape != self.shape:
+            buffer = numpy.zeros(self.shape, dtype=bool)
+            self._changes_buffer = buffer
+        else:
+            buffer[:] = False
+
+        return buffer
+
+    def _extend_changed_box(
+        self, start_row: int, end_row: int, start_column: int, end_column: int
+    ):
+        """Extend the bounding box of the changed cells to hold the given box."""
+        if self.changed_box is not None:
+            box = self.changed_box
+            start_row, end_row = min(start_row, box[0]), max(end_row, box[1])
+            start_column = min(start_column, box[2])
+            end_column = max(end_column, box[3])
+
+        self.changed_box = (start_row, end_row, start_column, end_column)
+
+    def reset_memory(self):
+        """Reset the memory of the changes made."""
+        logging.info(f"Resetting memory: {len(self.memory_changes)} changes made")
+        self.memory_changes.clear()
+        self.memory_color = None
+
+    def is_valid_index(self, row: int, column: int):
+        """
+        Check if the row and column are valid indexes.
+
+        Args:
+            row (int): The row index.
+            column (int): The column index.
+
+        Returns:
+            bool: True if the indexes are valid, False otherwise
+        """
+        width, height = self.shape
+        conditions = (
+            0 <= row < width,
+            0 <= column < height,
+        )
+
+        return all(conditions)
+
+    def next_generation(self):
+        """
+        Generate the next generation of the grid.
+
+        Notes:
+            The state is only added to the history if the grid changed.
+            The hash of the state is updated from the changed cells, to detect cycles.
+
+        """
+        new_state = self.engine.step(self.state)
+        self.state_hash, self.stable = next_hash(self.state_hash, self.state, new_state)
+        self._apply_generation(new_state, record_cycle=True)
+
+    def push_generation(self, new_state: numpy.ndarray, state_hash: int, stable: bool):
+        """
+        Go to the next generation, computed outside of the model (by a worker).
+
+        Notes:
+            The states of a detected cycle are collected from the next states pushed,
+            instead of computed by the engine.
+
+        Args:
+            new_state (numpy.ndarray): The state of the next generation.
+            state_hash (int): The hash of the state of the next generation.
+            stable (bool): Whether the next generation made no changes.
+
+        """
+        self.engine.invalidate()
+        self.state_hash, self.stable = state_hash, stable
+        self._apply_generation(new_state, record_cycle=False)
+
+    def _apply_generation(self, new_state: numpy.ndarray, record_cycle: bool):
+        """
+        Replace the state by the state of the next generation (its hash is up to date).
+
+        Args:
+            new_state (numpy.ndarray): The state of the next generation.
+            record_cycle (bool): Whether to compute the states of a detected cycle at once
+                with the engine, else they are collected from the next states.
+
+        """
+        logging.debug(f"History: {len(self.history)}")
+        self._update_changes(new_state)
+
+        if self.stable:
+            logging.info("No changes were made, the grid is stable")
+        elif self.history.limit_bytes > 0:
+            self.history.append((self.generation, self.engine.detach(self.state)))
+
+        self.state = new_state
+        self.generation += 1
+
+        period = self.cycle_detector.observe(self.generation, self.state_hash)
+
+        if self._pending_cycle is not None:
+            self._collect_cycle()
+
+        elif period is not None and self.cycle is None:
+            start = self.generation - period
+            logging.info(f"Cycle detected: period {period} since generation {start}")
+
+            if record_cycle:
+                self.cycle = self._record_cycle(start, period)
+            else:
+                self._pending_cycle = Cycle(
+                    start=start,
+                    period=period,
+                    generation=self.generation,
+                    states=[self.state],
+                )
+                self._collect_cycle()
+
+        self._record()
+
+    def advance(
+        self,
+        generations: int,
+        callback: Optional[Callable[[int, int], None]] = None,
+        chunks: int = 100,
+    ):
+        """
+        Advance the grid by the given number of generations at once.
+
+        Notes:
+            If the grid entered a cycle, the state is taken from the cycle in O(1).
+            Else the engine decides how to jump, the 'hashlife' engine does it in roughly
+            logarithmic time, the others compute the generations one by one.
+            Only the starting state is added to the history.
+            With a callback, the generations are computed in chunks and the callback is
+            called after each one: if it raises (cancelled command), the grid stays at
+            the last chunk computed. The chunks don't change the grid, the engines give
+            the same cells whatever the number of generations of a jump.
+
+        Args:
+            generations (int): The number of generations to compute.
+            callback (Optional[Callable[[int, int], None]]): Called with the number of
+                generations done and the total, to report the progress.
+            chunks (int): The number of chunks, when a callback is given.
+
+        """
+        if generations <= 0:
+            return
+
+        logging.info(f"Advancing the grid by {generations} generations")
+        self.history.append((self.generation, self.engine.detach(self.state)))
+        cycle = self.cycle
+
+        try:
+            if cycle is not None:
+                self.state = cycle.state_at(self.generation + generations)
+                self.engine.invalidate()
+                self.generation += generations
+
+            elif callback is None:
+                self.state = self.engine.advance(self.state, generations)
+                self.generation += generations
+
+            else:
+                size = max(-(-generations // chunks), 1)
+                done = 0
+
+                while done < generations:
+                    chunk = min(size, generations - done)
+                    self.state = self.engine.advance(self.state, chunk)
+                    self.generation += chunk
+                    done += chunk
+                    callback(done, generations)
+
+        finally:
+            self.changed_cells = None
+            self.reset_cycle()
+            self.cycle = cycle
+            self._record()
+
+    def start_recording(self, path: Path, keyframe_interval: int = 64):
+        """
+        Record the generations to a file, from the current one (stops the last recording).
+
+        Notes:
+            Unlike the history, the recording isn't limited in memory, the whole run
+            can be replayed from the file.
+
+        Args:
+            path (Path): The path of the file.
+            keyframe_interval (int): The number of generations between two keyframes.
+
+        """
+        self.stop_recording()
+        self.recorder = Recorder(
+            path, keyframe_interval=keyframe_interval, rule=str(self.rule)
+        )
+        self._record()
+
+    def stop_recording(self) -> Optional[Recorder]:
+        """
+        Stop the recording of the generations, if any.
+
+        Returns:
+            Optional[Recorder]: The recorder stopped, None if not recording.
+        """
+        recorder, self.recorder = self.recorder, None
+
+        if recorder is not None:
+            recorder.close()
+
+        return recorder
+
+    def _record(self):
+        """Add the current generation to the recording, if recording."""
+        if self.recorder is None:
+            return
+
+        if self.recorder.error is not None:
+            logging.error(f"Recording stopped by an error: {self.recorder.error}")
+            self.stop_recording()
+            return
+
+        # Decoded here: the state can be edited in place or reused by the engine, and
+        # the decoding depends on the window of the engine (pan)
+        self.recorder.record(self.generation, self.grid)
+
+    def reset_cycle(self):
+        """Forget the hash of the state and the cycle, the grid was changed."""
+        self.state_hash = None
+        self.cycle = None
+        self._pending_cycle = None
+        self.cycle_detector.clear()
+
+    def _update_changes(self, new_state: numpy.ndarray):
+        """
+        Add the cells changed by the new state to the tracked changes.
+
+        Args:
+            new_state (numpy.ndarray): The state of the next generation.
+
+        """
+        if self.changed_cells is None or self.stable:
+            return
+
+        changed_cells = self.engine.changed_cells(self.state, new_state)
+
+        if changed_cells is None or changed_cells.shape != self.shape:
+            self.changed_cells = None
+            return
+
+        # Only the bounding box of the changes is merged in the mask
+        rows = numpy.flatnonzero(changed_cells.any(axis=1))
+
+        if len(rows) == 0:
+            return
+
+        columns = numpy.flatnonzero(changed_cells.any(axis=0))
+        start_row, end_row = int(rows[0]), int(rows[-1]) + 1
+        start_column, end_column = int(columns[0]), int(columns[-1]) + 1
+        window = (slice(start_row, end_row), slice(start_column, end_column))
+        self.changed_cells[window] |= changed_cells[window]
+        self._extend_changed_box(start_row, end_row, start_column, end_column)
+
+    def _collect_cycle(self):
+        """Add the state to the cycle being collected, until it holds one period."""
+        cycle = self._pending_cycle
+
+        if cycle.states[-1] is not self.state:
+            cycle.states.append(self.state)
+
+        if len(cycle.states) == cycle.period:
+            self.cycle = cycle
+            self._pending_cycle = None
+
+    def _record_cycle(self, start: int, period: int) -> Cycle:
+        """
+        Record the states of the cycle, computing one period from the current state.
+
+        Args:
+            start (int): The first generation of the cycle.
+            period (int): The number of generations of the cycle.
+
+        Returns:
+            Cycle: The cycle, with one state per generation of the period.
+        """
+        # The engine can reuse the memory of the states it computed, the cycle keeps copies
+        self.state = self.engine.detach(self.state)
+        states = [self.state]
+
+        for _ in range(period - 1):
+            states.append(self.engine.detach(self.engine.step(states[-1])))
+
+        # The engine computed generations that are not the current state
+        self.engine.invalidate()
+
+        return Cycle(
+            start=start, period=period, generation=self.generation, states=states
+        )
+
+    def previous_generation(self):
+        """Go back to the last generation of the history, if any."""
+        if len(self.history) != 0:
+            self.generation, self.state = self.history.pop()
+            self.engine.invalidate()
+            self.changed_cells = None
+            self.reset_cycle()
+
+    def pan(self, rows: int, columns: int):
+        """
+        Move the grid over the universe, only with an unbounded engine.
+
+        Args:
+            rows (int): The number of rows to move by.
+            columns (int): The number of columns to move by.
+
+        """
+        if not self.engine.unbounded:
+            logging.info(f"The engine '{self.engine.name}' is bounded, can't move")
+            return
+
+        x, y = self.engine.offset
+        self.engine.offset = (x + rows, y + columns)
+        self.changed_cells = None
+
+    def clear_grid(self):
+        """Clear the grid of all live cells."""
+        logging.info("Clearing the grid")
+        self.grid = numpy.zeros(self.shape, dtype=int)
+        self.generation = 0
+        self.memory_changes.clear()
+        self.memory_color = None
+
+    def load(self, grid: numpy.ndarray, generation: int = 0):
+        """
+        Replace the grid by a loaded one, the history of the old grid is cleared.
+
+        Args:
+            grid (numpy.ndarray): The new grid of 0 and 1.
+            generation (int): The generation of the new grid.
+
+        """
+        logging.info(f"Loading a grid of: {grid.shape[0]} x {grid.shape[1]}")
+        self.grid = grid
+        self._clear_loaded(generation)
+
+    def load_packed(self, words: numpy.ndarray, height: int, generation: int = 0):
+        """
+        Replace the grid by rows loaded packed (snapshot), the history of the old grid is cleared.
+
+        Notes:
+            The engines keeping packed rows ('bitpacked') take the words without
+            unpacking them, the others unpack them.
+
+        Args:
+            words (numpy.ndarray): The packed rows, 64 cells per word (little endian
+                bit order).
+            height (int): The number of columns of the grid.
+            generation (int): The generation of the new grid.
+
+        """
+        logging.info(f"Loading a packed grid of: {len(words)} x {height}")
+        self.shape = (len(words), height)
+        self.state = self.engine.encode_packed(words, height)
+        self.changed_cells = None
+        self.reset_cycle()
+        self._clear_loaded(generation)
+
+    def _clear_loaded(self, generation: int):
+        """Forget the history and the edits of the old grid, a new one was loaded."""
+        self.generation = generation
+        self.history.clear()
+        self.memory_changes.clear()
+        self.memory_color = None
+
+    def reshape(self, width: int, height: int):
+        """
+        Reshape the grid to the given width and height.
+
+        Notes:
+            With an unbounded engine, only the window changes, the cells are kept.
+
+        Args:
+            width (int): The new width.
+            height (int): The new height.
+
+        """
+        logging.info(f"Reshaping the grid to: {width} x {height}")
+
+        if self.engine.unbounded:
+            self.shape = self.engine.shape = (width, height)
+            self.changed_cells = None
+            return
+
+        self.grid = numpy.zeros((width, height), dtype=int)
+        self.generation = 0
+        self.history.clear()
+        self.memory_changes.clear()
+        self.memory_color = None
@@ -0,0 +1,465 @@
+import logging
+import re
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, TextIO, Tuple
+
+import numpy
+
+from src.rules import DEFAULT_RULE
+
+# Longest lines written in the RLE files (recommended by the format)
+RLE_LINE_LENGTH = 70
+
+RLE_HEADER = re.compile(
+    r"x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?", re.I
+)
+RLE_COMMENT = re.compile(r"^#.*$", re.M)
+
+# Number of characters of RLE decoded at once
+RLE_CHUNK_SIZE = 2**20
+
+
+@dataclass
+class Pattern:
+    """
+    Pattern read from a file, its cells and its rule.
+
+    Notes:
+        The cells follow the grid: the first axis is the x coordinate of the pattern
+        (horizontal, left to right), the second axis is its y coordinate (top to bottom).
+
+    Attributes:
+        cells (numpy.ndarray): The cells of the pattern (0 and 1).
+        rule (str): The rule of the pattern, in the B/S notation.
+    """
+
+    cells: numpy.ndarray
+    rule: str = DEFAULT_RULE
+
+
+def load_pattern(path: Path) -> Pattern:
+    """
+    Read a pattern file, the format is given by its extension.
+
+    Args:
+        path (Path): The path of the file ('.rle', '.lif', '.life' or '.cells').
+
+    Raises:
+        ValueError: If the format isn't supported, or the file is invalid.
+
+    Returns:
+        Pattern: The pattern read.
+    """
+    read, _ = _get_format(path)
+
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        pattern = read(file)
+
+    logging.info(f"Pattern loaded from '{path}': {pattern.cells.shape}")
+    return pattern
+
+
+def save_pattern(path: Path, grid: numpy.ndarray, rule: str = DEFAULT_RULE):
+    """
+    Write the live cells of a grid to a pattern file, the format is given by its extension.
+
+    Args:
+        path (Path): The path of the file ('.rle', '.lif', '.life' or '.cells').
+        grid (numpy.ndarray): The grid of 0 and 1.
+        rule (str): The rule of the pattern, in the B/S notation.
+
+    Raises:
+        ValueError: If the format isn't supported.
+
+    """
+    _, write = _get_format(path)
+
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        write(file, grid, rule)
+
+    logging.info(f"Pattern saved to '{path}'")
+
+
+def place(cells: numpy.ndarray, shape: Tuple[int, int]) -> numpy.ndarray:
+    """
+    Place the cells of a pattern at the center of a grid, enlarged to fit the pattern.
+
+    Args:
+        cells (numpy.ndarray): The cells of the pattern.
+        shape (Tuple[int, int]): The shape of the grid.
+
+    Returns:
+        numpy.ndarray: The grid with the pattern.
+    """
+    width, height = max(shape[0], cells.shape[0]), max(shape[1], cells.shape[1])
+    x, y = (width - cells.shape[0]) // 2, (height - cells.shape[1]) // 2
+
+    grid = numpy.zeros((width, height), dtype=numpy.uint8)
+    grid[x : x + cells.shape[0], y : y + cells.shape[1]] = cells
+    return grid
+
+
+def read_rle(file: TextIO) -> Pattern:
+    """
+    Read a pattern in the RLE format, by chunks of text.
+
+    Notes:
+        The grid is allocated from the size of the header, the runs of each chunk are
+        decoded and written in the grid with NumPy (no Python object per run or cell).
+
+    Args:
+        file (TextIO): The file to read.
+
+    Raises:
+        ValueError: If the header is missing, or the runs are outside the pattern.
+
+    Returns:
+        Pattern: The pattern read.
+    """
+    cells, rule = None, DEFAULT_RULE
+
+    for line in iter(file.readline, ""):
+        line = line.strip()
+
+        if not line or line.startswith("#"):
+            continue
+
+        match = RLE_HEADER.match(line)
+
+        if match is None:
+            raise ValueError(f"Invalid RLE header: '{line[:80]}'")
+
+        cells = numpy.zeros((int(match[1]), int(match[2])), dtype=numpy.uint8)
+        rule = match[3] or DEFAULT_RULE
+        break
+
+    if cells is None:
+        raise ValueError("Invalid RLE file: no header")
+
+    x, y, rest = 0, 0, numpy.zeros(0, dtype=numpy.uint8)
+
+    while True:
+        # Whole lines, to remove the comments
+        text = file.read(RLE_CHUNK_SIZE)
+        text += file.readline()
+
+        if not text:
+            break
+
+        text = RLE_COMMENT.sub("", text)
+        data = numpy.frombuffer(text.encode("ascii", "replace"), dtype=numpy.uint8)
+        data = numpy.concatenate((rest, data[data > ord(" ")]))
+
+        ends = numpy.flatnonzero(data == ord("!"))
+
+        if len(ends):
+            _write_runs(cells, data[: ends[0]], x, y)
+            break
+
+        # A number at the end of the chunk counts the first tag of the next chunk
+        tags = numpy.flatnonzero((data < ord("0")) | (data > ord("9")))
+        end = tags[-1] + 1 if len(tags) else 0
+        data, rest = data[:end], data[end:]
+        x, y = _write_runs(cells, data, x, y)
+
+    return Pattern(cells=cells, rule=rule)
+
+
+def write_rle(file: TextIO, grid: numpy.ndarray, rule: str = DEFAULT_RULE):
+    """
+    Write the live cells of a grid in the RLE format, row by row.
+
+    Notes:
+        Only the bounding box of the live cells is written, the runs of each row
+        are found with NumPy.
+
+    Args:
+        file (TextIO): The file to write to.
+        grid (numpy.ndarray): The grid of 0 and 1.
+        rule (str): The rule of the pattern, in the B/S notation.
+
+    """
+    cells = _bounding_box(grid)
+    width, height = cells.shape
+    file.write(f"x = {width}, y = {height}, rule = {rule}\n")
+
+    # Number of ends of rows not written yet (the empty rows are merged)
+    line, empty_rows = "", 0
+
+    for y in range(height):
+        starts, lengths, values = _runs(cells[:, y])
+
+        # The dead cells at the end of a row are implicit
+        if len(values) and values[-1] == 0:
+            starts, lengths, values = starts[:-1], lengths[:-1], values[:-1]
+
+        if len(values) == 0:
+            empty_rows += 1
+            continue
+
+        tokens = [_rle_token(empty_rows, "$")] if empty_rows else []
+        tokens += [
+            _rle_token(length, "o" if value else "b")
+            for length, value in zip(lengths.tolist(), values.tolist())
+        ]
+        empty_rows = 1
+
+        for token in tokens:
+            if len(line) + len(token) > RLE_LINE_LENGTH:
+                file.write(line + "\n")
+                line = ""
+
+            line += token
+
+    file.write(line + "!\n")
+
+
+def read_life_106(file: TextIO) -> Pattern:
+    """
+    Read a pattern in the Life 1.06 format, the coordinates of the live cells.
+
+    Notes:
+        The coordinates are parsed by NumPy, the pattern is the bounding box of the cells.
+        The rule is read from the comment '#R' of the header, if any.
+
+    Args:
+        file (TextIO): The file to read.
+
+    Returns:
+        Pattern: The pattern read.
+    """
+    rule = DEFAULT_RULE
+    position = file.tell()
+    line = file.readline()
+
+    # The comments of the header, the coordinates are read from the first other line
+    while line.startswith("#"):
+        if line.startswith("#R"):
+            rule = line[2:].strip() or DEFAULT_RULE
+
+        position = file.tell()
+        line = file.readline()
+
+    file.seek(position)
+
+    with warnings.catch_warnings():
+        # An empty pattern holds no coordinates
+        warnings.simplefilter("ignore", UserWarning)
+        coordinates = numpy.loadtxt(file, dtype=numpy.int64, comments="#", ndmin=2)
+
+    if coordinates.size == 0:
+        return Pattern(cells=numpy.zeros((0, 0), dtype=numpy.uint8), rule=rule)
+
+    coordinates -= coordinates.min(axis=0)
+    shape = tuple((coordinates.max(axis=0) + 1).tolist())
+
+    cells = numpy.zeros(shape, dtype=numpy.uint8)
+    cells[coordinates[:, 0], coordinates[:, 1]] = 1
+    return Pattern(cells=cells, rule=rule)
+
+
+def write_life_106(file: TextIO, grid: numpy.ndarray, rule: str = DEFAULT_RULE):
+    """
+    Write the live cells of a grid in the Life 1.06 format, the coordinates of the cells.
+
+    Notes:
+        The format has no rule, a rule other than the Game of Life is written as a comment.
+
+    Args:
+        file (TextIO): The file to write to.
+        grid (numpy.ndarray): The grid of 0 and 1.
+        rule (str): The rule of the pattern, in the B/S notation.
+
+    """
+    file.write("#Life 1.06\n")
+
+    if rule != DEFAULT_RULE:
+        file.write(f"#R {rule}\n")
+
+    numpy.savetxt(file, numpy.argwhere(grid), fmt="%d")
+
+
+def read_plaintext(file: TextIO) -> Pattern:
+    """
+    Read a pattern in the plaintext format ('.cells'), one line per row of cells.
+
+    Notes:
+        The rule is read from the comment '!Rule:', if any.
+
+    Args:
+        file (TextIO): The file to read.
+
+    Returns:
+        Pattern: The pattern read.
+    """
+    rows, rule = [], DEFAULT_RULE
+
+    for line in file:
+        if line.startswith("!Rule:"):
+            rule = line[len("!Rule:") :].strip() or DEFAULT_RULE
+
+        if line.startswith("!"):
+            continue
+
+        row = numpy.frombuffer(line.rstrip("\r\n").encode("ascii", "replace"), "S1")
+        rows.append(numpy.flatnonzero((row == b"O") | (row == b"*")))
+
+    width = max((row[-1] + 1 for row in rows if len(row)), default=0)
+    cells = numpy.zeros((width, len(rows)), dtype=numpy.uint8)
+
+    for y, row in enumerate(rows):
+        cells[row, y] = 1
+
+    return Pattern(cells=cells, rule=rule)
+
+
+def write_plaintext(file: TextIO, grid: numpy.ndarray, rule: str = DEFAULT_RULE):
+    """
+    Write the live cells of a grid in the plaintext format ('.cells'), row by row.
+
+    Args:
+        file (TextIO): The file to write to.
+        grid (numpy.ndarray): The grid of 0 and 1.
+        rule (str): The rule of the pattern, in the B/S notation.
+
+    """
+    if rule != DEFAULT_RULE:
+        file.write(f"!Rule: {rule}\n")
+
+    cells = _bounding_box(grid)
+    characters = numpy.frombuffer(b".O", dtype=numpy.uint8)
+
+    for y in range(cells.shape[1]):
+        file.write(characters[cells[:, y]].tobytes().decode("ascii") + "\n")
+
+
+FORMATS: Dict[
+    str,
+    Tuple[Callable[[TextIO], Pattern], Callable[[TextIO, numpy.ndarray, str], None]],
+] = {
+    ".rle": (read_rle, write_rle),
+    ".lif": (read_life_106, write_life_106),
+    ".life": (read_life_106, write_life_106),
+    ".cells": (read_plaintext, write_plaintext),
+}
+
+
+def _get_format(path: Path):
+    """Get the reader and the writer of the format of a file, from its extension."""
+    extension = Path(path).suffix.lower()
+
+    if extension not in FORMATS:
+        raise ValueError(
+            f"Unknown pattern format: '{extension}', available: {', '.join(FORMATS)}"
+        )
+
+    return FORMATS[extension]
+
+
+def _rle_token(count: int, tag: str) -> str:
+    """Get the token of a run, the count is implicit for one cell."""
+    return f"{count}{tag}" if count > 1 else tag
+
+
+def _runs(
+    values: numpy.ndarray,
+) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """
+    Get the runs of equal values of an array.
+
+    Args:
+        values (numpy.ndarray): The array of values.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: The start, the length
+            and the value of each run.
+    """
+    if len(values) == 0:
+        empty = numpy.zeros(0, dtype=numpy.int64)
+        return empty, empty, values
+
+    starts = numpy.concatenate(([0], numpy.flatnonzero(numpy.diff(values)) + 1))
+    lengths = numpy.diff(numpy.append(starts, len(values)))
+    return starts, lengths, values[starts]
+
+
+def _bounding_box(grid: numpy.ndarray) -> numpy.ndarray:
+    """Get the smallest part of the grid holding all the live cells (0 and 1)."""
+    rows = numpy.flatnonzero(grid.any(axis=1))
+    columns = numpy.flatnonzero(grid.any(axis=0))
+
+    if len(rows) == 0:
+        return numpy.zeros((0, 0), dtype=numpy.uint8)
+
+    cells = grid[rows[0] : rows[-1] + 1, columns[0] : columns[-1] + 1]
+    return (cells != 0).astype(numpy.uint8)
+
+
+def _write_runs(
+    cells: numpy.ndarray, data: numpy.ndarray, x: int, y: int
+) -> Tuple[int, int]:
+    """
+    Decode the runs of a RLE chunk and write its live cells in the pattern.
+
+    Args:
+        cells (numpy.ndarray): The cells of the pattern.
+        data (numpy.ndarray): The characters of the chunk (without spaces), ending by a tag.
+        x (int): The x coordinate of the first run of the chunk.
+        y (int): The y coordinate of the first run of the chunk.
+
+    Raises:
+        ValueError: If the runs are outside the pattern.
+
+    Returns:
+        Tuple[int, int]: The x and y coordinates after the last run of the chunk.
+    """
+    is_digit = (data >= ord("0")) & (data <= ord("9"))
+    positions = numpy.flatnonzero(~is_digit)
+
+    if len(positions) == 0:
+        return x, y
+
+    # The count of each tag is the number written before it (1 if none)
+    tags = data[positions]
+    digits = numpy.flatnonzero(is_digit)
+    token = numpy.searchsorted(positions, digits)
+    values = (data[digits] - ord("0")) * 10.0 ** (positions[token] - digits - 1)
+    counts = numpy.bincount(token, weights=values, minlength=len(tags))
+    counts = numpy.where(numpy.bincount(token, minlength=len(tags)) > 0, counts, 1)
+    counts = counts.astype(numpy.int64)
+
+    # The ends of rows move down, the other tags move right (from the start of the row)
+    newline = tags == ord("$")
+    moves = numpy.where(newline, counts, 0)
+    advance = numpy.where(newline, 0, counts)
+    before = numpy.cumsum(advance) - advance
+    row_start = numpy.maximum.accumulate(numpy.where(newline, before, 0))
+    first_row = numpy.cumsum(newline) == 0
+
+    token_x = before - row_start + numpy.where(first_row, x, 0)
+    token_y = y + numpy.cumsum(moves) - moves
+
+    live = ~newline & (tags != ord("b")) & (tags != ord("."))
+    starts, lengths, rows = token_x[live], counts[live], token_y[live]
+
+    if len(starts):
+        width, height = cells.shape
+
+        if (starts + lengths > width).any() or (rows >= height).any():
+            raise ValueError("Invalid RLE file: runs outside of the pattern")
+
+        # The cells of all the runs at once
+        offsets = numpy.arange(lengths.sum()) - numpy.repeat(
+            numpy.cumsum(lengths) - lengths, lengths
+        )
+        cells[numpy.repeat(starts, lengths) + offsets, numpy.repeat(rows, lengths)] = 1
+
+    if newline.any():
+        last_newline = numpy.flatnonzero(newline)[-1]
+        x = int(before[-1] + advance[-1] - before[last_newline])
+    else:
+        x += int(before[-1] + advance[-1])
+
+    return x, int(y + moves.sum())
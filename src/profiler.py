@@ -0,0 +1,183 @@
+import csv
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Tuple
+
+import numpy
+
+# Phases of a frame of the main loop, in the order they are run
+PHASES = ("events", "update", "grid", "console", "overlay", "display")
+
+# Timings kept for each frame: the phases, the whole work and the time since the last frame
+COLUMNS = (*PHASES, "total", "interval")
+
+
+class FrameProfiler:
+    """
+    Profiler of the phases of the frames, kept in a ring buffer for rolling statistics.
+
+    Notes:
+        Each phase is timed from the end of the previous one ('lap'), so the timers cost
+        one call to the clock per phase. When disabled, the calls return at once.
+        A frame is dropped when its work takes longer than the time of a frame at the
+        limit of frames per second.
+
+    Attributes:
+        enabled (bool): Whether the frames are timed.
+        capacity (int): The number of frames kept for the statistics.
+        frames (int): The number of frames timed since the start (or the last clear).
+        csv_path (Optional[Path]): The CSV file the timings are streamed to, if any.
+    """
+
+    enabled: bool
+    capacity: int
+    frames: int
+    csv_path: Optional[Path]
+
+    def __init__(self, capacity: int = 600, enabled: bool = False):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.frames = 0
+        self.csv_path = None
+
+        self._times = numpy.zeros((capacity, len(COLUMNS)))
+        self._dropped = numpy.zeros(capacity, dtype=bool)
+        self._row = numpy.zeros(len(COLUMNS))
+        self._index = {phase: i for i, phase in enumerate(PHASES)}
+        self._start: Optional[float] = None
+        self._last = 0.0
+        self._csv_file: Optional[TextIO] = None
+        self._csv_writer = None
+
+    def start_frame(self):
+        """Start timing a frame."""
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        self._row[:] = 0
+        self._row[-1] = 0.0 if self._start is None else now - self._start
+        self._start = self._last = now
+
+    def lap(self, phase: str):
+        """
+        End the phase running since the last lap (or the start of the frame).
+
+        Args:
+            phase (str): The name of the phase, in 'PHASES'.
+
+        """
+        if not self.enabled or self._start is None:
+            return
+
+        now = time.perf_counter()
+        self._row[self._index[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self, limit_fps: int):
+        """
+        End the frame, add its timings to the statistics (and the CSV file).
+
+        Args:
+            limit_fps (int): The limit of frames per second, to detect a dropped frame.
+
+        """
+        if not self.enabled or self._start is None:
+            return
+
+        self._row[-2] = self._last - self._start
+        dropped = self._row[-2] > 1 / max(limit_fps, 1)
+
+        index = self.frames % self.capacity
+        self._times[index] = self._row
+        self._dropped[index] = dropped
+        self.frames += 1
+
+        if self._csv_writer is not None:
+            milliseconds = (f"{value * 1000:.3f}" for value in self._row)
+            self._csv_writer.writerow([self.frames, *milliseconds, int(dropped)])
+
+    def stats(self) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Get the statistics of the timings of the frames kept.
+
+        Returns:
+            Dict[str, Tuple[float, float, float]]: The median, the 95th percentile and
+                the maximum of each column, in milliseconds (empty if no frames).
+        """
+        times = self._times[: min(self.frames, self.capacity)] * 1000
+
+        if len(times) == 0:
+            return {}
+
+        p50, p95 = numpy.percentile(times, (50, 95), axis=0)
+        maximum = times.max(axis=0)
+
+        return {
+            column: (p50[i], p95[i], maximum[i]) for i, column in enumerate(COLUMNS)
+        }
+
+    @property
+    def dropped(self) -> int:
+        """The number of dropped frames among the frames kept."""
+        return int(self._dropped[: min(self.frames, self.capacity)].sum())
+
+    def lines(self, limit_fps: int) -> List[str]:
+        """
+        Format the statistics as lines of text (overlay and console).
+
+        Args:
+            limit_fps (int): The limit of frames per second.
+
+        Returns:
+            List[str]: The lines of the table of the statistics.
+        """
+        stats = self.stats()
+
+        if not stats:
+            return ["No frames timed"]
+
+        lines = [f"{'phase':<9}{'p50':>8}{'p95':>8}{'max':>8}  (ms)"]
+
+        for column, (p50, p95, maximum) in stats.items():
+            lines.append(f"{column:<9}{p50:>8.2f}{p95:>8.2f}{maximum:>8.2f}")
+
+        kept = min(self.frames, self.capacity)
+        interval = stats["interval"][0]
+        fps = 1000 / interval if interval else 0.0
+        lines.append(f"fps: {fps:.1f}/{limit_fps}, dropped: {self.dropped}/{kept}")
+
+        return lines
+
+    def clear(self):
+        """Forget the frames timed."""
+        self.frames = 0
+        self._start = None
+        self._dropped[:] = False
+
+    def start_csv(self, path: Path):
+        """
+        Stream the timings of the next frames to a CSV file (in milliseconds).
+
+        Args:
+            path (Path): The path of the CSV file.
+
+        """
+        self.stop_csv()
+        self._csv_file = open(path, "w", newline="")
+        self._csv_writer = csv.writer(self._csv_file)
+        self._csv_writer.writerow(["frame", *COLUMNS, "dropped"])
+        self.csv_path = Path(path)
+        self.enabled = True
+        logging.info(f"Streaming the frame timings to: '{path}'")
+
+    def stop_csv(self):
+        """Stop streaming the timings to the CSV file, if any."""
+        if self._csv_file is None:
+            return
+
+        self._csv_file.close()
+        self._csv_file = self._csv_writer = None
+        logging.info(f"Frame timings written to: '{self.csv_path}'")
+        self.csv_path = None
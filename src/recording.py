@@ -0,0 +1,386 @@
+import atexit
+import logging
+import queue
+import threading
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import numpy
+
+from src.rules import DEFAULT_RULE
+
+MAGIC = b"LIFERECO"
+INDEX_MAGIC = b"LIFEINDX"
+VERSION = 2
+
+# Header of the recording files, with the rule of the run
+HEADER = numpy.dtype(
+    [("magic", "S8"), ("version", "<u4"), ("reserved", "V4"), ("rule", "S32")]
+)
+
+# Header of each generation recorded, followed by its compressed cells
+RECORD = numpy.dtype(
+    [
+        ("keyframe", "u1"),
+        ("width", "<u4"),
+        ("height", "<u4"),
+        ("generation", "<u8"),
+        ("length", "<u8"),
+    ]
+)
+
+# Index of the keyframes, written at the end of the file when the recording is closed
+INDEX = numpy.dtype([("generation", "<u8"), ("offset", "<u8")])
+TRAILER = numpy.dtype([("count", "<u8"), ("offset", "<u8"), ("magic", "S8")])
+
+
+class Recorder:
+    """
+    Recorder of the generations of a run to a file, written by a background thread.
+
+    Notes:
+        The file is append-only: each generation is stored as the XOR with the previous
+        one, packed 8 cells per byte and compressed (mostly zeros, so it compresses well),
+        with a full grid (keyframe) at regular intervals. A keyframe is also written when
+        the shape changes or the generation goes back (undo, load).
+        The index of the keyframes is written at the end when the recording is closed.
+        The grids are copied when recorded, the thread packs, compresses and writes them
+        (zlib releases the GIL); recording only waits if the queue of the thread is full.
+
+    Attributes:
+        path (Path): The path of the file.
+        keyframe_interval (int): The number of generations between two keyframes.
+        rule (str): The rule of the run at the start of the recording, in the B/S notation.
+        count (int): The number of generations recorded.
+        error (Optional[BaseException]): The error that stopped the writer, if any.
+    """
+
+    path: Path
+    keyframe_interval: int
+    rule: str
+    count: int
+    error: Optional[BaseException]
+
+    def __init__(
+        self,
+        path: Path,
+        keyframe_interval: int = 64,
+        capacity: int = 64,
+        rule: str = DEFAULT_RULE,
+    ):
+        # The header would silently truncate the rule
+        if len(rule) > HEADER["rule"].itemsize:
+            raise ValueError(
+                f"The rule '{rule}' is too long for a recording (32 characters)"
+            )
+
+        self.path = Path(path)
+        self.keyframe_interval = keyframe_interval
+        self.rule = rule
+        self.count = 0
+        self.error = None
+
+        self._file = open(path, "wb")
+        self._queue: queue.Queue = queue.Queue(maxsize=capacity)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="recording-writer", daemon=True
+        )
+        self._thread.start()
+
+        # The generations queued are written even if the application quits
+        atexit.register(self.close)
+        logging.info(f"Recording started: '{self.path}'")
+
+    def record(self, generation: int, grid: numpy.ndarray):
+        """
+        Add a generation at the end of the recording.
+
+        Args:
+            generation (int): The generation of the grid.
+            grid (numpy.ndarray): The grid of 0 and 1 (copied).
+
+        """
+        if self._closed:
+            raise ValueError("The recording is closed")
+
+        self._queue.put((generation, numpy.array(grid, dtype=bool)))
+        self.count += 1
+
+    def close(self):
+        """Write the generations queued and the index, then close the file."""
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+        logging.info(f"Recording stopped: '{self.path}' ({self.count} generations)")
+
+    def _run(self):
+        """Write the generations queued until closed, then the index of the keyframes."""
+        index = []
+        previous, last_generation = None, None
+        since_keyframe = 0
+
+        try:
+            header = numpy.zeros(1, dtype=HEADER)
+            header["magic"], header["version"] = MAGIC, VERSION
+            header["rule"] = self.rule.encode("ascii")
+            self._file.write(header.tobytes())
+
+            while (item := self._queue.get()) is not None:
+                generation, grid = item
+                keyframe = previous is None or previous.shape != grid.shape
+                keyframe = keyframe or since_keyframe >= self.keyframe_interval
+                keyframe = keyframe or generation <= last_generation
+
+                if keyframe:
+                    index.append((generation, self._file.tell()))
+                    since_keyframe = 0
+                    data = grid
+                else:
+                    since_keyframe += 1
+                    data = grid ^ previous
+
+                blob = zlib.compress(numpy.packbits(data).tobytes(), 1)
+                record = numpy.zeros(1, dtype=RECORD)
+                record["keyframe"] = keyframe
+                record["width"], record["height"] = grid.shape
+                record["generation"], record["length"] = generation, len(blob)
+                self._file.write(record.tobytes())
+                self._file.write(blob)
+
+                previous, last_generation = grid, generation
+
+            trailer = numpy.zeros(1, dtype=TRAILER)
+            trailer["count"], trailer["offset"] = len(index), self._file.tell()
+            trailer["magic"] = INDEX_MAGIC
+            self._file.write(numpy.array(index, dtype=INDEX).tobytes())
+            self._file.write(trailer.tobytes())
+
+        except Exception as error:
+            logging.exception("The recording writer stopped")
+            self.error = error
+
+            # Don't block the recording while it isn't closed
+            while self._queue.get() is not None:
+                pass
+
+        finally:
+            self._file.close()
+
+
+class Recording:
+    """
+    Recording of a run opened for replay, any generation is reached from its keyframe.
+
+    Notes:
+        The index of the keyframes is read from the end of the file, or rebuilt by reading
+        the headers of the generations if the recording wasn't closed (a generation not
+        fully written is ignored).
+        When the recording went back in time (undo, load), the latest run through the
+        generation asked is replayed: a run that stopped before it is skipped for an
+        earlier one.
+
+    Attributes:
+        path (Path): The path of the file.
+        rule (str): The rule of the run, in the B/S notation.
+        keyframes (List[Tuple[int, int]]): The generations of the keyframes and their
+            offset in the file, in the order of the file.
+    """
+
+    path: Path
+    rule: str
+    keyframes: List[Tuple[int, int]]
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file: BinaryIO = open(path, "rb")
+
+        try:
+            header = numpy.frombuffer(self._file.read(HEADER.itemsize), dtype=HEADER)
+
+            if len(header) == 0 or header["magic"][0] != MAGIC:
+                raise ValueError(f"Not a recording file: '{path}'")
+
+            if header["version"][0] != VERSION:
+                raise ValueError(
+                    f"Unsupported recording version: {header['version'][0]}"
+                )
+
+            self.rule = header["rule"][0].decode("ascii") or DEFAULT_RULE
+
+            self.keyframes, self._end = self._read_index() or self._scan()
+            self._stops: Dict[int, int] = {}
+
+        except Exception:
+            self._file.close()
+            raise
+
+    @property
+    def first_generation(self) -> Optional[int]:
+        """The first generation recorded, None if the recording is empty."""
+        return self.keyframes[0][0] if self.keyframes else None
+
+    @property
+    def last_generation(self) -> Optional[int]:
+        """The last generation recorded, None if the recording is empty."""
+        if not self.keyframes:
+            return None
+
+        *_, (record, _) = self._records(self.keyframes[-1][1])
+        return int(record["generation"])
+
+    def __iter__(self) -> Iterator[Tuple[int, numpy.ndarray]]:
+        """Iterate over the generations recorded and their grids, in the order of the file."""
+        grid = None
+
+        for record, offset in self._records(HEADER.itemsize):
+            grid = self._decode(record, offset, grid)
+            yield int(record["generation"]), grid.astype(numpy.uint8)
+
+    def seek(self, generation: int) -> Tuple[int, numpy.ndarray]:
+        """
+        Get the grid of a generation, from the nearest keyframe before it.
+
+        Notes:
+            The keyframe is the latest one whose run reached the generation. If no run
+            reached it, the latest keyframe before it is used (the end of its run).
+
+        Args:
+            generation (int): The generation to reach.
+
+        Raises:
+            ValueError: If the generation is before the recording.
+
+        Returns:
+            Tuple[int, numpy.ndarray]: The last generation recorded up to the one asked
+                (the grid didn't change in between) and its grid of 0 and 1 (uint8).
+        """
+        before = [
+            i for i, (start, _) in enumerate(self.keyframes) if start <= generation
+        ]
+
+        if not before:
+            raise ValueError(f"Generation {generation} is before the recording")
+
+        reached = (i for i in reversed(before) if self._reaches(i, generation))
+        _, offset = self.keyframes[next(reached, before[-1])]
+
+        found, grid = None, None
+
+        for record, blob_offset in self._records(offset):
+            keyframe = found is not None and record["keyframe"]
+
+            if keyframe or record["generation"] > generation:
+                break
+
+            found = int(record["generation"])
+            grid = self._decode(record, blob_offset, grid)
+
+        return found, grid.astype(numpy.uint8)
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+    def _reaches(self, index: int, generation: int) -> bool:
+        """
+        Check if the run through a keyframe reached a generation (after the keyframe).
+
+        Notes:
+            The generations from a keyframe go up to the next keyframe if it continues
+            the run (a later generation, the grid didn't change in between), else up to
+            the last generation recorded before it (the run was undone or replaced).
+
+        Args:
+            index (int): The index of the keyframe.
+            generation (int): The generation, not before the keyframe.
+
+        Returns:
+            bool: Whether the grid of the generation was recorded from this keyframe.
+        """
+        stop = self._stop(index)
+
+        if index + 1 < len(self.keyframes) and self.keyframes[index + 1][0] > stop:
+            return generation < self.keyframes[index + 1][0]
+
+        return generation <= stop
+
+    def _stop(self, index: int) -> int:
+        """Get the last generation recorded from a keyframe, before the next one."""
+        if index not in self._stops:
+            stop = None
+
+            for record, _ in self._records(self.keyframes[index][1]):
+                if stop is not None and record["keyframe"]:
+                    break
+
+                stop = int(record["generation"])
+
+            self._stops[index] = stop
+
+        return self._stops[index]
+
+    def _records(self, offset: int) -> Iterator[Tuple[numpy.void, int]]:
+        """Iterate over the headers of the generations from an offset, and their blob offset."""
+        while offset + RECORD.itemsize <= self._end:
+            self._file.seek(offset)
+            record = numpy.frombuffer(self._file.read(RECORD.itemsize), dtype=RECORD)[0]
+            end = offset + RECORD.itemsize + int(record["length"])
+
+            if end > self._end:
+                return
+
+            yield record, offset + RECORD.itemsize
+            offset = end
+
+    def _decode(
+        self, record: numpy.void, offset: int, previous: Optional[numpy.ndarray]
+    ) -> numpy.ndarray:
+        """Decompress the grid of a generation (full grid or XOR with the previous one)."""
+        self._file.seek(offset)
+        raw = zlib.decompress(self._file.read(int(record["length"])))
+        shape = (int(record["width"]), int(record["height"]))
+        count = shape[0] * shape[1]
+        data = numpy.unpackbits(numpy.frombuffer(raw, dtype=numpy.uint8), count=count)
+        data = data.reshape(shape).astype(bool)
+
+        return data if record["keyframe"] else previous ^ data
+
+    def _read_index(self) -> Optional[Tuple[List[Tuple[int, int]], int]]:
+        """Read the index of the keyframes at the end of the file, None if not written."""
+        size = self._file.seek(0, 2)
+
+        if size < HEADER.itemsize + TRAILER.itemsize:
+            return None
+
+        self._file.seek(size - TRAILER.itemsize)
+        trailer = numpy.frombuffer(self._file.read(TRAILER.itemsize), dtype=TRAILER)
+
+        if trailer["magic"][0] != INDEX_MAGIC:
+            return None
+
+        end, count = int(trailer["offset"][0]), int(trailer["count"][0])
+        self._file.seek(end)
+        index = numpy.frombuffer(self._file.read(count * INDEX.itemsize), dtype=INDEX)
+        keyframes = [(int(start), int(offset)) for start, offset in index]
+
+        return keyframes, end
+
+    def _scan(self) -> Tuple[List[Tuple[int, int]], int]:
+        """Rebuild the index of the keyframes from the headers of the generations."""
+        logging.info(f"Recording not closed, rebuilding its index: '{self.path}'")
+        self._end = self._file.seek(0, 2)
+        keyframes, end = [], HEADER.itemsize
+
+        for record, offset in self._records(HEADER.itemsize):
+            if record["keyframe"]:
+                keyframes.append((int(record["generation"]), offset - RECORD.itemsize))
+
+            end = offset + int(record["length"])
+
+        return keyframes, end
@@ -0,0 +1,339 @@
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy
+
+# Rule of the Game of Life, in the B/S notation
+DEFAULT_RULE = "B3/S23"
+
+# Well known rules, selectable by name (Life-like, then Larger than Life)
+RULES: Dict[str, str] = {
+    "life": "B3/S23",
+    "highlife": "B36/S23",
+    "seeds": "B2/S",
+    "daynight": "B3678/S34678",
+    "maze": "B3/S12345",
+    "replicator": "B1357/S1357",
+    "2x2": "B36/S125",
+    "morley": "B368/S245",
+    "diamoeba": "B35678/S5678",
+    "life-without-death": "B3/S012345678",
+    "bosco": "R5,C0,M1,S34..58,B34..45,NM",
+    "majority": "R4,C0,M1,S41..81,B41..81,NM",
+    "bugsmovie": "R10,C0,M1,S123..212,B123..170,NM",
+    "globe": "R8,C0,M0,S163..223,B74..252,NM",
+}
+
+# Neighborhoods of the Larger than Life rules: Moore, von Neumann, hexagonal, custom
+NEIGHBORHOODS = ("M", "N", "H", "@")
+
+RULE_BS = re.compile(r"^B([0-8]*)/?S([0-8]*)$", re.I)
+RULE_SB = re.compile(r"^S([0-8]*)/?B([0-8]*)$", re.I)
+RULE_NUMBERS = re.compile(r"^([0-8]*)/([0-8]*)$")
+RULE_RANGE = re.compile(r"^(\d+)(?:(?:\.\.|-)(\d+))?$")
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    Rule of the generations: the numbers of alive neighbors giving birth to a dead cell,
+    and keeping an alive cell alive, in a neighborhood of the cells.
+
+    Notes:
+        The rule is compiled to a table of the next state of a cell, indexed by
+        'state * (size + 1) + alive_neighbors' (18 entries for a Life-like rule), so
+        the engines apply any rule with one lookup per cell. The table of a Life-like
+        rule also fits in the bits of an integer, shifting it by the indexes of a whole
+        grid is as fast as the comparisons of a hard-coded rule.
+        The neighborhood of radius 1 without the cell itself (Moore) is the Life-like
+        neighborhood, the larger ones follow the Larger than Life rules.
+
+    Attributes:
+        birth (FrozenSet[int]): The numbers of neighbors giving birth to a dead cell.
+        survival (FrozenSet[int]): The numbers of neighbors keeping a cell alive.
+        radius (int): The radius of the neighborhood.
+        neighborhood (str): The shape of the neighborhood, 'M' (Moore, a square),
+            'N' (von Neumann, a diamond), 'H' (hexagonal) or '@' (custom).
+        middle (bool): Whether the cell itself is counted in its neighborhood.
+        custom (Optional[Tuple[Tuple[int, ...], ...]]): The cells of a custom
+            neighborhood, a square of side '2 * radius + 1' (axis 0 is x).
+    """
+
+    birth: FrozenSet[int]
+    survival: FrozenSet[int]
+    radius: int = 1
+    neighborhood: str = "M"
+    middle: bool = False
+    custom: Optional[Tuple[Tuple[int, ...], ...]] = None
+
+    def __str__(self) -> str:
+        if self.life_like:
+            birth = "".join(str(count) for count in sorted(self.birth))
+            survival = "".join(str(count) for count in sorted(self.survival))
+            return f"B{birth}/S{survival}"
+
+        neighborhood = self.neighborhood
+
+        if neighborhood == "@":
+            # The cells row by row (y then x), 4 per hexadecimal digit
+            bits = "".join(str(cell) for cell in self.kernel.T.ravel().tolist())
+            bits += "0" * (-len(bits) % 4)
+            neighborhood += "".join(
+                f"{int(bits[i : i + 4], 2):X}" for i in range(0, len(bits), 4)
+            )
+
+        return (
+            f"R{self.radius},C0,M{int(self.middle)},S{_format_counts(self.survival)},"
+            f"B{_format_counts(self.birth)},N{neighborhood}"
+        )
+
+    @property
+    def life_like(self) -> bool:
+        """Whether the neighborhood is the 8 cells around (Moore of radius 1)."""
+        return self.radius == 1 and self.neighborhood == "M" and not self.middle
+
+    @cached_property
+    def kernel(self) -> numpy.ndarray:
+        """The cells counted around a cell, a square of side '2 * radius + 1' (uint8)."""
+        if self.custom is not None:
+            kernel = numpy.array(self.custom, dtype=numpy.uint8)
+        else:
+            offsets = numpy.arange(-self.radius, self.radius + 1)
+            x, y = numpy.meshgrid(offsets, offsets, indexing="ij")
+
+            if self.neighborhood == "N":
+                inside = abs(x) + abs(y) <= self.radius
+            elif self.neighborhood == "H":
+                # Hexagonal grid on the square cells: the top right and bottom left are out
+                inside = abs(x - y) <= self.radius
+            else:
+                inside = numpy.ones(x.shape, dtype=bool)
+
+            kernel = inside.astype(numpy.uint8)
+            kernel[self.radius, self.radius] = self.middle
+
+        kernel.flags.writeable = False
+        return kernel
+
+    @cached_property
+    def size(self) -> int:
+        """The number of cells of the neighborhood, the largest number of neighbors."""
+        return int(self.kernel.sum())
+
+    @cached_property
+    def table(self) -> numpy.ndarray:
+        """The next state of a cell, indexed by 'state * (size + 1) + alive_neighbors'."""
+        table = numpy.zeros(2 * (self.size + 1), dtype=numpy.uint8)
+        table[list(self.birth)] = 1
+        table[[self.size + 1 + count for count in self.survival]] = 1
+        table.flags.writeable = False
+        return table
+
+    @cached_property
+    def bits(self) -> numpy.uint32:
+        """The table of a Life-like rule as the bits of an integer (bit 'state * 9 + n')."""
+        return numpy.uint32(
+            sum(1 << index for index in numpy.flatnonzero(self.table).tolist())
+        )
+
+
+def parse_rule(text: str) -> Rule:
+    """
+    Parse a rule, by name, in the B/S notation or in the Larger than Life notation.
+
+    Notes:
+        The notations 'B36/S23', 'b36s23', 'S23/B36' and '23/36' (survival/birth)
+        are accepted for the Life-like rules, as well as the names of 'RULES'.
+        The Larger than Life rules are written 'R5,C0,M1,S34..58,B34..45,NM' (see
+        'parse_larger_rule').
+
+    Args:
+        text (str): The name or the rulestring.
+
+    Raises:
+        ValueError: If the rule isn't valid.
+
+    Returns:
+        Rule: The rule parsed.
+    """
+    text = RULES.get(text.strip().lower(), text.strip())
+    match_bs, match_sb = RULE_BS.match(text), RULE_SB.match(text)
+    match_numbers = RULE_NUMBERS.match(text)
+
+    if match_bs is not None:
+        birth, survival = match_bs[1], match_bs[2]
+    elif match_sb is not None:
+        survival, birth = match_sb[1], match_sb[2]
+    elif match_numbers is not None:
+        survival, birth = match_numbers[1], match_numbers[2]
+    elif "," in text:
+        return parse_larger_rule(text)
+    else:
+        raise ValueError(
+            f"Invalid rule: '{text}', expected the B/S notation (B3/S23) "
+            "or the Larger than Life notation (R5,C0,M1,S34..58,B34..45,NM)"
+        )
+
+    return Rule(
+        birth=frozenset(int(count) for count in birth),
+        survival=frozenset(int(count) for count in survival),
+    )
+
+
+def parse_larger_rule(text: str) -> Rule:
+    """
+    Parse a Larger than Life rule, like 'R5,C0,M1,S34..58,B34..45,NM'.
+
+    Notes:
+        The fields are the radius (R), the number of states (C, only 0 or 2), whether
+        the cell counts itself (M), the ranges of neighbors of survival (S) and birth
+        (B), separated by commas ('S2..3,5,B3'), and the neighborhood (N): Moore (M),
+        von Neumann (N), hexagonal (H) or custom ('@' then the cells of the square of
+        side '2R + 1' row by row, 4 per hexadecimal digit).
+
+    Args:
+        text (str): The rulestring.
+
+    Raises:
+        ValueError: If the rule isn't valid.
+
+    Returns:
+        Rule: The rule parsed.
+    """
+    radius, middle, neighborhood, digits = 1, False, "M", ""
+    counts: Dict[str, List[int]] = {"S": [], "B": []}
+    field = None
+
+    for token in text.upper().replace(" ", "").split(","):
+        key, value = token[:1], token[1:]
+
+        # A range alone continues the ranges of the last field
+        if RULE_RANGE.match(token) and field is not None:
+            key, value = field, token
+
+        if key == "R" and value.isdigit():
+            radius = int(value)
+        elif key == "C" and value in ("0", "1", "2"):
+            pass
+        elif key == "C":
+            raise ValueError(f"Invalid rule: '{text}', only rules of 2 states")
+        elif key == "M" and value in ("0", "1"):
+            middle = value == "1"
+        elif key in counts:
+            counts[key] += _parse_counts(value, text)
+            field = key
+            continue
+        elif key == "N" and value[:1] in NEIGHBORHOODS:
+            neighborhood, digits = value[0], value[1:]
+        else:
+            raise ValueError(f"Invalid rule: '{text}', unknown field '{token}'")
+
+        field = None
+
+    if not 1 <= radius <= 500:
+        raise ValueError(f"Invalid rule: '{text}', radius out of 1..500")
+
+    custom = _parse_custom(digits, radius, text) if neighborhood == "@" else None
+
+    rule = Rule(
+        birth=frozenset(counts["B"]),
+        survival=frozenset(counts["S"]),
+        radius=radius,
+        neighborhood=neighborhood,
+        middle=middle if custom is None else bool(custom[radius][radius]),
+        custom=custom,
+    )
+
+    if max(rule.birth | rule.survival, default=0) > rule.size:
+        raise ValueError(f"Invalid rule: '{text}', more neighbors than {rule.size}")
+
+    return rule
+
+
+def _parse_counts(value: str, text: str) -> List[int]:
+    """Parse a range of numbers of neighbors, 'a..b', 'a-b' or 'a' (empty for none)."""
+    if not value:
+        return []
+
+    match = RULE_RANGE.match(value)
+
+    if match is None:
+        raise ValueError(f"Invalid rule: '{text}', invalid range '{value}'")
+
+    start = int(match[1])
+    end = int(match[2]) if match[2] is not None else start
+    return list(range(start, end + 1))
+
+
+def _parse_custom(digits: str, radius: int, text: str) -> Tuple[Tuple[int, ...], ...]:
+    """Parse the cells of a custom neighborhood, row by row in hexadecimal digits."""
+    side = 2 * radius + 1
+
+    try:
+        bits = "".join(f"{int(digit, 16):04b}" for digit in digits)
+    except ValueError:
+        raise ValueError(f"Invalid rule: '{text}', invalid custom neighborhood")
+
+    if len(bits) < side * side:
+        raise ValueError(f"Invalid rule: '{text}', expected {side}x{side} cells")
+
+    cells = numpy.array([int(bit) for bit in bits[: side * side]]).reshape(side, side)
+    return tuple(tuple(column) for column in cells.T.tolist())
+
+
+def _format_counts(counts: FrozenSet[int]) -> str:
+    """Format numbers of neighbors as ranges, 'a..b' separated by commas."""
+    ranges: List[List[int]] = []
+
+    for count in sorted(counts):
+        if ranges and count == ranges[-1][1] + 1:
+            ranges[-1][1] = count
+        else:
+            ranges.append([count, count])
+
+    return ",".join(
+        str(start) if start == end else f"{start}..{end}" for start, end in ranges
+    )
+
+
+def custom_rule(rule: Rule, cells: numpy.ndarray) -> Rule:
+    """
+    Get a rule with the same numbers of neighbors, in a custom neighborhood.
+
+    Args:
+        rule (Rule): The rule giving the numbers of neighbors of birth and survival.
+        cells (numpy.ndarray): The cells of the neighborhood, centered on the cell
+            (odd sides, axis 0 is x), the cell itself is counted if set.
+
+    Raises:
+        ValueError: If the sides aren't odd, or the numbers exceed the neighborhood.
+
+    Returns:
+        Rule: The rule in the custom neighborhood.
+    """
+    width, height = cells.shape
+
+    if width % 2 == 0 or height % 2 == 0:
+        raise ValueError(f"The neighborhood must have odd sides, not {width}x{height}")
+
+    radius = max(width, height) // 2
+    kernel = numpy.zeros((2 * radius + 1, 2 * radius + 1), dtype=numpy.uint8)
+    x, y = radius - width // 2, radius - height // 2
+    kernel[x : x + width, y : y + height] = cells != 0
+
+    return parse_larger_rule(
+        str(
+            Rule(
+                birth=rule.birth,
+                survival=rule.survival,
+                radius=radius,
+                neighborhood="@",
+                custom=tuple(tuple(column) for column in kernel.tolist()),
+            )
+        )
+    )
+
+
+CONWAY = parse_rule(DEFAULT_RULE)
@@ -0,0 +1,86 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+
+@dataclass
+class Scheduler:
+    """
+    Scheduler of the generations, at a fixed rate independent of the frames per second.
+
+    Notes:
+        Each frame runs the generations due since the last frame (several if the rate is
+        higher than the frames per second, none if it is lower), without exceeding the
+        budget of time of the frame, the generations that can't be computed (or aren't
+        ready) in time are dropped to keep the window responsive.
+        With a limit of 0 generations per second, each frame runs as many generations
+        as fit in the budget of time.
+
+    Attributes:
+        limit_gps (float): The number of generations per second (0 for the budget of time).
+        limit_fps (int): The number of frames per second, to compute the budget of time.
+        budget_ratio (float): The part of the time of a frame that can be spent computing.
+        clock (Callable[[], float]): The clock giving the current time, in seconds.
+    """
+
+    limit_gps: float = 40.0
+    limit_fps: int = 60
+    budget_ratio: float = 0.5
+    clock: Callable[[], float] = time.perf_counter
+
+    _lag: float = field(default=0.0, init=False, repr=False)
+    _last: Optional[float] = field(default=None, init=False, repr=False)
+
+    @property
+    def budget(self) -> float:
+        """The time that can be spent computing generations each frame, in seconds."""
+        return self.budget_ratio / max(self.limit_fps, 1)
+
+    def run(self, step: Callable[[], bool]) -> int:
+        """
+        Run the generations due since the last call, within the budget of time.
+
+        Args:
+            step (Callable[[], bool]): The function going to the next generation,
+                returns False if it isn't ready yet.
+
+        Returns:
+            int: The number of generations computed.
+        """
+        now = self.clock()
+        deadline = now + self.budget
+
+        last, self._last = self._last, now
+
+        if self.limit_gps <= 0:
+            self._lag = float("inf")
+
+        # The first call computes one generation right away
+        elif last is None:
+            self._lag = 1.0
+
+        # Don't accumulate more than two frames of generations (slow frames)
+        else:
+            limit_lag = max(2 * self.limit_gps / max(self.limit_fps, 1), 1.0)
+            self._lag = min(self._lag + (now - last) * self.limit_gps, limit_lag)
+
+        generations = 0
+
+        while self._lag >= 1:
+            if not step():
+                self._lag = min(self._lag, 1.0)
+                break
+
+            self._lag -= 1
+            generations += 1
+
+            if self.clock() >= deadline:
+                self._lag = min(self._lag, 1.0)
+                break
+
+        return generations
+
+    def reset(self):
+        """Stop the scheduling, the next call starts again from one generation."""
+        self._lag = 0.0
+        self._last = None
@@ -0,0 +1,126 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy
+
+from src.model import GridModel
+
+
+@dataclass
+class SimulationReport:
+    """
+    Report of a simulation run without display.
+
+    Attributes:
+        shape (Tuple[int, int]): The shape of the grid.
+        engine (str): The name of the engine used.
+        generations (int): The number of generations computed one by one.
+        duration (float): The time spent computing them, in seconds (without the jump).
+        population (int): The number of alive cells at the end.
+        stable_generation (Optional[int]): The generation from which the grid no longer changes.
+        period (Optional[int]): The period of the cycle entered by the grid, if detected.
+        cycle_generation (Optional[int]): The first generation of the cycle, if detected.
+        skipped (int): The number of generations jumped over once in the cycle, not
+            counted in the rates.
+    """
+
+    shape: Tuple[int, int]
+    engine: str
+    generations: int
+    duration: float
+    population: int
+    stable_generation: Optional[int]
+    period: Optional[int] = None
+    cycle_generation: Optional[int] = None
+    skipped: int = 0
+
+    @property
+    def generations_per_second(self) -> float:
+        """The number of generations computed per second."""
+        return self.generations / self.duration if self.duration else float("inf")
+
+    @property
+    def cells_per_second(self) -> float:
+        """The number of cells updated per second."""
+        return self.generations_per_second * self.shape[0] * self.shape[1]
+
+
+def random_grid(
+    shape: Tuple[int, int], density: float = 0.5, seed: Optional[int] = None
+) -> numpy.ndarray:
+    """
+    Create a random soup of alive cells.
+
+    Args:
+        shape (Tuple[int, int]): The shape of the grid.
+        density (float): The probability of each cell to be alive.
+        seed (Optional[int]): The seed of the random generator.
+
+    Returns:
+        numpy.ndarray: The grid of 0 and 1.
+    """
+    generator = numpy.random.default_rng(seed)
+    return (generator.random(shape) < density).astype(int)
+
+
+def simulate(
+    model: GridModel,
+    generations: int,
+    stop_when_stable: bool = True,
+    fast_forward: bool = True,
+) -> SimulationReport:
+    """
+    Compute the generations of the model, without display.
+
+    Args:
+        model (GridModel): The model to run.
+        generations (int): The number of generations to compute.
+        stop_when_stable (bool): Whether to stop as soon as the grid no longer changes.
+        fast_forward (bool): Whether to jump to the last generation once a cycle is detected.
+
+    Returns:
+        SimulationReport: The performance and the result of the simulation.
+    """
+    logging.info(f"Simulating {generations} generations of a {model.shape} grid")
+    stable_generation = None
+    computed = 0
+    skipped = 0
+
+    start = time.perf_counter()
+    duration = None
+
+    for _ in range(generations):
+        model.next_generation()
+        computed += 1
+
+        if model.stable:
+            # The last generation didn't change the grid, it was already stable
+            if stable_generation is None:
+                stable_generation = model.generation - 1
+
+            if stop_when_stable:
+                break
+
+        if model.cycle is not None and fast_forward:
+            # The jump isn't timed, the rates only count the generations computed
+            duration = time.perf_counter() - start
+            skipped = generations - computed
+            model.advance(skipped)
+            break
+
+    if duration is None:
+        duration = time.perf_counter() - start
+
+    return SimulationReport(
+        shape=model.shape,
+        engine=model.engine.name,
+        generations=computed,
+        duration=duration,
+        population=int(model.grid.sum()),
+        stable_generation=stable_generation,
+        period=model.cycle.period if model.cycle else None,
+        cycle_generation=model.cycle.start if model.cycle else None,
+        skipped=skipped,
+    )
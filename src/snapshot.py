@@ -0,0 +1,192 @@
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy
+
+from src.engines.bitpacked import pack, unpack
+from src.rules import DEFAULT_RULE
+
+SNAPSHOT_EXTENSION = ".gol"
+
+MAGIC = b"LIFESNAP"
+VERSION = 1
+
+# Header of the snapshot files (128 bytes, the cells start aligned on 64 bits)
+HEADER = numpy.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("offset", "<u4"),
+        ("width", "<u8"),
+        ("height", "<u8"),
+        ("generation", "<u8"),
+        ("rule", "S32"),
+        ("reserved", "V56"),
+    ]
+)
+
+# Number of cells packed at once when writing a snapshot
+BAND_CELLS = 2**24
+
+
+@dataclass
+class Snapshot:
+    """
+    Snapshot file opened with a memory map, the cells are only read when needed.
+
+    Notes:
+        The cells are bit-packed like the 'bitpacked' engine: each row of the grid is
+        stored in uint64 words, 64 cells per word (little endian bit order).
+        The pages of the file are loaded by the system when a part of the grid is read.
+
+    Attributes:
+        path (Path): The path of the file.
+        shape (Tuple[int, int]): The shape of the grid.
+        generation (int): The generation of the grid.
+        rule (str): The rule of the grid, in the B/S notation.
+        words (numpy.ndarray): The packed rows of the grid, memory mapped (read only).
+    """
+
+    path: Path
+    shape: Tuple[int, int]
+    generation: int
+    rule: str
+    words: numpy.ndarray
+
+    def read(
+        self,
+        x: int = 0,
+        y: int = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+    ) -> numpy.ndarray:
+        """
+        Read a rectangle of the grid, only the words holding its cells are read.
+
+        Args:
+            x (int): The first row of the rectangle.
+            y (int): The first column of the rectangle.
+            width (Optional[int]): The number of rows (up to the end of the grid by default).
+            height (Optional[int]): The number of columns (up to the end by default).
+
+        Returns:
+            numpy.ndarray: The cells of the rectangle, 0 and 1 (uint8).
+        """
+        x, y = min(max(x, 0), self.shape[0]), min(max(y, 0), self.shape[1])
+        end_x = self.shape[0] if width is None else min(x + width, self.shape[0])
+        end_y = self.shape[1] if height is None else min(y + height, self.shape[1])
+
+        if end_x <= x or end_y <= y:
+            return numpy.zeros((max(end_x - x, 0), max(end_y - y, 0)), numpy.uint8)
+
+        first_word, end_word = y // 64, -(-end_y // 64)
+        words = self.words[x:end_x, first_word:end_word]
+        cells = unpack(words, end_y - first_word * 64)
+
+        return cells[:, y - first_word * 64 :]
+
+    def read_words(self, x: int = 0, width: Optional[int] = None) -> numpy.ndarray:
+        """
+        Read whole rows of the grid still packed, for the engines keeping packed rows.
+
+        Args:
+            x (int): The first row.
+            width (Optional[int]): The number of rows (up to the end of the grid by default).
+
+        Returns:
+            numpy.ndarray: The packed rows, memory mapped (read only).
+        """
+        x = min(max(x, 0), self.shape[0])
+        end_x = self.shape[0] if width is None else min(x + width, self.shape[0])
+
+        return self.words[x : max(end_x, x)]
+
+
+def open_snapshot(path: Path) -> Snapshot:
+    """
+    Open a snapshot file, without reading its cells.
+
+    Args:
+        path (Path): The path of the file.
+
+    Raises:
+        ValueError: If the file isn't a valid snapshot.
+
+    Returns:
+        Snapshot: The snapshot, its cells are read on demand.
+    """
+    header = numpy.fromfile(path, dtype=HEADER, count=1)
+
+    if len(header) == 0 or header["magic"][0] != MAGIC:
+        raise ValueError(f"Not a snapshot file: '{path}'")
+
+    if header["version"][0] != VERSION:
+        raise ValueError(f"Unsupported snapshot version: {header['version'][0]}")
+
+    offset = int(header["offset"][0])
+    width, height = int(header["width"][0]), int(header["height"][0])
+    nbr_words = max(1, -(-height // 64))
+
+    if os.path.getsize(path) < offset + width * nbr_words * 8:
+        raise ValueError(f"Truncated snapshot file: '{path}'")
+
+    if width == 0:
+        words = numpy.zeros((0, nbr_words), dtype="<u8")
+    else:
+        words = numpy.memmap(
+            path, dtype="<u8", mode="r", offset=offset, shape=(width, nbr_words)
+        )
+
+    logging.info(f"Snapshot opened: '{path}' ({width} x {height})")
+    return Snapshot(
+        path=Path(path),
+        shape=(width, height),
+        generation=int(header["generation"][0]),
+        rule=header["rule"][0].decode("ascii"),
+        words=words,
+    )
+
+
+def save_snapshot(
+    path: Path, grid: numpy.ndarray, generation: int = 0, rule: str = DEFAULT_RULE
+):
+    """
+    Write a grid to a snapshot file, packed by bands of rows.
+
+    Args:
+        path (Path): The path of the file.
+        grid (numpy.ndarray): The grid of 0 and 1.
+        generation (int): The generation of the grid.
+        rule (str): The rule of the grid, in the B/S notation.
+
+    Raises:
+        ValueError: If the rule is longer than its field of the header (32 characters).
+
+    """
+    if len(rule) > HEADER["rule"].itemsize:
+        raise ValueError(
+            f"The rule '{rule}' is too long for a snapshot (32 characters)"
+        )
+
+    width, height = grid.shape
+    header = numpy.zeros(1, dtype=HEADER)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["offset"] = HEADER.itemsize
+    header["width"], header["height"] = width, height
+    header["generation"] = generation
+    header["rule"] = rule.encode("ascii")
+
+    band = max(1, BAND_CELLS // max(height, 1))
+
+    with open(path, "wb") as file:
+        file.write(header.tobytes())
+
+        for start in range(0, width, band):
+            words = pack(grid[start : start + band]).astype("<u8", copy=False)
+            file.write(words.tobytes())
+
+    logging.info(f"Snapshot saved: '{path}' ({width} x {height})")
@@ -0,0 +1,112 @@
+import logging
+import threading
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import numpy
+
+from src.cycle import next_hash
+from src.engines import Engine
+
+
+class SimulationWorker:
+    """
+    Worker thread computing the next generations ahead of the display, in a ring buffer.
+
+    Notes:
+        The worker computes with its own copy of the engine, from the state it started
+        with, the display only takes the states ready (NumPy releases the GIL during
+        the computations). The hashes of the states are computed by the worker too.
+        The worker waits while the buffer is full.
+        Cancelling doesn't wait for the generation being computed, it is dropped.
+
+    Attributes:
+        engine (Engine): The engine computing the generations (owned by the worker).
+        capacity (int): The number of states computed ahead at most.
+        error (Optional[BaseException]): The error that stopped the worker, if any.
+    """
+
+    engine: Engine
+    capacity: int
+    error: Optional[BaseException]
+
+    def __init__(
+        self,
+        engine: Engine,
+        state: numpy.ndarray,
+        state_hash: Optional[int] = None,
+        capacity: int = 8,
+    ):
+        self.engine = engine
+        self.capacity = capacity
+        self.error = None
+
+        self._states: Deque[Tuple[numpy.ndarray, int, bool]] = deque()
+        self._condition = threading.Condition()
+        self._cancelled = False
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(state, state_hash),
+            name="simulation-worker",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def pop(self) -> Optional[Tuple[numpy.ndarray, int, bool]]:
+        """
+        Take the next generation computed, without waiting.
+
+        Returns:
+            Optional[Tuple[numpy.ndarray, int, bool]]: The state of the next generation,
+                its hash and whether it made no changes, None if not ready yet.
+        """
+        with self._condition:
+            if not self._states:
+                return None
+
+            generation = self._states.popleft()
+            self._condition.notify()
+
+        return generation
+
+    def cancel(self):
+        """Stop the worker, the states computed are dropped."""
+        with self._condition:
+            self._cancelled = True
+            self._states.clear()
+            self._condition.notify()
+
+    def _run(self, state: numpy.ndarray, state_hash: Optional[int]):
+        """
+        Compute the generations until cancelled, waiting while the buffer is full.
+
+        Args:
+            state (numpy.ndarray): The state to start from.
+            state_hash (Optional[int]): The hash of the state, None if unknown.
+
+        """
+        try:
+            while True:
+                with self._condition:
+                    while len(self._states) >= self.capacity and not self._cancelled:
+                        self._condition.wait()
+
+                    if self._cancelled:
+                        return
+
+                new_state = self.engine.step(state)
+                state_hash, stable = next_hash(state_hash, state, new_state)
+                state = new_state
+
+                with self._condition:
+                    if self._cancelled:
+                        return
+
+                    self._states.append((self.engine.detach(state), state_hash, stable))
+
+        except Exception as error:
+            logging.exception("The simulation worker stopped")
+            self.error = error
+
+        finally:
+            self.engine.close()
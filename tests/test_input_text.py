@@ -0,0 +1,35 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from src.components.input_text import InputText
+
+
+def test_backdrop_is_translucent():
+    """The backdrop converted to the format of the screen keeps its alpha."""
+    pygame.init()
+
+    try:
+        screen = pygame.display.set_mode((64, 64))
+        screen.fill((255, 255, 255))
+
+        input_text = InputText(
+            0,
+            0,
+            32,
+            32,
+            font_name="Consolas.ttf",
+            background_color=pygame.Color(110, 110, 110, 128),
+        )
+        screen.blit(input_text.get_backdrop(), (0, 0))
+
+        # 110 over 255 at an alpha of 128: about the middle of the two
+        red, green, blue, _ = screen.get_at((8, 8))
+        assert (red, green, blue) != (110, 110, 110)
+        assert all(abs(value - 182) <= 2 for value in (red, green, blue))
+
+    finally:
+        pygame.quit()